@@ -1,364 +1,592 @@
-import tkinter as tk
-from tkinter import messagebox
-import matplotlib.pyplot as plt
-# import Autoalign_sim_v3 as Autoalign
-import Autoalign_pv_v3 as Autoalign
-
-# Create the main application window
-class MotorAlignmentApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Motor Alignment")
-        
-        # Create the main frame
-        self.frame = tk.Frame(self.root)
-        self.frame.grid(row=0, column=0, padx=10, pady=10)
-
-        # Column headers for Analyzer checkbox, Start/End/Step for Analyzer, Piezo checkbox, Start/End/Step for Piezo
-        self.headers = ['Detector', 'Analyzer', 'Start', 'End', 'Step', 'Piezo', 'Start', 'End', 'Step']
-        for col, header in enumerate(self.headers):
-            header_label = tk.Label(self.frame, text=header, font=("Helvetica", 10, 'bold'))
-            header_label.grid(row=0, column=col, padx=10, pady=5, sticky="w")
-
-        # Create variables for global checkboxes
-        self.global_analyzer_var = tk.BooleanVar(value=False)
-        self.global_piezo_var = tk.BooleanVar(value=False)
-
-        # Create global checkboxes for Analyzer and Piezo with bold font
-        self.global_analyzer_chk = tk.Checkbutton(self.frame, text="Analyzer", variable=self.global_analyzer_var, command=self.toggle_analyzer_checkboxes, font=("Helvetica", 10, 'bold'))
-        self.global_analyzer_chk.grid(row=0, column=1, padx=10, pady=5, sticky="w")
-
-        self.global_piezo_chk = tk.Checkbutton(self.frame, text="Piezo", variable=self.global_piezo_var, command=self.toggle_piezo_checkboxes, font=("Helvetica", 10, 'bold'))
-        self.global_piezo_chk.grid(row=0, column=5, padx=10, pady=5, sticky="w")
-
-        self.detector_vars = []
-        self.detector_range_entries = {}
-        self.analyzer_vars = []  
-        self.piezo_vars = []  
-
-        for i in range(12):  
-            # Create checkboxes for Analyzer and Piezo Motor alignment
-            analyzer_var = tk.BooleanVar(value=False)
-            piezo_var = tk.BooleanVar(value=False)
-            self.analyzer_vars.append(analyzer_var)
-            self.piezo_vars.append(piezo_var)
-
-            # Detector number
-            detector_label = tk.Label(self.frame, text=str(i+1), font=("Helvetica", 10, 'bold'))
-            detector_label.grid(row=i + 1, column=0, padx=5, pady=5)
-
-            # Analyzer checkbox
-            analyzer_chk = tk.Checkbutton(self.frame, variable=analyzer_var, command=lambda i=i: self.update_range_color(i, "Analyzer"))
-            analyzer_chk.grid(row=i + 1, column=1, padx=5, pady=5)
-            
-            
-            # Analyzer Start
-            analyzer_start_entry = tk.Entry(self.frame,width=25)
-            analyzer_start_entry.grid(row=i + 1, column=2, padx=5, pady=5)
-            
-            # Analyzer End
-            analyzer_end_entry = tk.Entry(self.frame,width=25)
-            analyzer_end_entry.grid(row=i + 1, column=3, padx=5, pady=5)
-            
-            # Analyzer Step
-            analyzer_step_entry = tk.Entry(self.frame,width=25)
-            analyzer_step_entry.grid(row=i + 1, column=4, padx=5, pady=5)
-            analyzer_step_entry.insert(0, '0.00125')
-
-            # Piezo checkbox
-            piezo_chk = tk.Checkbutton(self.frame, variable=piezo_var, command=lambda i=i: self.update_range_color(i, "Piezo"))
-            piezo_chk.grid(row=i + 1, column=5, padx=10, pady=5)
-
-            # Piezo Start
-            piezo_start_entry = tk.Entry(self.frame,width=25)
-            piezo_start_entry.grid(row=i + 1, column=6, padx=5, pady=5)
-
-            # Piezo End
-            piezo_end_entry = tk.Entry(self.frame,width=25)
-            piezo_end_entry.grid(row=i + 1, column=7, padx=5, pady=5)
-            
-            # Piezo Step
-            piezo_step_entry = tk.Entry(self.frame,width=25)
-            piezo_step_entry.grid(row=i + 1, column=8, padx=5, pady=5)
-            piezo_step_entry.insert(0, '0.1')
-
-            # Store entries in dictionary for easy access
-            self.detector_range_entries[i] = {
-                'analyzer_start': analyzer_start_entry,
-                'analyzer_end': analyzer_end_entry,
-                'analyzer_step': analyzer_step_entry,
-                'piezo_start': piezo_start_entry,
-                'piezo_end': piezo_end_entry,
-                'piezo_step': piezo_step_entry
-            }
-
-        # Add a block and copy button for Analyzer Start
-        self.analyzer_start_block = tk.Entry(self.frame, width=10)  
-        self.analyzer_start_block.grid(row=0, column=2, padx=5, pady=5)
-        self.analyzer_start_block.insert(0, '4.2')  
-
-        self.refresh_button = tk.Button(self.frame, text="↻", command=self.copy_analyzer_start, font=("Helvetica", 12, 'bold'))
-        self.refresh_button.grid(row=0, column=2, padx=5, pady=5, sticky="e") 
-
-        # Add a block and copy button for Analyzer End
-        self.analyzer_end_block = tk.Entry(self.frame, width=10)
-        self.analyzer_end_block.grid(row=0, column=3, padx=5, pady=5)
-        self.analyzer_end_block.insert(0, '4.3')
-
-        self.refresh_button_end = tk.Button(self.frame, text="↻", command=self.copy_analyzer_end, font=("Helvetica", 12, 'bold'))
-        self.refresh_button_end.grid(row=0, column=3, padx=5, pady=5, sticky="e")
-
-        # Add a block and copy button for Analyzer Step
-        self.analyzer_step_block = tk.Entry(self.frame, width=10)
-        self.analyzer_step_block.grid(row=0, column=4, padx=5, pady=5)
-        self.analyzer_step_block.insert(0, '0.00125')
-
-        self.refresh_button_step = tk.Button(self.frame, text="↻", command=self.copy_analyzer_step, font=("Helvetica", 12, 'bold'))
-        self.refresh_button_step.grid(row=0, column=4, padx=5, pady=5, sticky="e")
-
-        # Add a block and copy button for Piezo Start
-        self.piezo_start_block = tk.Entry(self.frame, width=10)
-        self.piezo_start_block.grid(row=0, column=6, padx=5, pady=5)
-        self.piezo_start_block.insert(0, '2')
-
-        self.refresh_button_piezo_start = tk.Button(self.frame, text="↻", command=self.copy_piezo_start, font=("Helvetica", 12, 'bold'))
-        self.refresh_button_piezo_start.grid(row=0, column=6, padx=5, pady=5, sticky="e")
-
-        # Add a block and copy button for Piezo End
-        self.piezo_end_block = tk.Entry(self.frame, width=10)
-        self.piezo_end_block.grid(row=0, column=7, padx=5, pady=5)
-        self.piezo_end_block.insert(0, '12')
-
-        self.refresh_button_piezo_end = tk.Button(self.frame, text="↻", command=self.copy_piezo_end, font=("Helvetica", 12, 'bold'))
-        self.refresh_button_piezo_end.grid(row=0, column=7, padx=5, pady=5, sticky="e")
-
-        # Add a block and copy button for Piezo Step
-        self.piezo_step_block = tk.Entry(self.frame, width=10)
-        self.piezo_step_block.grid(row=0, column=8, padx=5, pady=5)
-        self.piezo_step_block.insert(0, '0.1')
-
-        self.refresh_button_piezo_step = tk.Button(self.frame, text="↻", command=self.copy_piezo_step, font=("Helvetica", 12, 'bold'))
-        self.refresh_button_piezo_step.grid(row=0, column=8, padx=5, pady=5, sticky="e")
-
-        # Align Motors Button
-        self.align_button = tk.Button(self.root, text="Align Motors", command=self.align_motors)
-        self.align_button.grid(row=1, column=0, columnspan=9, padx=20, pady=20)
-
-        # Success Label
-        self.success_label = tk.Label(self.root, text="", fg="green", font=("Helvetica", 12))
-        self.success_label.grid(row=2, column=0, columnspan=9, padx=20, pady=10, sticky="e")
-
-    def toggle_analyzer_checkboxes(self):
-        """ Toggles all individual Analyzer checkboxes based on the global Analyzer checkbox """
-        state = self.global_analyzer_var.get()
-        for var in self.analyzer_vars:
-            var.set(state)
-
-        # Update the range color when toggling Analyzer checkboxes
-        for i in range(12):
-            self.update_range_color(i, "Analyzer")
-
-    def toggle_piezo_checkboxes(self):
-        """ Toggles all individual Piezo checkboxes based on the global Piezo checkbox """
-        state = self.global_piezo_var.get()
-        for var in self.piezo_vars:
-            var.set(state)
-
-        # Update the range color when toggling Piezo checkboxes
-        for i in range(12):
-            self.update_range_color(i, "Piezo")
-
-    def update_range_color(self, detector_id, motor_type):
-        """ Update the background color of the range entry boxes when a checkbox is checked or unchecked """
-        if motor_type == "Analyzer":
-            if self.analyzer_vars[detector_id].get():
-                # Set range entry fields to green when Analyzer is checked
-                self.detector_range_entries[detector_id]['analyzer_start'].config(bg="lightgreen")
-                self.detector_range_entries[detector_id]['analyzer_end'].config(bg="lightgreen")
-                self.detector_range_entries[detector_id]['analyzer_step'].config(bg="lightgreen")
-            else:
-                # Reset to default color when Analyzer is unchecked
-                self.detector_range_entries[detector_id]['analyzer_start'].config(bg="white")
-                self.detector_range_entries[detector_id]['analyzer_end'].config(bg="white")
-                self.detector_range_entries[detector_id]['analyzer_step'].config(bg="white")
-
-        elif motor_type == "Piezo":
-            if self.piezo_vars[detector_id].get():
-                # Set range entry fields to green when Piezo is checked
-                self.detector_range_entries[detector_id]['piezo_start'].config(bg="lightgreen")
-                self.detector_range_entries[detector_id]['piezo_end'].config(bg="lightgreen")
-                self.detector_range_entries[detector_id]['piezo_step'].config(bg="lightgreen")
-            else:
-                # Reset to default color when Piezo is unchecked
-                self.detector_range_entries[detector_id]['piezo_start'].config(bg="white")
-                self.detector_range_entries[detector_id]['piezo_end'].config(bg="white")
-                self.detector_range_entries[detector_id]['piezo_step'].config(bg="white")
-
-    def copy_analyzer_start(self):
-        """ Copy the value from the Analyzer Start block to all Analyzer Start positions """
-        analyzer_start_value = self.analyzer_start_block.get()
-
-        # Set the value in all analyzer start fields
-        for i in range(12):
-            self.detector_range_entries[i]['analyzer_start'].delete(0, tk.END)
-            self.detector_range_entries[i]['analyzer_start'].insert(0, analyzer_start_value)
-
-    def copy_analyzer_end(self):
-        """ Copy the value from the Analyzer End block to all Analyzer End positions """
-        analyzer_end_value = self.analyzer_end_block.get()
-
-        # Set the value in all analyzer end fields
-        for i in range(12):
-            self.detector_range_entries[i]['analyzer_end'].delete(0, tk.END)
-            self.detector_range_entries[i]['analyzer_end'].insert(0, analyzer_end_value)
-
-    def copy_analyzer_step(self):
-        """ Copy the value from the Analyzer Step block to all Analyzer Step positions """
-        analyzer_step_value = self.analyzer_step_block.get()
-
-        # Set the value in all analyzer step fields
-        for i in range(12):
-            self.detector_range_entries[i]['analyzer_step'].delete(0, tk.END)
-            self.detector_range_entries[i]['analyzer_step'].insert(0, analyzer_step_value)
-
-    def copy_piezo_start(self):
-        """ Copy the value from the Piezo Start block to all Piezo Start positions """
-        piezo_start_value = self.piezo_start_block.get()
-
-        # Set the value in all piezo start fields
-        for i in range(12):
-            self.detector_range_entries[i]['piezo_start'].delete(0, tk.END)
-            self.detector_range_entries[i]['piezo_start'].insert(0, piezo_start_value)
-
-    def copy_piezo_end(self):
-        """ Copy the value from the Piezo End block to all Piezo End positions """
-        piezo_end_value = self.piezo_end_block.get()
-
-        # Set the value in all piezo end fields
-        for i in range(12):
-            self.detector_range_entries[i]['piezo_end'].delete(0, tk.END)
-            self.detector_range_entries[i]['piezo_end'].insert(0, piezo_end_value)
-
-    def copy_piezo_step(self):
-        """ Copy the value from the Piezo Step block to all Piezo Step positions """
-        piezo_step_value = self.piezo_step_block.get()
-
-        # Set the value in all piezo step fields
-        for i in range(12):
-            self.detector_range_entries[i]['piezo_step'].delete(0, tk.END)
-            self.detector_range_entries[i]['piezo_step'].insert(0, piezo_step_value)
-
-
-    def align_motors(self):
-        """ Runs alignment for each selected detector in sequence. """
-        
-        # Get selected detectors in order
-        selected_detectors = []
-        alignment_info = {}
-        error_message = ""  
-
-        for i in range(12):
-            detector_info = {}
-            # Check if either Analyzer or Piezo checkbox is checked
-            if self.analyzer_vars[i].get() or self.piezo_vars[i].get():
-                # Check if Start, End, and Step values are provided for Analyzer
-                if self.analyzer_vars[i].get():
-                    analyzer_start = self.detector_range_entries[i]['analyzer_start'].get()
-                    analyzer_end = self.detector_range_entries[i]['analyzer_end'].get()
-                    analyzer_step = self.detector_range_entries[i]['analyzer_step'].get()
-                    if not analyzer_start or not analyzer_end or not analyzer_step:
-                        error_message += f"Error: Analyzer Start, End, and Step values missing for Detector {i+1}.\n"
-                    else:
-                        try:
-                            analyzer_start = float(analyzer_start)
-                            analyzer_end = float(analyzer_end)
-                            analyzer_step = float(analyzer_step)
-                            if analyzer_start >= analyzer_end:
-                                error_message += f"Analyzer start position must be less than the end position for Detector {i+1}.\n"
-                            if analyzer_step <= 0:
-                                error_message += f"Analyzer step size must be positive for Detector {i+1}.\n"
-                            else:
-                                detector_info['analyzer'] = {
-                                    'start': analyzer_start,
-                                    'end': analyzer_end,
-                                    'step': analyzer_step
-                                }                            
-                        except ValueError:
-                            error_message += f"Invalid value for Analyzer Start/End/Step for Detector {i+1}.\n"
-                # Check if Start, End, and Step values are provided for Piezo
-                if self.piezo_vars[i].get():
-                    piezo_start = self.detector_range_entries[i]['piezo_start'].get()
-                    piezo_end = self.detector_range_entries[i]['piezo_end'].get()
-                    piezo_step = self.detector_range_entries[i]['piezo_step'].get()
-                    if not piezo_start or not piezo_end or not piezo_step:
-                        error_message += f"Error: Piezo Start, End, and Step values missing for Detector {i+1}.\n"
-                    else:
-                        try:
-                            piezo_start = float(piezo_start)
-                            piezo_end = float(piezo_end)
-                            piezo_step = float(piezo_step)
-                            if piezo_start >= piezo_end:
-                                error_message += f"Piezo start position must be less than the end position for Detector {i+1}.\n"                                                         
-                            if not (0 <= piezo_start <= 15) or not (0 <= piezo_end <= 15):
-                                error_message += f"Error: Piezo range for Detector {i+1} is out of bounds (0-15).\n"
-                            if piezo_step <= 0:
-                                error_message += f"Piezo step size must be positive for Detector {i+1}.\n"
-                            else:
-                                detector_info['piezo'] = {
-                                    'start': piezo_start,
-                                    'end': piezo_end,
-                                    'step': piezo_step
-                                }
-                        except ValueError:
-                            error_message += f"Error: Invalid Piezo range or Step for Detector {i+1}.\n"
-
-            if detector_info:
-                alignment_info[i + 1] = detector_info
-                selected_detectors.append(i + 1)                
-
-        if not selected_detectors:
-            messagebox.showwarning("No Detector Selected", "Please select at least one detector (Analyzer or Piezo).")
-            return
-        
-        # If there are error messages, show them and stop
-        if error_message:
-            messagebox.showerror("Missing or Invalid Values", error_message)
-            return
-        
-        print(f"🔲 Running alignment for detectors: {selected_detectors}")
-        self.success_label.config(text=f"Running alignment for detectors: {selected_detectors}")
-
-        # Get the alignment requests and ranges
-        Autoalign.initialization()
-        Autoalign.show_figures_in_tabs(alignment_info)
-        
-        print("✅ All selected detectors processed.\n")        
-        self.success_label.config(text=f"All selected detectors processed.")
-        
-        # Call the update function after the alignment is done
-        self.update_gui()
-
-    def update_gui(self):
-        """ Updates the GUI after alignment to allow for a new run. """
-        # Enable checkboxes and clear range entries for the next run
-        for i in range(12):
-            # Deselect all checkboxes (Analyzer and Piezo)
-            self.analyzer_vars[i].set(False)
-            self.piezo_vars[i].set(False)
-            
-            # Reset range entry colors to the default (white)
-            self.detector_range_entries[i]['analyzer_start'].config(bg="white")
-            self.detector_range_entries[i]['analyzer_end'].config(bg="white")
-            self.detector_range_entries[i]['analyzer_step'].config(bg="white")
-            self.detector_range_entries[i]['piezo_start'].config(bg="white")
-            self.detector_range_entries[i]['piezo_end'].config(bg="white")
-            self.detector_range_entries[i]['piezo_step'].config(bg="white")       
-
-# Create the Tkinter root window
-root = tk.Tk()
-
-# Create the motor alignment app
-app = MotorAlignmentApp(root)
-
-# Run the application
-root.mainloop()
+import tkinter as tk
+from tkinter import messagebox, ttk
+import Autoalign_pv_v3 as Autoalign
+import Autoalign_snapshot
+from Autoalign_journal import unfinished_session, discard_journal
+
+# Create the main application window
+class MotorAlignmentApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Motor Alignment")
+        
+        # Create the main frame
+        self.frame = tk.Frame(self.root)
+        self.frame.grid(row=0, column=0, padx=10, pady=10)
+
+        # Column headers for Analyzer checkbox, Start/End/Step for Analyzer, Piezo checkbox, Start/End/Step for Piezo
+        self.headers = ['Detector', 'Analyzer', 'Start', 'End', 'Step', 'Piezo', 'Start', 'End', 'Step']
+        for col, header in enumerate(self.headers):
+            header_label = tk.Label(self.frame, text=header, font=("Helvetica", 10, 'bold'))
+            header_label.grid(row=0, column=col, padx=10, pady=5, sticky="w")
+
+        # Create variables for global checkboxes
+        self.global_analyzer_var = tk.BooleanVar(value=False)
+        self.global_piezo_var = tk.BooleanVar(value=False)
+
+        # Create global checkboxes for Analyzer and Piezo with bold font
+        self.global_analyzer_chk = tk.Checkbutton(self.frame, text="Analyzer", variable=self.global_analyzer_var, command=self.toggle_analyzer_checkboxes, font=("Helvetica", 10, 'bold'))
+        self.global_analyzer_chk.grid(row=0, column=1, padx=10, pady=5, sticky="w")
+
+        self.global_piezo_chk = tk.Checkbutton(self.frame, text="Piezo", variable=self.global_piezo_var, command=self.toggle_piezo_checkboxes, font=("Helvetica", 10, 'bold'))
+        self.global_piezo_chk.grid(row=0, column=5, padx=10, pady=5, sticky="w")
+
+        self.detector_vars = []
+        self.detector_range_entries = {}
+        self.analyzer_vars = []  
+        self.piezo_vars = []  
+
+        for i in range(12):  
+            # Create checkboxes for Analyzer and Piezo Motor alignment
+            analyzer_var = tk.BooleanVar(value=False)
+            piezo_var = tk.BooleanVar(value=False)
+            self.analyzer_vars.append(analyzer_var)
+            self.piezo_vars.append(piezo_var)
+
+            # Detector number
+            detector_label = tk.Label(self.frame, text=str(i+1), font=("Helvetica", 10, 'bold'))
+            detector_label.grid(row=i + 1, column=0, padx=5, pady=5)
+
+            # Analyzer checkbox
+            analyzer_chk = tk.Checkbutton(self.frame, variable=analyzer_var, command=lambda i=i: self.update_range_color(i, "Analyzer"))
+            analyzer_chk.grid(row=i + 1, column=1, padx=5, pady=5)
+            
+            
+            # Analyzer Start
+            analyzer_start_entry = tk.Entry(self.frame,width=25)
+            analyzer_start_entry.grid(row=i + 1, column=2, padx=5, pady=5)
+            
+            # Analyzer End
+            analyzer_end_entry = tk.Entry(self.frame,width=25)
+            analyzer_end_entry.grid(row=i + 1, column=3, padx=5, pady=5)
+            
+            # Analyzer Step
+            analyzer_step_entry = tk.Entry(self.frame,width=25)
+            analyzer_step_entry.grid(row=i + 1, column=4, padx=5, pady=5)
+            analyzer_step_entry.insert(0, '0.00125')
+
+            # Piezo checkbox
+            piezo_chk = tk.Checkbutton(self.frame, variable=piezo_var, command=lambda i=i: self.update_range_color(i, "Piezo"))
+            piezo_chk.grid(row=i + 1, column=5, padx=10, pady=5)
+
+            # Piezo Start
+            piezo_start_entry = tk.Entry(self.frame,width=25)
+            piezo_start_entry.grid(row=i + 1, column=6, padx=5, pady=5)
+
+            # Piezo End
+            piezo_end_entry = tk.Entry(self.frame,width=25)
+            piezo_end_entry.grid(row=i + 1, column=7, padx=5, pady=5)
+            
+            # Piezo Step
+            piezo_step_entry = tk.Entry(self.frame,width=25)
+            piezo_step_entry.grid(row=i + 1, column=8, padx=5, pady=5)
+            piezo_step_entry.insert(0, '0.1')
+
+            # Store entries in dictionary for easy access
+            self.detector_range_entries[i] = {
+                'analyzer_start': analyzer_start_entry,
+                'analyzer_end': analyzer_end_entry,
+                'analyzer_step': analyzer_step_entry,
+                'piezo_start': piezo_start_entry,
+                'piezo_end': piezo_end_entry,
+                'piezo_step': piezo_step_entry
+            }
+
+        # Add a block and copy button for Analyzer Start
+        self.analyzer_start_block = tk.Entry(self.frame, width=10)  
+        self.analyzer_start_block.grid(row=0, column=2, padx=5, pady=5)
+        self.analyzer_start_block.insert(0, '4.2')  
+
+        self.refresh_button = tk.Button(self.frame, text="↻", command=self.copy_analyzer_start, font=("Helvetica", 12, 'bold'))
+        self.refresh_button.grid(row=0, column=2, padx=5, pady=5, sticky="e") 
+
+        # Add a block and copy button for Analyzer End
+        self.analyzer_end_block = tk.Entry(self.frame, width=10)
+        self.analyzer_end_block.grid(row=0, column=3, padx=5, pady=5)
+        self.analyzer_end_block.insert(0, '4.3')
+
+        self.refresh_button_end = tk.Button(self.frame, text="↻", command=self.copy_analyzer_end, font=("Helvetica", 12, 'bold'))
+        self.refresh_button_end.grid(row=0, column=3, padx=5, pady=5, sticky="e")
+
+        # Add a block and copy button for Analyzer Step
+        self.analyzer_step_block = tk.Entry(self.frame, width=10)
+        self.analyzer_step_block.grid(row=0, column=4, padx=5, pady=5)
+        self.analyzer_step_block.insert(0, '0.00125')
+
+        self.refresh_button_step = tk.Button(self.frame, text="↻", command=self.copy_analyzer_step, font=("Helvetica", 12, 'bold'))
+        self.refresh_button_step.grid(row=0, column=4, padx=5, pady=5, sticky="e")
+
+        # Add a block and copy button for Piezo Start
+        self.piezo_start_block = tk.Entry(self.frame, width=10)
+        self.piezo_start_block.grid(row=0, column=6, padx=5, pady=5)
+        self.piezo_start_block.insert(0, '2')
+
+        self.refresh_button_piezo_start = tk.Button(self.frame, text="↻", command=self.copy_piezo_start, font=("Helvetica", 12, 'bold'))
+        self.refresh_button_piezo_start.grid(row=0, column=6, padx=5, pady=5, sticky="e")
+
+        # Add a block and copy button for Piezo End
+        self.piezo_end_block = tk.Entry(self.frame, width=10)
+        self.piezo_end_block.grid(row=0, column=7, padx=5, pady=5)
+        self.piezo_end_block.insert(0, '12')
+
+        self.refresh_button_piezo_end = tk.Button(self.frame, text="↻", command=self.copy_piezo_end, font=("Helvetica", 12, 'bold'))
+        self.refresh_button_piezo_end.grid(row=0, column=7, padx=5, pady=5, sticky="e")
+
+        # Add a block and copy button for Piezo Step
+        self.piezo_step_block = tk.Entry(self.frame, width=10)
+        self.piezo_step_block.grid(row=0, column=8, padx=5, pady=5)
+        self.piezo_step_block.insert(0, '0.1')
+
+        self.refresh_button_piezo_step = tk.Button(self.frame, text="↻", command=self.copy_piezo_step, font=("Helvetica", 12, 'bold'))
+        self.refresh_button_piezo_step.grid(row=0, column=8, padx=5, pady=5, sticky="e")
+
+        # Auto range: center ± k·FWHM from the alignment history, step from the target number of points
+        auto_label = tk.Label(self.frame, text="Auto range", font=("Helvetica", 10, 'bold'))
+        auto_label.grid(row=13, column=0, padx=5, pady=5, sticky="w")
+
+        tk.Label(self.frame, text="k·FWHM").grid(row=13, column=1, padx=5, pady=5, sticky="e")
+        self.auto_k_block = tk.Entry(self.frame, width=10)
+        self.auto_k_block.grid(row=13, column=2, padx=5, pady=5, sticky="w")
+        self.auto_k_block.insert(0, '1.5')
+
+        tk.Label(self.frame, text="Points").grid(row=13, column=3, padx=5, pady=5, sticky="e")
+        self.auto_points_block = tk.Entry(self.frame, width=10)
+        self.auto_points_block.grid(row=13, column=4, padx=5, pady=5, sticky="w")
+        self.auto_points_block.insert(0, '41')
+
+        self.auto_range_button = tk.Button(self.frame, text="Apply to selected", command=self.apply_auto_ranges)
+        self.auto_range_button.grid(row=13, column=5, columnspan=2, padx=5, pady=5, sticky="w")
+
+        # Prefill every detector that has a previous alignment result
+        self.prefill_auto_ranges(range(12), ["Analyzer", "Piezo"])
+
+        # Session options and the Align button, one column each
+        self.options_frame = tk.Frame(self.root)
+        self.options_frame.grid(row=1, column=0, padx=20, pady=10)
+
+        # Quick drift check: probe a few points around the last best position before a full scan
+        self.quick_check_var = tk.BooleanVar(value=False)
+        self.quick_check_chk = tk.Checkbutton(self.options_frame, text="Quick drift check", variable=self.quick_check_var, font=("Helvetica", 10))
+        self.quick_check_chk.grid(row=0, column=0, padx=20, pady=10, sticky="w")
+
+        # Align Motors Button
+        self.align_button = tk.Button(self.options_frame, text="Align Motors", command=self.align_motors)
+        self.align_button.grid(row=0, column=1, padx=20, pady=10)
+
+        # One results window, created at the first alignment and reused afterwards
+        self.results_window = None
+
+        # Run the alignment in its own process; its plot window can be closed and reopened while it runs
+        self.isolated_var = tk.BooleanVar(value=False)
+        self.isolated_chk = tk.Checkbutton(self.options_frame, text="Separate process", variable=self.isolated_var, font=("Helvetica", 10))
+        self.isolated_chk.grid(row=0, column=2, padx=20, pady=10, sticky="e")
+
+        # Controls of the running session, one column each
+        self.controls_frame = tk.Frame(self.root)
+        self.controls_frame.grid(row=2, column=0, padx=20)
+
+        self.attach_button = tk.Button(self.controls_frame, text="Show results", command=self.attach_engine)
+        self.attach_button.grid(row=0, column=0, padx=10, pady=5)
+
+        # Resume: continue an interrupted session from its journal
+        self.resume_button = tk.Button(self.controls_frame, text="Resume", command=self.resume_alignment)
+        self.resume_button.grid(row=0, column=1, padx=10, pady=5)
+
+        # Abort: stops the moving motor and ends the scan; the points measured so far stay recorded
+        self.abort_button = tk.Button(self.controls_frame, text="Abort", fg="red", command=self.abort_alignment, state="disabled")
+        self.abort_button.grid(row=0, column=2, padx=10, pady=5)
+
+        # Closing the main window aborts a running alignment instead of leaving its motors moving
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Success Label, on its own row so long messages do not cover the buttons
+        self.success_label = tk.Label(self.root, text="", fg="green", font=("Helvetica", 12), wraplength=800)
+        self.success_label.grid(row=3, column=0, padx=20, pady=5)
+
+        # Status panel: overall progress and ETA, and one line per detector and motor of the running alignment
+        self.status_frame = tk.Frame(self.root)
+        self.status_frame.grid(row=4, column=0, padx=20, pady=10, sticky="we")
+        self.progress_bar = ttk.Progressbar(self.status_frame, orient="horizontal", mode="determinate", maximum=1.0)
+        self.progress_bar.pack(fill="x")
+        self.status_label = tk.Label(self.status_frame, text="", font=("Helvetica", 10))
+        self.status_label.pack(anchor="w")
+        self.status_columns = ['Detector', 'Motor', 'State', 'Points', 'Iteration', 'Best position', 'Elapsed']
+        self.status_table = ttk.Treeview(self.status_frame, columns=self.status_columns, show="headings", height=6)
+        for column in self.status_columns:
+            self.status_table.heading(column, text=column)
+            self.status_table.column(column, width=100, anchor="center")
+        self.status_table.tag_configure("stalled", background="orange")
+        self.status_table.tag_configure("done", foreground="green")
+        self.status_table.tag_configure("not aligned", foreground="red")
+        self.status_table.tag_configure("failed", background="tomato")
+        status_scroll = ttk.Scrollbar(self.status_frame, orient="vertical", command=self.status_table.yview)
+        self.status_table.configure(yscrollcommand=status_scroll.set)
+        status_scroll.pack(side="right", fill="y")
+        self.status_table.pack(fill="x")
+        self.status_job = None
+
+    def toggle_analyzer_checkboxes(self):
+        """ Toggles all individual Analyzer checkboxes based on the global Analyzer checkbox """
+        state = self.global_analyzer_var.get()
+        for var in self.analyzer_vars:
+            var.set(state)
+
+        # Update the range color when toggling Analyzer checkboxes
+        for i in range(12):
+            self.update_range_color(i, "Analyzer")
+
+    def toggle_piezo_checkboxes(self):
+        """ Toggles all individual Piezo checkboxes based on the global Piezo checkbox """
+        state = self.global_piezo_var.get()
+        for var in self.piezo_vars:
+            var.set(state)
+
+        # Update the range color when toggling Piezo checkboxes
+        for i in range(12):
+            self.update_range_color(i, "Piezo")
+
+    def update_range_color(self, detector_id, motor_type):
+        """ Update the background color of the range entry boxes when a checkbox is checked or unchecked """
+        if motor_type == "Analyzer":
+            if self.analyzer_vars[detector_id].get():
+                # Set range entry fields to green when Analyzer is checked
+                self.detector_range_entries[detector_id]['analyzer_start'].config(bg="lightgreen")
+                self.detector_range_entries[detector_id]['analyzer_end'].config(bg="lightgreen")
+                self.detector_range_entries[detector_id]['analyzer_step'].config(bg="lightgreen")
+            else:
+                # Reset to default color when Analyzer is unchecked
+                self.detector_range_entries[detector_id]['analyzer_start'].config(bg="white")
+                self.detector_range_entries[detector_id]['analyzer_end'].config(bg="white")
+                self.detector_range_entries[detector_id]['analyzer_step'].config(bg="white")
+
+        elif motor_type == "Piezo":
+            if self.piezo_vars[detector_id].get():
+                # Set range entry fields to green when Piezo is checked
+                self.detector_range_entries[detector_id]['piezo_start'].config(bg="lightgreen")
+                self.detector_range_entries[detector_id]['piezo_end'].config(bg="lightgreen")
+                self.detector_range_entries[detector_id]['piezo_step'].config(bg="lightgreen")
+            else:
+                # Reset to default color when Piezo is unchecked
+                self.detector_range_entries[detector_id]['piezo_start'].config(bg="white")
+                self.detector_range_entries[detector_id]['piezo_end'].config(bg="white")
+                self.detector_range_entries[detector_id]['piezo_step'].config(bg="white")
+
+    def copy_analyzer_start(self):
+        """ Copy the value from the Analyzer Start block to all Analyzer Start positions """
+        analyzer_start_value = self.analyzer_start_block.get()
+
+        # Set the value in all analyzer start fields
+        for i in range(12):
+            self.detector_range_entries[i]['analyzer_start'].delete(0, tk.END)
+            self.detector_range_entries[i]['analyzer_start'].insert(0, analyzer_start_value)
+
+    def copy_analyzer_end(self):
+        """ Copy the value from the Analyzer End block to all Analyzer End positions """
+        analyzer_end_value = self.analyzer_end_block.get()
+
+        # Set the value in all analyzer end fields
+        for i in range(12):
+            self.detector_range_entries[i]['analyzer_end'].delete(0, tk.END)
+            self.detector_range_entries[i]['analyzer_end'].insert(0, analyzer_end_value)
+
+    def copy_analyzer_step(self):
+        """ Copy the value from the Analyzer Step block to all Analyzer Step positions """
+        analyzer_step_value = self.analyzer_step_block.get()
+
+        # Set the value in all analyzer step fields
+        for i in range(12):
+            self.detector_range_entries[i]['analyzer_step'].delete(0, tk.END)
+            self.detector_range_entries[i]['analyzer_step'].insert(0, analyzer_step_value)
+
+    def copy_piezo_start(self):
+        """ Copy the value from the Piezo Start block to all Piezo Start positions """
+        piezo_start_value = self.piezo_start_block.get()
+
+        # Set the value in all piezo start fields
+        for i in range(12):
+            self.detector_range_entries[i]['piezo_start'].delete(0, tk.END)
+            self.detector_range_entries[i]['piezo_start'].insert(0, piezo_start_value)
+
+    def copy_piezo_end(self):
+        """ Copy the value from the Piezo End block to all Piezo End positions """
+        piezo_end_value = self.piezo_end_block.get()
+
+        # Set the value in all piezo end fields
+        for i in range(12):
+            self.detector_range_entries[i]['piezo_end'].delete(0, tk.END)
+            self.detector_range_entries[i]['piezo_end'].insert(0, piezo_end_value)
+
+    def copy_piezo_step(self):
+        """ Copy the value from the Piezo Step block to all Piezo Step positions """
+        piezo_step_value = self.piezo_step_block.get()
+
+        # Set the value in all piezo step fields
+        for i in range(12):
+            self.detector_range_entries[i]['piezo_step'].delete(0, tk.END)
+            self.detector_range_entries[i]['piezo_step'].insert(0, piezo_step_value)
+
+
+    def prefill_auto_ranges(self, detector_indices, motor_types):
+        """ Fill Start/End/Step from the last fitted center and FWHM of each detector """
+        try:
+            k = float(self.auto_k_block.get())
+            n_points = int(self.auto_points_block.get())
+        except ValueError:
+            messagebox.showerror("Invalid Auto Range", "k and Points must be numbers.")
+            return []
+
+        filled = []
+        for i in detector_indices:
+            for motor_type in motor_types:
+                suggestion = Autoalign.suggest_scan_range(i + 1, motor_type, k, n_points)
+                if suggestion is None:
+                    continue
+                prefix = motor_type.lower()
+                for field in ('start', 'end', 'step'):
+                    entry = self.detector_range_entries[i][f'{prefix}_{field}']
+                    entry.delete(0, tk.END)
+                    entry.insert(0, str(suggestion[field]))
+                filled.append((i + 1, motor_type))
+        return filled
+
+    def apply_auto_ranges(self):
+        """ Apply the history-based ranges to every selected detector """
+        filled = []
+        for i in range(12):
+            motor_types = []
+            if self.analyzer_vars[i].get():
+                motor_types.append("Analyzer")
+            if self.piezo_vars[i].get():
+                motor_types.append("Piezo")
+            filled += self.prefill_auto_ranges([i], motor_types)
+        if filled:
+            self.success_label.config(text=f"Auto range applied to {len(filled)} selected motors.")
+        else:
+            self.success_label.config(text="No alignment history for the selected detectors.")
+
+    def align_motors(self):
+        """ Runs alignment for each selected detector in sequence. """
+        
+        # Get selected detectors in order
+        selected_detectors = []
+        alignment_info = {}
+        error_message = ""  
+
+        for i in range(12):
+            detector_info = {}
+            # Check if either Analyzer or Piezo checkbox is checked
+            if self.analyzer_vars[i].get() or self.piezo_vars[i].get():
+                # Check if Start, End, and Step values are provided for Analyzer
+                if self.analyzer_vars[i].get():
+                    analyzer_start = self.detector_range_entries[i]['analyzer_start'].get()
+                    analyzer_end = self.detector_range_entries[i]['analyzer_end'].get()
+                    analyzer_step = self.detector_range_entries[i]['analyzer_step'].get()
+                    if not analyzer_start or not analyzer_end or not analyzer_step:
+                        error_message += f"Error: Analyzer Start, End, and Step values missing for Detector {i+1}.\n"
+                    else:
+                        try:
+                            analyzer_start = float(analyzer_start)
+                            analyzer_end = float(analyzer_end)
+                            analyzer_step = float(analyzer_step)
+                            if analyzer_start >= analyzer_end:
+                                error_message += f"Analyzer start position must be less than the end position for Detector {i+1}.\n"
+                            if analyzer_step <= 0:
+                                error_message += f"Analyzer step size must be positive for Detector {i+1}.\n"
+                            else:
+                                detector_info['analyzer'] = {
+                                    'start': analyzer_start,
+                                    'end': analyzer_end,
+                                    'step': analyzer_step
+                                }                            
+                        except ValueError:
+                            error_message += f"Invalid value for Analyzer Start/End/Step for Detector {i+1}.\n"
+                # Check if Start, End, and Step values are provided for Piezo
+                if self.piezo_vars[i].get():
+                    piezo_start = self.detector_range_entries[i]['piezo_start'].get()
+                    piezo_end = self.detector_range_entries[i]['piezo_end'].get()
+                    piezo_step = self.detector_range_entries[i]['piezo_step'].get()
+                    if not piezo_start or not piezo_end or not piezo_step:
+                        error_message += f"Error: Piezo Start, End, and Step values missing for Detector {i+1}.\n"
+                    else:
+                        try:
+                            piezo_start = float(piezo_start)
+                            piezo_end = float(piezo_end)
+                            piezo_step = float(piezo_step)
+                            if piezo_start >= piezo_end:
+                                error_message += f"Piezo start position must be less than the end position for Detector {i+1}.\n"                                                         
+                            if not (0 <= piezo_start <= 15) or not (0 <= piezo_end <= 15):
+                                error_message += f"Error: Piezo range for Detector {i+1} is out of bounds (0-15).\n"
+                            if piezo_step <= 0:
+                                error_message += f"Piezo step size must be positive for Detector {i+1}.\n"
+                            else:
+                                detector_info['piezo'] = {
+                                    'start': piezo_start,
+                                    'end': piezo_end,
+                                    'step': piezo_step
+                                }
+                        except ValueError:
+                            error_message += f"Error: Invalid Piezo range or Step for Detector {i+1}.\n"
+
+            if detector_info:
+                if self.quick_check_var.get():
+                    for motor_info in detector_info.values():
+                        motor_info['quick_check'] = True
+                alignment_info[i + 1] = detector_info
+                selected_detectors.append(i + 1)                
+
+        if not selected_detectors:
+            messagebox.showwarning("No Detector Selected", "Please select at least one detector (Analyzer or Piezo).")
+            return
+        
+        # If there are error messages, show them and stop
+        if error_message:
+            messagebox.showerror("Missing or Invalid Values", error_message)
+            return
+
+        # A new session would overwrite the journal of an interrupted one
+        if Autoalign.journal_path is not None and unfinished_session(Autoalign.journal_path):
+            if not messagebox.askyesno("Unfinished Session",
+                                       "The last alignment session was interrupted and can still be resumed. "
+                                       "Discard it and start a new alignment?"):
+                return
+            discard_journal(Autoalign.journal_path)
+        
+        print(f"🔲 Running alignment for detectors: {selected_detectors}")
+        self.success_label.config(text=f"Running alignment for detectors: {selected_detectors}", fg="green")
+
+        # Record where all motors are, so a bad alignment can be rolled back with Autoalign_snapshot.py restore
+        if self.results_window is None or not self.results_window.is_running():
+            try:
+                Autoalign_snapshot.take_snapshot(note=f"Before aligning detectors {selected_detectors}")
+            except Exception as e:
+                print(f"Error saving the motor positions: {e}")
+        self.start_alignment(alignment_info)
+
+    def start_alignment(self, alignment_info, resume=None):
+        """ Start the alignment in the results window; resume is the journal state of an interrupted session """
+        if self.results_window is None:
+            self.results_window = Autoalign.ResultsWindow(self.root)
+        if self.results_window.is_running():
+            messagebox.showwarning("Alignment Running", "Wait for the running alignment to finish.")
+            return
+
+        # Start the alignment without blocking; alignment_done is called when it has finished
+        self.results_window.start(alignment_info, isolated=self.isolated_var.get(), on_done=self.alignment_done,
+                                  resume=resume)
+        self.align_button.config(state="disabled")
+        self.resume_button.config(state="disabled")
+        self.abort_button.config(state="normal")
+        self.refresh_status()
+
+    def resume_alignment(self):
+        """ Continue the last session from its journal, skipping the motors it already aligned """
+        try:
+            state = Autoalign.load_journal(Autoalign.journal_path)
+        except Exception as e:
+            messagebox.showerror("Session Journal", f"Error reading the session journal: {e}")
+            return
+        if state is None or state['finished']:
+            messagebox.showinfo("Nothing to Resume", "The last alignment session has finished.")
+            return
+        detectors = list(state['alignment_info'])
+        if not messagebox.askokcancel("Resume Alignment",
+                                      f"Resume the alignment of detectors {detectors}? "
+                                      f"{len(state['results'])} motors are already aligned and will be skipped."):
+            return
+        print(f"🔲 Resuming alignment for detectors: {detectors}")
+        self.success_label.config(text=f"Resuming alignment for detectors: {detectors}", fg="green")
+        self.start_alignment(state['alignment_info'], resume=state)
+
+    def abort_alignment(self):
+        """ Cancel the running alignment at once """
+        if self.results_window is None or not self.results_window.is_running():
+            return
+        print("🛑 Aborting alignment.")
+        self.success_label.config(text="Aborting alignment...", fg="red")
+        self.abort_button.config(state="disabled")
+        self.results_window.abort()
+
+    def on_close(self):
+        """ Abort a running alignment before closing the application """
+        if self.results_window is not None and self.results_window.is_running():
+            if self.results_window.engine is None:
+                if not messagebox.askokcancel("Alignment Running", "Abort the running alignment and quit?"):
+                    return
+                self.results_window.abort()
+                self.results_window.wait(timeout=5)
+            elif not messagebox.askyesno("Alignment Running",
+                                         "The alignment runs in a separate process and continues after closing. Quit anyway?"):
+                return
+        self.root.destroy()
+
+    def refresh_status(self):
+        """ Show the status of the alignment twice a second while it runs """
+        if self.status_job is not None:
+            self.root.after_cancel(self.status_job)  # One refresh loop, also when called directly
+            self.status_job = None
+        status = self.results_window.status if self.results_window is not None else None
+        if status is None:
+            return
+        self.progress_bar['value'] = status.progress()
+        self.status_label.config(text=status.summary())
+        rows = status.table()
+        items = self.status_table.get_children()
+        if len(items) != len(rows):
+            self.status_table.delete(*items)
+            items = [self.status_table.insert("", "end") for _ in rows]
+        for item, row in zip(items, rows):
+            self.status_table.item(item, values=row, tags=(row[2],))
+            if row[2] in ("scanning", "probing", "fitted", "stalled"):
+                self.status_table.see(item)
+        if status.end_time is None:
+            self.status_job = self.root.after(500, self.refresh_status)
+
+    def alignment_done(self):
+        self.align_button.config(state="normal")
+        self.resume_button.config(state="normal")
+        self.abort_button.config(state="disabled")
+        if self.results_window.aborted:
+            print("🛑 Alignment aborted.\n")
+            self.success_label.config(text="Alignment aborted. The measured points are kept in the scan record.", fg="red")
+            self.refresh_status()
+            return
+        print("✅ All selected detectors processed.\n")        
+        self.success_label.config(text="All selected detectors processed.", fg="green")
+        self.refresh_status()
+
+        # Call the update function after the alignment is done
+        self.update_gui()
+
+    def attach_engine(self):
+        """Reopen the results window, e.g. of the alignment running in a separate process."""
+        if self.results_window is None:
+            messagebox.showinfo("No Alignment", "No alignment has been started yet.")
+            return
+        self.results_window.show()
+
+    def update_gui(self):
+        """ Updates the GUI after alignment to allow for a new run. """
+        # Enable checkboxes and clear range entries for the next run
+        for i in range(12):
+            # Deselect all checkboxes (Analyzer and Piezo)
+            self.analyzer_vars[i].set(False)
+            self.piezo_vars[i].set(False)
+            
+            # Reset range entry colors to the default (white)
+            self.detector_range_entries[i]['analyzer_start'].config(bg="white")
+            self.detector_range_entries[i]['analyzer_end'].config(bg="white")
+            self.detector_range_entries[i]['analyzer_step'].config(bg="white")
+            self.detector_range_entries[i]['piezo_start'].config(bg="white")
+            self.detector_range_entries[i]['piezo_end'].config(bg="white")
+            self.detector_range_entries[i]['piezo_step'].config(bg="white")       
+
+# Guarded: a "Separate process" engine is spawned and re-imports this script as __mp_main__
+if __name__ == "__main__":
+    # Create the Tkinter root window
+    root = tk.Tk()
+
+    # Create the motor alignment app
+    app = MotorAlignmentApp(root)
+
+    # Run the application
+    root.mainloop()
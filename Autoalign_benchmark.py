@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import Autoalign_pv_v3 as Autoalign
+import Autoalign_fake_epics
+from Autoalign_sim_beamline import SimBeamline, TWO_THETA_PV
+from Autoalign_history import AlignmentHistory
+from Autoalign_profile import PhaseTimer, PHASES
+from Autoalign_metrics import AlignmentMetrics
+
+# Default folder for the benchmark results, one JSON file per run
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+ANALYZER_RANGE = {'start': 4.2, 'end': 4.3, 'step': 0.00125}
+PIEZO_RANGE = {'start': 2.0, 'end': 12.0, 'step': 0.1}
+TWO_THETA_RANGE = {'start': -0.5, 'end': 0.5, 'step': 0.02}
+
+def setup_piezo_reruns(beamline):
+    """Put the piezo peak of detector 5 near the end of the range so run_alignment nudges the analyzer twice."""
+    beamline.peaks[5].piezo_center = 12.0
+
+# Benchmark scenarios: alignment_info plus an optional beamline setup
+SCENARIOS = {
+    'analyzer_single': ({1: {'analyzer': ANALYZER_RANGE}}, None),
+    'piezo_reruns': ({5: {'piezo': PIEZO_RANGE}}, setup_piezo_reruns),
+    'all12': ({i: {'analyzer': ANALYZER_RANGE, 'piezo': PIEZO_RANGE} for i in range(1, 13)}, None),
+    'two_theta_sweep': (None, None),
+}
+
+def make_figures(draw):
+    """Headless Analyzer and Piezo figures, and an update callback that draws them like the GUI if draw is set."""
+    figures = {}
+    for motor_name in ("Analyzer", "Piezo"):
+        fig = Figure(figsize=(18, 8))
+        canvas = FigureCanvasAgg(fig)
+        figures[motor_name] = (fig, fig.subplots(2, 6).flatten(), canvas)
+
+    def update_callback():
+        if draw:
+            for fig, axes, canvas in figures.values():
+                canvas.draw()
+    return figures, update_callback
+
+def two_theta_sweep(detector_ids=range(1, 13)):
+    """Step the 2theta arm around each detector angle and read its ROI, as Autoalign_2theta does."""
+    motor_config = Autoalign.MotorConfig()
+    arm = Autoalign.drives['motor'](TWO_THETA_PV)
+    for detector_id in detector_ids:
+        angle = -2 * (detector_id - 1)
+        position = angle + TWO_THETA_RANGE['start']
+        best_angle, max_intensity = None, None
+        while position <= angle + TWO_THETA_RANGE['end'] + 1e-9:
+            arm.move_to(position)
+            roi_value = Autoalign.drives['detector'](detector_id, motor_config).get_roi_intensity(position)
+            if max_intensity is None or roi_value > max_intensity:
+                best_angle, max_intensity = position, roi_value
+            with Autoalign.timer.phase('settle'):
+                Autoalign.drives['sleep'](0.1)
+            position += TWO_THETA_RANGE['step']
+        arm.move_to(best_angle)
+        print(f"   → Detector {detector_id}: max intensity {max_intensity:.0f} at {best_angle:.4f} deg.")
+
+def run_scenario(name, backend="sim", seed=0, draw=False):
+    """Run one scenario on a fresh simulated beamline and return its phase summary."""
+    alignment_info, setup = SCENARIOS[name]
+    beamline = SimBeamline(seed=seed)
+    if setup is not None:
+        setup(beamline)
+    if backend == "fake_pv":
+        Autoalign_fake_epics.install(beamline)
+    else:
+        beamline.use()
+
+    saved_history, saved_timer, saved_metrics = Autoalign.history, Autoalign.timer, Autoalign.metrics
+    saved_export, saved_journal_path = dict(Autoalign.metrics_export), Autoalign.journal_path
+    with tempfile.TemporaryDirectory() as temp_dir:
+        Autoalign.history = AlignmentHistory(os.path.join(temp_dir, "benchmark_history.db"))
+        Autoalign.timer = PhaseTimer(beamline.clock)
+        Autoalign.metrics = AlignmentMetrics()
+        Autoalign.metrics_export.update(path=None, port=None)
+        Autoalign.journal_path = None  # Leave the journal of the last beamline session for a resume
+        compute_start = time.perf_counter()
+        try:
+            if alignment_info is None:
+                two_theta_sweep()
+            else:
+                figures, update_callback = make_figures(draw)
+                Autoalign.run_session(alignment_info, figures, update_callback, record=False)
+            summary = Autoalign.timer.summary()
+        finally:
+            Autoalign.history, Autoalign.timer, Autoalign.metrics = saved_history, saved_timer, saved_metrics
+            Autoalign.metrics_export.update(saved_export)
+            Autoalign.journal_path = saved_journal_path
+            Autoalign_fake_epics.uninstall()
+    summary['compute_seconds'] = time.perf_counter() - compute_start
+    summary['simulated_seconds'] = beamline.clock.time()
+    return summary
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)), text=True).strip()
+    except Exception:
+        return None
+
+def print_table(results):
+    """One row per scenario with the seconds spent in each phase."""
+    print(f"{'Scenario':<16} {'total [s]':>10} " + " ".join(f"{phase:>9}" for phase in PHASES) + f" {'other':>9} {'compute':>9}")
+    for name, summary in results.items():
+        phases = summary['phases']
+        print(f"{name:<16} {summary['total']:>10.2f} "
+              + " ".join(f"{phases.get(phase, {'seconds': 0.0})['seconds']:>9.2f}" for phase in PHASES)
+              + f" {summary['other']:>9.2f} {summary['compute_seconds']:>9.2f}")
+
+def compare(results, previous_path):
+    """Print the change of total and per-phase time against a previous benchmark file."""
+    with open(previous_path) as f:
+        previous = json.load(f)
+    print(f"Change against {previous_path} ({previous.get('revision')}):")
+    for name, summary in results.items():
+        if name not in previous['results']:
+            continue
+        old = previous['results'][name]
+        changes = [f"total {summary['total'] - old['total']:+.2f} s"]
+        for phase in PHASES:
+            new_seconds = summary['phases'].get(phase, {'seconds': 0.0})['seconds']
+            old_seconds = old['phases'].get(phase, {'seconds': 0.0})['seconds']
+            changes.append(f"{phase} {new_seconds - old_seconds:+.2f}")
+        print(f"  {name:<16} " + ", ".join(changes))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end alignment time per phase on the simulator.")
+    parser.add_argument("--backend", default="sim", choices=["sim", "fake_pv"],
+                        help="sim: simulated drive classes; fake_pv: production drive classes on the fake channel access")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--draw", action="store_true", help="draw both figures after every point, like the GUI")
+    parser.add_argument("--output", default=None, help="JSON results file (default: benchmarks/<time>.json)")
+    parser.add_argument("--compare", default=None, help="previous JSON results file to compare against")
+    args = parser.parse_args()
+
+    results = {name: run_scenario(name, args.backend, args.seed, args.draw) for name in args.scenarios}
+    print_table(results)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, time.strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'revision': git_revision(),
+            'backend': args.backend,
+            'seed': args.seed,
+            'draw': args.draw,
+            'python': sys.version.split()[0],
+            'results': results
+        }, f, indent=2)
+    print(f"Saved benchmark results to {output}")
+    if args.compare:
+        compare(results, args.compare)
@@ -0,0 +1,42 @@
+import os
+import json
+
+# Config file with tuned alignment parameters, read by Autoalign_pv_v3 at import
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "autoalign_config.json")
+
+# Magic constants of run_alignment, used when the config file does not set them
+DEFAULT_PARAMS = {
+    'off_center_limit': 2.5,  # Piezo: max distance of the peak from the middle of the range
+    'edge_scale': 0.005,  # Piezo: analyzer nudge when the peak is at the start of the range
+    'nudge_scale': 0.003,  # Piezo: analyzer nudge when the peak is off center
+    'max_iterations': 6,  # Scans per motor, reruns included
+    'p0_sigma': 1.0,  # Initial sigma of the Gaussian fit
+}
+
+def load_params(path=DEFAULT_CONFIG_PATH):
+    """Return DEFAULT_PARAMS updated with the 'params' of the config file, if there is one."""
+    params = dict(DEFAULT_PARAMS)
+    if not os.path.exists(path):
+        return params
+    try:
+        with open(path) as f:
+            stored = json.load(f).get('params', {})
+    except Exception as e:
+        print(f"Error reading alignment config {path}: {e}. Using default parameters.")
+        return params
+    for key, value in stored.items():
+        if key not in DEFAULT_PARAMS:
+            print(f"Ignoring unknown alignment parameter {key} in {path}")
+            continue
+        params[key] = type(DEFAULT_PARAMS[key])(value)
+    return params
+
+def save_params(params, path=DEFAULT_CONFIG_PATH, metadata=None):
+    """Write the parameters (and optional metadata such as the tuning score) to the config file."""
+    config = {'params': {key: params[key] for key in DEFAULT_PARAMS if key in params}}
+    if metadata is not None:
+        config['metadata'] = metadata
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(config, f, indent=2)
+    os.replace(temp_path, path)
@@ -0,0 +1,214 @@
+import numpy as np
+import multiprocessing as mp
+from threading import Thread
+from multiprocessing import shared_memory
+from Autoalign_events import ScanStarted, PointAcquired, FitDone, AlignmentDone, AlignmentFailed
+
+# One slot of scan arrays per detector and motor
+MOTORS = ("Analyzer", "Piezo")
+SLOTS = 12 * len(MOTORS)
+MAX_POINTS = 4096  # Longer scans are plotted up to this point
+
+# Integer columns per slot, float columns per slot, and session fields
+SCAN_SEQ, KIND, ITERATION, N_POINTS, N_ACQUIRED, FIT_SEQ, DONE_SEQ, FAIL_SEQ = range(8)
+AMPLITUDE, MEAN, SIGMA, BEST_POSITION, MAX_INTENSITY = range(5)
+STATE, CURRENT_DETECTOR, CURRENT_MOTOR = range(3)
+KINDS = ("scan", "probe")
+
+# Session states
+IDLE, RUNNING, FINISHED, STOPPED, FAILED = range(5)
+STATE_NAMES = ("idle", "running", "finished", "stopped", "failed")
+
+def slot_index(detector_id, motor_name):
+    return (detector_id - 1) * len(MOTORS) + MOTORS.index(motor_name)
+
+# ScanBuffer Class: scan arrays of a session in shared memory, readable by any process that attaches by name
+class ScanBuffer:
+    def __init__(self, name=None, create=False):
+        layout = [('ints', np.int64, (SLOTS, 8)), ('floats', np.float64, (SLOTS, 5)),
+                  ('positions', np.float64, (SLOTS, MAX_POINTS)), ('roi', np.float64, (SLOTS, MAX_POINTS)),
+                  ('times', np.float64, (SLOTS, MAX_POINTS)), ('session', np.int64, (3,))]
+        size = sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in layout)
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.name = self.shm.name
+        offset = 0
+        for field, dtype, shape in layout:
+            array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+        if create:
+            for field, _, _ in layout:
+                getattr(self, field)[...] = 0
+
+    def state(self):
+        return STATE_NAMES[int(self.session[STATE])]
+
+    def close(self):
+        # Drop the array views first, shared memory cannot be closed while they export its buffer
+        self.ints = self.floats = self.positions = self.roi = self.times = self.session = None
+        self.shm.close()
+
+# ScanBufferWriter Class: event sink of run_session in the engine process
+class ScanBufferWriter:
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+    def put(self, event):
+        """Write one event to the shared arrays; sequence numbers are written last so readers see whole updates."""
+        slot = slot_index(event.detector_id, event.motor_name)
+        ints, floats = self.buffer.ints[slot], self.buffer.floats[slot]
+        if isinstance(event, ScanStarted):
+            n_points = min(len(event.positions), MAX_POINTS)
+            self.buffer.positions[slot, :n_points] = event.positions[:n_points]
+            ints[KIND] = KINDS.index(event.kind)
+            ints[ITERATION] = event.iteration
+            ints[N_POINTS] = n_points
+            ints[N_ACQUIRED] = 0
+            ints[SCAN_SEQ] += 1
+            self.buffer.session[CURRENT_DETECTOR] = event.detector_id
+            self.buffer.session[CURRENT_MOTOR] = MOTORS.index(event.motor_name)
+        elif isinstance(event, PointAcquired):
+            if event.index < ints[N_POINTS]:
+                self.buffer.roi[slot, event.index] = event.roi
+                self.buffer.times[slot, event.index] = event.timestamp
+                ints[N_ACQUIRED] = event.index + 1
+        elif isinstance(event, FitDone):
+            floats[AMPLITUDE], floats[MEAN], floats[SIGMA] = event.amplitude, event.mean, event.sigma
+            ints[FIT_SEQ] = ints[SCAN_SEQ]
+        elif isinstance(event, AlignmentDone):
+            floats[BEST_POSITION], floats[MAX_INTENSITY] = event.best_position, event.max_intensity
+            ints[DONE_SEQ] = ints[SCAN_SEQ]
+        elif isinstance(event, AlignmentFailed):
+            ints[FAIL_SEQ] += 1  # The reason is printed by the engine, not stored
+
+# ScanBufferReader Class: turns the shared arrays back into events for the plots of an attached GUI
+class ScanBufferReader:
+    def __init__(self, name):
+        self.buffer = ScanBuffer(name)
+        self.seen = {}  # slot -> [scan seq, points delivered, fit seq, done seq, fail seq]
+
+    def poll(self):
+        """Events for everything that changed since the last poll; a new reader replays the current scans."""
+        events = []
+        ints = self.buffer.ints.copy()
+        for slot in range(SLOTS):
+            scan_seq = ints[slot, SCAN_SEQ]
+            if scan_seq == 0 and ints[slot, FAIL_SEQ] == 0:
+                continue  # Not started; a failed 2theta move fails a slot before its first scan
+            detector_id, motor_name = slot // len(MOTORS) + 1, MOTORS[slot % len(MOTORS)]
+            iteration = int(ints[slot, ITERATION])
+            seen = self.seen.get(slot)
+            batch = []
+            if seen is None:
+                seen = [0, 0, 0, 0, 0]
+            if seen[0] != scan_seq:
+                positions = tuple(self.buffer.positions[slot, :ints[slot, N_POINTS]].tolist())
+                batch.append(ScanStarted(detector_id, motor_name, iteration, KINDS[ints[slot, KIND]], positions))
+                seen = [scan_seq, 0, 0, 0, seen[4]]
+            n_acquired = int(ints[slot, N_ACQUIRED])
+            for index in range(seen[1], n_acquired):
+                batch.append(PointAcquired(detector_id, motor_name, iteration, index,
+                                           float(self.buffer.positions[slot, index]), float(self.buffer.roi[slot, index]),
+                                           float(self.buffer.times[slot, index])))
+            floats = self.buffer.floats[slot].copy()
+            if ints[slot, FIT_SEQ] == scan_seq and seen[2] != scan_seq:
+                batch.append(FitDone(detector_id, motor_name, iteration,
+                                     float(floats[AMPLITUDE]), float(floats[MEAN]), float(floats[SIGMA])))
+            if ints[slot, DONE_SEQ] == scan_seq and seen[3] != scan_seq:
+                batch.append(AlignmentDone(detector_id, motor_name, float(floats[BEST_POSITION]), float(floats[MAX_INTENSITY])))
+            if ints[slot, FAIL_SEQ] != seen[4]:
+                batch.append(AlignmentFailed(detector_id, motor_name, "see the engine output"))
+            # The engine may have started another scan of this slot meanwhile; read it again next time
+            if self.buffer.ints[slot, SCAN_SEQ] != scan_seq:
+                continue
+            self.seen[slot] = [scan_seq, max(n_acquired, seen[1]),
+                               scan_seq if any(isinstance(event, FitDone) for event in batch) else seen[2],
+                               scan_seq if any(isinstance(event, AlignmentDone) for event in batch) else seen[3],
+                               int(ints[slot, FAIL_SEQ])]
+            events.extend(batch)
+        return events
+
+    def state(self):
+        return self.buffer.state()
+
+    def close(self):
+        self.buffer.close()
+
+def engine_main(alignment_info, buffer_name, control, backend=None, resume=False):
+    """Entry point of the engine process: run the session and write its scans to the shared buffer."""
+    import Autoalign_pv_v3 as Autoalign
+    if backend == "sim":
+        # Simulated beamline in real time, for trying the process setup without EPICS
+        from Autoalign_sim_beamline import SimBeamline
+        from Autoalign_sim_v3 import RealClock
+        SimBeamline(clock=RealClock()).use()
+    buffer = ScanBuffer(buffer_name)
+    buffer.session[STATE] = RUNNING
+
+    def listen():
+        """Commands from the GUI; stop aborts the alignment, which stops the moving motor at once."""
+        while True:
+            command = control.get()
+            if command == "stop":
+                Autoalign.request_abort()
+            elif command is None:
+                return
+
+    listener = Thread(target=listen, daemon=True)
+    listener.start()
+    try:
+        Autoalign.run_session(alignment_info, events=ScanBufferWriter(buffer), resume=resume)
+        buffer.session[STATE] = FINISHED
+    except Autoalign.AlignmentAborted:
+        print("Alignment stopped on request.")
+        buffer.session[STATE] = STOPPED
+    except Exception as e:
+        print(f"Error in alignment engine: {e}")
+        buffer.session[STATE] = FAILED
+    finally:
+        control.put(None)  # End the listener
+        buffer.close()
+
+# AlignmentEngine Class: handle of an alignment session running in its own process.
+# The engine process is spawned and imports the starting script as __mp_main__, so a script that
+# starts an engine must keep its top-level code (e.g. the Tk mainloop) under if __name__ == "__main__".
+class AlignmentEngine:
+    def __init__(self, alignment_info, backend=None, resume=False):
+        self.alignment_info = alignment_info
+        self.backend = backend  # None for EPICS, "sim" for the simulated beamline
+        self.resume = resume  # Continue the journaled session instead of starting over
+        # Spawn, so the engine does not inherit the Tk and matplotlib state of the GUI
+        self.context = mp.get_context("spawn")
+        self.buffer = ScanBuffer(create=True)
+        self.control = self.context.Queue()
+        self.process = None
+
+    def start(self):
+        self.process = self.context.Process(target=engine_main, name="AutoalignEngine",
+                                            args=(self.alignment_info, self.buffer.name, self.control, self.backend, self.resume))
+        self.process.start()
+        return self
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def state(self):
+        return self.buffer.state()
+
+    def attach(self):
+        """Return a reader of the running session; closing it (detaching) does not affect the engine."""
+        return ScanBufferReader(self.buffer.name)
+
+    def stop(self):
+        """Abort the alignment: the engine stops the moving motor and ends the scan."""
+        self.control.put("stop")
+
+    def join(self, timeout=None):
+        if self.process is not None:
+            self.process.join(timeout)
+
+    def close(self):
+        """Free the shared memory once the engine has ended."""
+        self.join()
+        self.buffer.close()
+        self.buffer.shm.unlink()
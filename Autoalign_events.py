@@ -0,0 +1,29 @@
+import queue
+from collections import namedtuple
+
+# Events published by the alignment engine; immutable, so the GUI can read them from any thread
+
+# A scan (kind "scan") or drift-check probe (kind "probe") over the given positions begins
+ScanStarted = namedtuple('ScanStarted', 'detector_id motor_name iteration kind positions')
+
+# One point of the current scan or probe was read, at time.time() timestamp
+PointAcquired = namedtuple('PointAcquired', 'detector_id motor_name iteration index position roi timestamp')
+
+# Gaussian fit of the finished scan
+FitDone = namedtuple('FitDone', 'detector_id motor_name iteration amplitude mean sigma')
+
+# The motor was moved to its best position
+AlignmentDone = namedtuple('AlignmentDone', 'detector_id motor_name best_position max_intensity')
+
+# A motor or the ROI channel failed; the rest of this detector is skipped
+AlignmentFailed = namedtuple('AlignmentFailed', 'detector_id motor_name reason')
+
+def drain(events, limit=None):
+    """Return the events waiting on the queue without blocking (at most limit of them)."""
+    batch = []
+    while limit is None or len(batch) < limit:
+        try:
+            batch.append(events.get_nowait())
+        except queue.Empty:
+            break
+    return batch
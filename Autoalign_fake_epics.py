@@ -0,0 +1,151 @@
+import Autoalign_pv_v3 as Autoalign
+from Autoalign_sim_beamline import SimBeamline, TWO_THETA_PV
+from Autoalign_sim_v3 import RealClock
+
+# FakeChannelAccess Class: in-process stand-in for epics.caget/caput backed by a SimBeamline
+class FakeChannelAccess:
+    def __init__(self, beamline=None, seed=0):
+        # Motors really take time to move unless the beamline runs on a virtual clock
+        self.beamline = beamline if beamline is not None else SimBeamline(clock=RealClock(), seed=seed)
+        self.clock = self.beamline.clock
+        self.motor_config = self.beamline.motor_config
+        self.roi_pvs = {pv_name: i + 1 for i, pv_name in enumerate(self.motor_config.lambda_flex_detectors)}
+        self.puts = []  # Every (time, pv name, value), for checking what the code under test commanded
+        self.pending_callbacks = []  # (done time, callback, pv name) of puts that are still moving
+
+    def _split(self, pvname):
+        record, _, field = pvname.partition('.')
+        return record, field or 'VAL'
+
+    def _fire_callbacks(self):
+        """Run the put callbacks of moves that have finished."""
+        now = self.clock.time()
+        due = [pending for pending in self.pending_callbacks if pending[0] <= now]
+        self.pending_callbacks = [pending for pending in self.pending_callbacks if pending[0] > now]
+        for _, callback, pvname in due:
+            callback(pvname=pvname)
+
+    def poll(self, evt=1.e-5, iot=1.0):
+        """Deliver finished put callbacks, like epics.poll: only evt passes, iot is not waited without pending gets."""
+        self.clock.sleep(evt)
+        self._fire_callbacks()
+
+    def wait(self, seconds):
+        """Wait between put completion checks on the beamline clock; True once an abort is requested."""
+        if Autoalign.abort.is_set():
+            return True
+        self.clock.sleep(seconds)
+        return Autoalign.abort.is_set()
+
+    def caget(self, pvname, as_string=False, count=None, as_numpy=True, use_monitor=True, timeout=5.0, connection_timeout=5.0):
+        """Return the value of a motor record field or ROI PV, or None for unknown PVs like pyepics."""
+        self._fire_callbacks()
+        if pvname in self.roi_pvs:
+            return self.beamline.roi_counts(self.roi_pvs[pvname])
+        record, field = self._split(pvname)
+        motor = self.beamline.motors.get(record)
+        if motor is None:
+            return None
+        now = self.clock.time()
+        values = {
+            'VAL': motor.target,
+            'RBV': motor.readback_at(now),
+            'DRBV': motor.readback_at(now),
+            'DMOV': 0 if motor.is_moving() else 1,
+            'MOVN': 1 if motor.is_moving() else 0,
+            'VELO': motor.velocity,
+            'ACCL': motor.velocity / motor.acceleration,  # Motor records store the acceleration time
+            'BDST': motor.backlash,
+            'RDBD': max(motor.encoder_noise * 5, 1e-6),
+            'STOP': 0
+        }
+        return values.get(field)
+
+    def caget_many(self, pvlist, as_string=False, as_numpy=True, count=None, timeout=1.0, connection_timeout=5.0, conn_timeout=None):
+        """Return the values of several PVs at once."""
+        return [self.caget(pvname) for pvname in pvlist]
+
+    def _put(self, pvname, value, wait, timeout, callback):
+        """Write a motor record field; with wait=True return once the move is done (None on timeout)."""
+        record, field = self._split(pvname)
+        motor = self.beamline.motors.get(record)
+        if motor is None:
+            raise ValueError(f"Unknown PV {pvname}")
+        self.puts.append((self.clock.time(), pvname, value))
+        if field == 'STOP':
+            if value:
+                motor.stop()
+        elif field == 'VAL':
+            motor.move(float(value))
+        elif field == 'VELO':
+            motor.velocity = float(value)
+        else:
+            raise ValueError(f"Field {field} of {record} is not writable in the fake channel access")
+
+        if callback is not None:
+            self.pending_callbacks.append((motor.done_time(), callback, pvname))
+        if wait:
+            remaining = motor.done_time() - self.clock.time()
+            if remaining > timeout:
+                self.clock.sleep(timeout)
+                return None
+            self.clock.sleep(max(remaining, 0.0))
+        self._fire_callbacks()
+        return 1
+
+    # Same signatures as pyepics 3.5, so a call the real module rejects fails here too
+    def caput(self, pvname, value, wait=False, timeout=60.0, connection_timeout=5.0):
+        return self._put(pvname, value, wait, timeout, None)
+
+    def get_pv(self, pvname, form='time', connect=False, context=None, timeout=5.0, **kws):
+        return FakePV(self, pvname)
+
+# FakePV Class: the put side of an epics.PV on the fake channel access
+class FakePV:
+    def __init__(self, channel_access, pvname):
+        self.channel_access = channel_access
+        self.pvname = pvname
+        self.connected = channel_access.beamline.motors.get(channel_access._split(pvname)[0]) is not None
+        self._put_complete = None
+
+    @property
+    def put_complete(self):
+        # pyepics delivers put callbacks in its own thread; here they are delivered when asked
+        self.channel_access._fire_callbacks()
+        return self._put_complete
+
+    def put(self, value, wait=False, timeout=30.0, use_complete=False, callback=None, callback_data=None):
+        """Write the PV like epics.PV.put: None when not connected, put_complete set by the completion callback."""
+        if not self.connected:
+            return None
+
+        def put_callback(pvname=None, **kws):
+            self._put_complete = True
+            if callback is not None:
+                callback(pvname=pvname, data=callback_data, **kws)
+
+        self._put_complete = False if use_complete else None
+        return self.channel_access._put(self.pvname, value, wait, timeout,
+                                        put_callback if use_complete or callback else None)
+
+def install(beamline=None, seed=0):
+    """Point Autoalign_pv_v3 at a fake channel access and its simulated beamline; returns the backend.
+
+    The drive classes stay the production MotorDrive/TwoThetaDrive/LambdaFlexCount; only their
+    fixed delays follow the beamline clock, so a virtual-clock beamline runs without real waits.
+    """
+    backend = FakeChannelAccess(beamline, seed)
+    Autoalign.use_channel_access(backend)
+    Autoalign.use_epics_drives()
+    Autoalign.use_drives(sleep=backend.clock.sleep, wait=backend.wait)
+    return backend
+
+def uninstall():
+    """Go back to the real pyepics channel access."""
+    Autoalign.use_channel_access()
+    Autoalign.use_epics_drives()
+
+def served_pvs():
+    """Return the names of every MotorConfig PV the fake channel access serves."""
+    motor_config = Autoalign.MotorConfig()
+    return [TWO_THETA_PV] + motor_config.analyzer_motors + motor_config.piezo_motors + motor_config.lambda_flex_detectors
@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import sqlite3
+import numpy as np
+
+# Default location of the alignment history database, next to the alignment code
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "autoalign_history.db")
+
+# AlignmentHistory Class to store every alignment result on disk
+class AlignmentHistory:
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path  # The database file is only created on the first record
+
+    def _connect(self):
+        """Open the database and create the results table if needed."""
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS alignment_results (
+                   id INTEGER PRIMARY KEY AUTOINCREMENT,
+                   timestamp REAL NOT NULL,
+                   detector_id INTEGER NOT NULL,
+                   motor TEXT NOT NULL,
+                   best_position REAL NOT NULL,
+                   max_intensity REAL,
+                   fwhm REAL,
+                   fit_params TEXT,
+                   settings TEXT
+               )""")
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detector_motor ON alignment_results (detector_id, motor, timestamp)")
+        return connection
+
+    def record(self, detector_id, motor_name, best_position, max_intensity, fwhm, fit_params=None, settings=None, timestamp=None):
+        """Append one alignment result (fit parameters and scan settings are stored as JSON)."""
+        timestamp = time.time() if timestamp is None else timestamp
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT INTO alignment_results (timestamp, detector_id, motor, best_position, max_intensity, fwhm, fit_params, settings) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (timestamp, int(detector_id), motor_name, float(best_position),
+                     None if max_intensity is None else float(max_intensity),
+                     None if fwhm is None else float(fwhm),
+                     json.dumps(fit_params), json.dumps(settings)))
+        finally:
+            connection.close()
+
+    def results(self, detector_id, motor_name, limit=None):
+        """Return the stored results for one detector and motor, oldest first."""
+        query = "SELECT * FROM alignment_results WHERE detector_id = ? AND motor = ? ORDER BY timestamp DESC"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        connection = self._connect()
+        try:
+            rows = connection.execute(query, (int(detector_id), motor_name)).fetchall()
+        finally:
+            connection.close()
+        results = []
+        for row in reversed(rows):
+            result = dict(row)
+            result['fit_params'] = json.loads(result['fit_params']) if result['fit_params'] else None
+            result['settings'] = json.loads(result['settings']) if result['settings'] else None
+            results.append(result)
+        return results
+
+    def last(self, detector_id, motor_name):
+        """Return the most recent result for one detector and motor, or None."""
+        results = self.results(detector_id, motor_name, limit=1)
+        return results[-1] if results else None
+
+    def predict_position(self, detector_id, motor_name, at_time=None, n_points=5):
+        """Predict the best position at at_time from the last value plus the linear drift trend.
+
+        The trend is extrapolated at most as far as the time span it was fitted over, so a fit
+        from one day is not carried across a long shutdown.
+        Returns (position, drift per second, residual spread), or None without history.
+        """
+        results = self.results(detector_id, motor_name, limit=n_points)
+        if not results:
+            return None
+        at_time = time.time() if at_time is None else at_time
+        times = np.array([result['timestamp'] for result in results])
+        values = np.array([result['best_position'] for result in results])
+        if len(results) < 3 or times[-1] - times[0] <= 0:
+            spread = float(np.std(values)) if len(results) > 1 else 0.0
+            return float(values[-1]), 0.0, spread
+
+        # Fit relative to the last result so old timestamps do not dominate the conditioning
+        drift, offset = np.polyfit(times - times[-1], values, 1)
+        spread = float(np.std(values - (drift * (times - times[-1]) + offset)))
+        horizon = min(at_time - times[-1], times[-1] - times[0])
+        return float(offset + drift * horizon), float(drift), spread
+
+    def predict_range(self, detector_id, motor_name, k=1.5, at_time=None, n_points=5):
+        """Propose (start, end) for the next scan: predicted position ± (k·FWHM + 2·spread)."""
+        prediction = self.predict_position(detector_id, motor_name, at_time, n_points)
+        if prediction is None:
+            return None
+        position, _, spread = prediction
+        fwhm = self.last(detector_id, motor_name)['fwhm'] or 0.0
+        half_range = k * fwhm + 2 * spread
+        if half_range <= 0:
+            return None
+        return position - half_range, position + half_range
@@ -0,0 +1,86 @@
+import os
+import json
+import time
+
+# Journal of the last alignment session, read by a resume after a crash or an aborted run
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "autoalign_journal.jsonl")
+
+# UnfinishedSession Exception: a new session would overwrite the journal of an interrupted one
+class UnfinishedSession(Exception):
+    pass
+
+# SessionJournal Class: append-only JSON lines, one line per step, flushed to disk at once
+class SessionJournal:
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, alignment_info=None, resume=False):
+        """Start a new journal for alignment_info, or append to the existing one when resuming.
+
+        Raises UnfinishedSession instead of overwriting the journal of an interrupted session.
+        """
+        if not resume and unfinished_session(path):
+            raise UnfinishedSession(f"{path} holds an interrupted session; resume it or discard it first")
+        self.path = path
+        self.file = open(path, 'a' if resume else 'w')
+        if resume:
+            self.write('resume')
+        else:
+            self.write('session', alignment_info={str(k): v for k, v in alignment_info.items()})
+
+    def write(self, event, **fields):
+        """Append one entry; fsync, so the entry survives a crash of the GUI or the machine."""
+        entry = dict(event=event, time=time.time(), **fields)
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self, finished=False):
+        if finished:
+            self.write('end')
+        self.file.close()
+
+def load_journal(path=DEFAULT_JOURNAL_PATH):
+    """Replay a journal into the state a resume needs, or None if there is no journal.
+
+    Returns a dict with alignment_info, results {(detector_id, motor_name): result} of the finished
+    motors, the interrupted (detector_id, motor_name) or None, the last stable state of the
+    interrupted detector (alignment iteration and, for the piezo, the corrected analyzer position)
+    and finished (True when the session ended normally).
+    """
+    if not os.path.exists(path):
+        return None
+    state = {'alignment_info': None, 'results': {}, 'interrupted': None, 'iteration': 0,
+             'analyzer_position': None, 'finished': False}
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break  # Last line cut short by the crash
+            event = entry['event']
+            if event == 'session':
+                state['alignment_info'] = {int(k): v for k, v in entry['alignment_info'].items()}
+            elif event == 'start':
+                state['interrupted'] = (entry['detector_id'], entry['motor'])
+                state['iteration'] = entry['iteration']
+                state['analyzer_position'] = entry.get('analyzer_position')
+            elif event == 'correction':
+                state['iteration'] = entry['iteration']
+                state['analyzer_position'] = entry['analyzer_position']
+            elif event == 'result':
+                state['results'][(entry['detector_id'], entry['motor'])] = entry['result']
+                if state['interrupted'] == (entry['detector_id'], entry['motor']):
+                    state['interrupted'] = None
+            elif event == 'end':
+                state['finished'] = True
+    if state['alignment_info'] is None:
+        return None
+    return state
+
+def unfinished_session(path=DEFAULT_JOURNAL_PATH):
+    """True when the journal holds a session that did not end normally and can be resumed."""
+    state = load_journal(path)
+    return state is not None and not state['finished']
+
+def discard_journal(path=DEFAULT_JOURNAL_PATH):
+    """Give up resuming: move the journal aside to path + ".old", so a new session can start."""
+    if os.path.exists(path):
+        os.replace(path, path + ".old")
@@ -0,0 +1,168 @@
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Default Prometheus text file, e.g. for the node_exporter textfile collector
+DEFAULT_METRICS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "autoalign_metrics.prom")
+
+# Counters with their help text, labelled by detector and motor
+COUNTERS = {
+    'points': "Scan points acquired",
+    'moves': "Motor moves commanded",
+    'reruns': "Scans repeated after an analyzer nudge or a failed drift check",
+    'fit_failures': "Gaussian fits that failed",
+    'alignments': "Alignments finished with a best position",
+    'retries': "Channel access calls repeated after an error",
+    'failures': "Detectors skipped after a motor or detector failure"
+}
+
+# AlignmentMetrics Class to keep the counters and gauges of the alignment engine
+class AlignmentMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {name: {} for name in COUNTERS}  # name -> {(detector_id, motor_name): value}
+        self.point_seconds = {}  # (detector_id, motor_name) -> [total seconds, points]
+        self.current = (None, None)  # Detector and motor being aligned
+        self.session_start = None
+        self.session_end = None
+
+    def start_session(self):
+        with self.lock:
+            self.session_start = time.time()
+            self.session_end = None
+
+    def end_session(self):
+        with self.lock:
+            self.session_end = time.time()
+            self.current = (None, None)
+
+    def set_current(self, detector_id, motor_name):
+        with self.lock:
+            self.current = (detector_id, motor_name)
+
+    def count(self, name, detector_id=None, motor_name=None, value=1):
+        """Add value to a counter; without labels the current detector and motor are used."""
+        with self.lock:
+            if detector_id is None:
+                detector_id, motor_name = self.current
+            key = (detector_id, motor_name)
+            self.counters[name][key] = self.counters[name].get(key, 0) + value
+
+    def point(self, detector_id, motor_name, seconds):
+        """Count one scan point that took seconds from the move to the end of its delay."""
+        self.count('points', detector_id, motor_name)
+        with self.lock:
+            total = self.point_seconds.setdefault((detector_id, motor_name), [0.0, 0])
+            total[0] += seconds
+            total[1] += 1
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        with self.lock:
+            lines = []
+            for name, help_text in COUNTERS.items():
+                lines.append(f"# HELP autoalign_{name}_total {help_text}.")
+                lines.append(f"# TYPE autoalign_{name}_total counter")
+                for (detector_id, motor_name), value in sorted(self.counters[name].items(), key=str):
+                    lines.append(f"autoalign_{name}_total{_labels(detector_id, motor_name)} {value}")
+
+            lines.append("# HELP autoalign_seconds_per_point Mean time per scan point.")
+            lines.append("# TYPE autoalign_seconds_per_point gauge")
+            for (detector_id, motor_name), (seconds, points) in sorted(self.point_seconds.items(), key=str):
+                lines.append(f"autoalign_seconds_per_point{_labels(detector_id, motor_name)} {seconds / points:.6g}")
+
+            detector_id, motor_name = self.current
+            lines.append("# HELP autoalign_current_detector Detector being aligned (0 when idle).")
+            lines.append("# TYPE autoalign_current_detector gauge")
+            lines.append(f"autoalign_current_detector {detector_id or 0}")
+            lines.append("# HELP autoalign_current_motor Motor being aligned, as a label (1 while aligning).")
+            lines.append("# TYPE autoalign_current_motor gauge")
+            if motor_name is not None:
+                lines.append(f"autoalign_current_motor{_labels(detector_id, motor_name)} 1")
+
+            running = self.session_start is not None and self.session_end is None
+            lines.append("# HELP autoalign_session_running 1 while an alignment session is running.")
+            lines.append("# TYPE autoalign_session_running gauge")
+            lines.append(f"autoalign_session_running {int(running)}")
+            if self.session_start is not None:
+                lines.append("# HELP autoalign_session_start_timestamp_seconds Start of the last session.")
+                lines.append("# TYPE autoalign_session_start_timestamp_seconds gauge")
+                lines.append(f"autoalign_session_start_timestamp_seconds {self.session_start:.3f}")
+                elapsed = (self.session_end or time.time()) - self.session_start
+                lines.append("# HELP autoalign_session_elapsed_seconds Duration of the last session so far.")
+                lines.append("# TYPE autoalign_session_elapsed_seconds gauge")
+                lines.append(f"autoalign_session_elapsed_seconds {elapsed:.3f}")
+        return "\n".join(lines) + "\n"
+
+def _labels(detector_id, motor_name):
+    labels = []
+    if detector_id is not None:
+        labels.append(f'detector="{detector_id}"')
+    if motor_name is not None:
+        labels.append(f'motor="{motor_name}"')
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+# MetricsExporter Class to publish the metrics to a text file and/or a local HTTP endpoint
+class MetricsExporter:
+    def __init__(self, metrics, path=DEFAULT_METRICS_PATH, port=None, interval=5.0):
+        self.metrics = metrics
+        self.path = path  # Text file rewritten every interval seconds (None to disable)
+        self.port = port  # Serve http://localhost:port/metrics (None to disable)
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.server = None
+
+    def start(self):
+        if self.port is not None:
+            metrics = self.metrics
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    body = metrics.render().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass  # Keep the console for the alignment output
+
+            try:
+                self.server = ThreadingHTTPServer(("localhost", self.port), MetricsHandler)
+                threading.Thread(target=self.server.serve_forever, daemon=True).start()
+            except OSError as e:
+                print(f"Error starting metrics endpoint on port {self.port}: {e}")
+                self.server = None
+        if self.path is not None:
+            self.thread = threading.Thread(target=self._write_loop, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Write the final values and stop publishing."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def write(self):
+        """Write the metrics file; the temporary name keeps the collector from reading partial files."""
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(self.metrics.render())
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Error writing metrics file {self.path}: {e}")
+
+    def _write_loop(self):
+        self.write()
+        while not self.stop_event.wait(self.interval):
+            self.write()
+        self.write()
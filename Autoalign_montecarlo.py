@@ -0,0 +1,276 @@
+import argparse
+import warnings
+import numpy as np
+from scipy.optimize import curve_fit
+from Autoalign_sim_v3 import simulate_roi
+from Autoalign_config import DEFAULT_PARAMS
+
+def gaussian(x, amplitude, mean, sigma):
+    """Gaussian function for curve fitting."""
+    return amplitude * np.exp(-(x - mean)**2 / (2 * sigma**2))
+
+# Scan settings and distributions of the true peak for each motor type
+SCENARIOS = {
+    "Analyzer": {
+        'start': 4.2, 'end': 4.3, 'step': 0.00125,
+        'center': (4.25, 0.03),  # Mean and spread of the true peak position
+        'width': (0.003, 0.008),  # Range of the peak sigma
+        'velocity': 0.05,  # Motor speed in units per second
+    },
+    "Piezo": {
+        'start': 2.0, 'end': 12.0, 'step': 0.1,
+        'center': (7.0, 2.5),
+        'width': (1.0, 2.0),
+        'velocity': 5.0,
+        'coupling': (350.0, 650.0),  # Piezo peak shift per unit of analyzer nudge
+        'analyzer_width': (0.006, 0.01),
+    }
+}
+
+# Distributions shared by both motor types
+ASYMMETRY = (0.0, 0.5)
+NOISE_LEVEL = (5.0, 30.0)
+PEAK_INTENSITY = (500.0, 1500.0)
+
+# Fixed delays of Autoalign_pv_v3: after every move, after every scan point, and the 2theta move per scan
+MOVE_DELAY = 0.3
+SCAN_DELAY = 0.1
+TWO_THETA_TIME = 1.0
+
+# Trial Class: one randomized peak and the cost accumulated while aligning it
+class Trial:
+    def __init__(self, motor_name, scenario, rng, noise="uniform"):
+        self.motor_name = motor_name
+        self.noise = noise  # Noise model of simulate_roi
+        self.scenario = scenario
+        self.rng = rng
+        self.detector_id = int(rng.integers(1, 13))
+        self.center = rng.normal(*scenario['center'])
+        self.width = rng.uniform(*scenario['width'])
+        self.intensity = rng.uniform(*PEAK_INTENSITY)
+        self.asymmetry = rng.uniform(*ASYMMETRY)
+        self.noise_level = rng.uniform(*NOISE_LEVEL)
+        self.coupling = rng.uniform(*scenario['coupling']) if 'coupling' in scenario else 0.0
+        self.analyzer_width = rng.uniform(*scenario['analyzer_width']) if 'analyzer_width' in scenario else np.inf
+        self.analyzer_offset = 0.0  # Total analyzer nudge applied during a piezo alignment
+
+        self.position = scenario['start']
+        self.moves = 0
+        self.scans = 0
+        self.time = 0.0
+        self.fit_failures = 0
+
+    def true_center(self):
+        """Peak position after the analyzer nudges applied so far."""
+        return self.center + self.coupling * self.analyzer_offset
+
+    def move(self, position):
+        """Account for one move of the scanned motor."""
+        self.time += abs(position - self.position) / self.scenario['velocity'] + MOVE_DELAY
+        self.position = position
+        self.moves += 1
+
+    def nudge_analyzer(self, scale):
+        """Account for the two analyzer moves of the piezo recentering and shift the peak."""
+        self.analyzer_offset += scale
+        self.time += 2 * MOVE_DELAY
+        self.moves += 2
+
+    def scan(self, start, end, step):
+        """Scan start..end like run_alignment and return positions and ROI values."""
+        positions = np.arange(start, end + step, step)
+        amplitude = self.intensity * np.exp(-self.analyzer_offset**2 / (2 * self.analyzer_width**2))
+        roi_counts = simulate_roi(positions, self.true_center(), amplitude, self.width, self.asymmetry,
+                                  self.noise, self.noise_level, self.rng)
+        self.time += TWO_THETA_TIME
+        for pos in positions:
+            self.move(pos)
+        self.time += SCAN_DELAY * len(positions)
+        self.scans += 1
+        return positions, roi_counts
+
+    def finish(self, start, best_position):
+        """Final approach from the start of the range, as run_alignment does."""
+        self.move(start)
+        self.move(best_position)
+        return best_position
+
+def fit_peak(trial, positions, roi_counts, params):
+    """Gaussian fit as in run_alignment; returns (mean, sigma) or None when the fit fails."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # Thousands of fits; failures are counted instead
+            popt, _ = curve_fit(gaussian, positions, roi_counts,
+                                p0=[np.max(roi_counts), positions[np.argmax(roi_counts)], params['p0_sigma']])
+        amplitude, mean, sigma = popt
+        if sigma <= 0 or amplitude <= 0:
+            raise ValueError("Invalid Gaussian fit parameters")
+        return mean, sigma
+    except Exception:
+        trial.fit_failures += 1
+        return None
+
+def strategy_v1(trial, params):
+    """Autoalign_pv_v1 and the v3 analyzer: best position is the maximum ROI."""
+    s = trial.scenario
+    positions, roi_counts = trial.scan(s['start'], s['end'], s['step'])
+    return trial.finish(s['start'], positions[np.argmax(roi_counts)])
+
+def strategy_v2(trial, params, limit_shift=True):
+    """Autoalign_pv_v2: Gaussian fit, analyzer range recentered on a fitted mean outside the range."""
+    s = trial.scenario
+    start, end = s['start'], s['end']
+    for _ in range(params['max_iterations']):
+        positions, roi_counts = trial.scan(start, end, s['step'])
+        fit = fit_peak(trial, positions, roi_counts, params)
+        if fit is None:
+            return trial.finish(start, positions[np.argmax(roi_counts)])
+        mean = fit[0]
+        if trial.motor_name == "Analyzer" and (mean < start or mean > end):
+            shift = mean - (start + end) / 2
+            if params['recenter_tolerance'] < abs(shift) and (not limit_shift or abs(shift) < params['recenter_limit']):
+                start, end = start + shift, end + shift
+                continue
+            return None  # run_alignment returns without moving to a best position
+        return trial.finish(start, mean)
+    return None
+
+def strategy_sim_v3(trial, params):
+    """Autoalign_sim_v3: as v2, without the upper limit on the recentering shift."""
+    return strategy_v2(trial, params, limit_shift=False)
+
+def strategy_v3(trial, params):
+    """Autoalign_pv_v3: analyzer by maximum ROI; piezo recentered by analyzer nudges, then Gaussian fit."""
+    if trial.motor_name == "Analyzer":
+        return strategy_v1(trial, params)
+    s = trial.scenario
+    start, end = s['start'], s['end']
+    mid_pos = (start + end) / 2.0
+    for _ in range(params['max_iterations']):
+        positions, roi_counts = trial.scan(start, end, s['step'])
+        max_position = positions[np.argmax(roi_counts)]
+        if abs(max_position - mid_pos) > params['off_center_limit']:
+            # Same branch order as run_alignment, so the end-of-range case takes the nudge_scale
+            if max_position == start:
+                scale = params['edge_scale']
+            elif max_position < mid_pos:
+                scale = params['nudge_scale']
+            else:
+                scale = -params['nudge_scale']
+            trial.nudge_analyzer(scale)
+            continue
+        fit = fit_peak(trial, positions, roi_counts, params)
+        return trial.finish(start, fit[0] if fit is not None else max_position)
+    return None
+
+STRATEGIES = {
+    'v1': strategy_v1,
+    'v2': strategy_v2,
+    'sim_v3': strategy_sim_v3,
+    'v3': strategy_v3,
+}
+
+# Constants of the older versions: their iteration limit and the analyzer recentering pv_v3 does not have
+STRATEGY_PARAMS = {
+    'v2': {
+        'max_iterations': 3,
+        'recenter_tolerance': 0.00125 / 2,  # Analyzer: minimum range shift worth a rescan
+        'recenter_limit': 0.5,  # Analyzer: maximum range shift for a rescan
+    },
+    'sim_v3': {
+        'max_iterations': 3,
+        'recenter_tolerance': 0.00125 / 2,
+    },
+}
+
+def evaluate(strategy, motor_name, n_trials=1000, params=None, seed=0, noise="uniform"):
+    """Run n_trials randomized alignments of one strategy; returns one array per metric.
+
+    strategy is a name in STRATEGIES or a function(trial, params). The same seed gives the same
+    peaks for every strategy, so strategies are compared on equal trials.
+    """
+    if isinstance(strategy, str):
+        params = dict(DEFAULT_PARAMS, **STRATEGY_PARAMS.get(strategy, {}), **(params or {}))
+        strategy = STRATEGIES[strategy]
+    else:
+        params = dict(DEFAULT_PARAMS, **(params or {}))
+    rng = np.random.default_rng(seed)
+    errors, moves, times, fit_failures = [], [], [], []
+    for _ in range(n_trials):
+        trial = Trial(motor_name, SCENARIOS[motor_name], np.random.default_rng(rng.integers(2**63)), noise)
+        best_position = strategy(trial, params)
+        errors.append(np.nan if best_position is None else abs(best_position - trial.true_center()))
+        moves.append(trial.moves)
+        times.append(trial.time)
+        fit_failures.append(trial.fit_failures)
+    return {
+        'error': np.array(errors),
+        'moves': np.array(moves),
+        'time': np.array(times),
+        'fit_failures': np.array(fit_failures)
+    }
+
+def summarize(results):
+    """Summary statistics of evaluate() results."""
+    errors = results['error']
+    aligned = errors[~np.isnan(errors)]
+    return {
+        'mean_error': float(np.mean(aligned)) if len(aligned) else np.nan,
+        'p95_error': float(np.percentile(aligned, 95)) if len(aligned) else np.nan,
+        'not_aligned': float(np.mean(np.isnan(errors))),
+        'mean_moves': float(np.mean(results['moves'])),
+        'mean_time': float(np.mean(results['time'])),
+        'p95_time': float(np.percentile(results['time'], 95)),
+        'fit_failures': float(np.mean(results['fit_failures'] > 0))
+    }
+
+def print_summary_table(summaries):
+    """Print one row per (motor, strategy)."""
+    print(f"{'Motor':<9} {'Strategy':<8} {'mean err':>10} {'p95 err':>10} {'not aligned':>12} "
+          f"{'moves':>7} {'time [s]':>9} {'p95 time':>9} {'fit fail':>9}")
+    for (motor_name, name), summary in summaries.items():
+        print(f"{motor_name:<9} {name:<8} {summary['mean_error']:>10.5f} {summary['p95_error']:>10.5f} "
+              f"{summary['not_aligned']:>12.1%} {summary['mean_moves']:>7.1f} {summary['mean_time']:>9.1f} "
+              f"{summary['p95_time']:>9.1f} {summary['fit_failures']:>9.1%}")
+
+def plot_results(all_results, path):
+    """Save error and time histograms of every strategy, one column per motor type."""
+    from matplotlib.figure import Figure
+    motor_names = sorted({motor_name for motor_name, _ in all_results})
+    fig = Figure(figsize=(7 * len(motor_names), 8))
+    axes = fig.subplots(2, len(motor_names), squeeze=False)
+    for column, motor_name in enumerate(motor_names):
+        for (motor, name), results in all_results.items():
+            if motor != motor_name:
+                continue
+            errors = results['error'][~np.isnan(results['error'])]
+            axes[0, column].hist(errors, bins=50, histtype='step', label=name)
+            axes[1, column].hist(results['time'], bins=50, histtype='step', label=name)
+        axes[0, column].set_title(f"{motor_name} final center error")
+        axes[0, column].set_yscale('log')
+        axes[1, column].set_title(f"{motor_name} simulated wall time [s]")
+        for ax in axes[:, column]:
+            ax.legend(loc="upper right")
+            ax.grid(True)
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"Saved plots to {path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo comparison of the alignment strategies.")
+    parser.add_argument("--trials", type=int, default=1000, help="randomized alignments per strategy and motor")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument("--motors", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--noise", default="uniform", choices=["uniform", "gaussian", "poisson"])
+    parser.add_argument("--plot", default=None, help="save histograms to this image file")
+    args = parser.parse_args()
+
+    all_results, summaries = {}, {}
+    for motor_name in args.motors:
+        for name in args.strategies:
+            all_results[(motor_name, name)] = evaluate(name, motor_name, args.trials, seed=args.seed, noise=args.noise)
+            summaries[(motor_name, name)] = summarize(all_results[(motor_name, name)])
+    print_summary_table(summaries)
+    if args.plot:
+        plot_results(all_results, args.plot)
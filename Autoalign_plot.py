@@ -0,0 +1,140 @@
+import numpy as np
+from Autoalign_events import ScanStarted, PointAcquired, FitDone, drain
+
+def gaussian(x, amplitude, mean, sigma):
+    """Gaussian function for curve fitting."""
+    return amplitude * np.exp(-(x - mean)**2 / (2 * sigma**2))
+
+def update_plot(ax, line, peak_point, positions, roi_counts, legend):
+    if not roi_counts:
+        return
+
+    line.set_xdata(positions[:len(roi_counts)])
+    line.set_ydata(roi_counts)
+
+    # Find the maximum ROI value (peak data point)
+    max_index = np.argmax(roi_counts)
+    max_pos = positions[max_index]
+    max_val = roi_counts[max_index]
+
+    # Rescale only when the data leaves the view, so the blitted plot background stays valid:
+    # x covers the whole scan range and y keeps some headroom above the maximum
+    xmin, xmax = ax.get_xlim()
+    ymin, ymax = ax.get_ylim()
+    if positions[0] < xmin or positions[-1] > xmax or max_val > ymax or min(roi_counts) < ymin:
+        ax.relim()
+        ax.update_datalim([(positions[0], 0), (positions[-1], 1.2 * max_val)])
+        ax.autoscale_view()
+
+    # Set the peak point data
+    peak_point.set_xdata([max_pos])
+    peak_point.set_ydata([max_val])
+
+    # Update the legend with the Max ROI info for the peak point
+    legend.get_texts()[0].set_text(f"Max ROI: ({max_pos:.5f}, {max_val:.0f})")
+
+def decimate(x, y, max_points):
+    """Keep the highest point of each of max_points position buckets, so the peak survives."""
+    if len(x) <= max_points:
+        return np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    buckets = np.array_split(np.arange(len(x)), max_points)
+    keep = [bucket[np.argmax(np.asarray(y)[bucket])] for bucket in buckets]
+    return np.asarray(x, dtype=float)[keep], np.asarray(y, dtype=float)[keep]
+
+# DetectorPlot Class: fixed set of artists of one detector/motor axes, updated in place on every scan
+class DetectorPlot:
+    def __init__(self, ax, motor_name, max_ghosts=5, ghost_points=100):
+        self.ax = ax
+        self.max_ghosts = max_ghosts  # Earlier scans kept as ghost traces
+        self.ghost_points = ghost_points  # Points per ghost trace
+        self.ghosts = []  # (positions, roi counts) of the earlier scans, decimated
+        self.kind = None
+        self.positions = np.array([])
+        self.roi_counts = []
+
+        color = 'k' if motor_name == "Analyzer" else 'b'
+        self.ghost_line, = ax.plot([], [], color + '-', alpha=0.25, linewidth=0.8)
+        self.line, = ax.plot([], [], color + '-')
+        self.peak_point, = ax.plot([], [], 'ro', markersize=8)
+        self.gaussian_line, = ax.plot([], [], 'g--')
+        self.gaussian_line.set_visible(False)
+        self.probe_points, = ax.plot([], [], 'mx', markersize=8)
+        self.legend = None
+        self.fit_label = None
+
+    def set_legend(self, fit_label=None):
+        """Max ROI entry, plus the Gaussian entry after a fit; replaces the previous legend of the axes."""
+        if self.legend is not None and fit_label == self.fit_label:
+            return
+        self.fit_label = fit_label
+        if fit_label is None:
+            self.legend = self.ax.legend([self.peak_point], ["Max ROI"], loc="lower left")
+        else:
+            self.legend = self.ax.legend([self.peak_point, self.gaussian_line], ["Max ROI", fit_label], loc="lower left")
+
+    def start_scan(self, kind, positions):
+        self.kind = kind
+        self.positions = np.asarray(positions, dtype=float)
+        self.roi_counts = []
+        if kind == "probe":
+            self.probe_points.set_data([], [])
+            return
+        # The previous scan becomes a ghost trace, all ghosts in one line separated by NaN
+        if len(self.line.get_xdata()):
+            self.ghosts.append(decimate(self.line.get_xdata(), self.line.get_ydata(), self.ghost_points))
+            self.ghosts = self.ghosts[-self.max_ghosts:]
+            self.ghost_line.set_data(np.concatenate([np.append(x, np.nan) for x, _ in self.ghosts]),
+                                     np.concatenate([np.append(y, np.nan) for _, y in self.ghosts]))
+        self.line.set_data([], [])
+        self.peak_point.set_data([], [])
+        self.gaussian_line.set_visible(False)
+        self.set_legend()
+
+    def add_point(self, roi):
+        self.roi_counts.append(roi)
+        if self.kind == "probe":
+            self.probe_points.set_data(self.positions[:len(self.roi_counts)], self.roi_counts)
+            self.ax.relim()
+            self.ax.autoscale_view()
+        else:
+            update_plot(self.ax, self.line, self.peak_point, self.positions, self.roi_counts, self.legend)
+
+    def show_fit(self, amplitude, mean, sigma):
+        if self.kind != "scan":
+            return
+        self.gaussian_line.set_data(self.positions, gaussian(self.positions, amplitude, mean, sigma))
+        self.gaussian_line.set_visible(True)
+        self.set_legend(f"Gaussian Peak @ ({mean:.5f})")
+        update_plot(self.ax, self.line, self.peak_point, self.positions, self.roi_counts, self.legend)
+
+# PlotConsumer Class: the only code touching the plot artists, fed with the engine events
+class PlotConsumer:
+    def __init__(self, figures):
+        """figures maps "Analyzer"/"Piezo" to (fig, axes, canvas)."""
+        self.figures = figures
+        self.plots = {}  # (detector_id, motor_name) -> DetectorPlot, created at the first scan
+
+    def plot(self, detector_id, motor_name):
+        key = (detector_id, motor_name)
+        if key not in self.plots:
+            fig, axes, canvas = self.figures[motor_name]
+            self.plots[key] = DetectorPlot(axes[detector_id - 1], motor_name)
+        return self.plots[key]
+
+    def apply(self, event):
+        if isinstance(event, ScanStarted):
+            self.plot(event.detector_id, event.motor_name).start_scan(event.kind, event.positions)
+        elif isinstance(event, PointAcquired):
+            self.plot(event.detector_id, event.motor_name).add_point(event.roi)
+        elif isinstance(event, FitDone):
+            self.plot(event.detector_id, event.motor_name).show_fit(event.amplitude, event.mean, event.sigma)
+
+    def apply_batch(self, batch):
+        """Apply a list of events; returns True if there were any."""
+        for event in batch:
+            self.apply(event)
+        return bool(batch)
+
+    def drain(self, events):
+        """Apply every event that arrived on the queue since the last frame; returns True if the plots changed."""
+        return self.apply_batch(drain(events))
@@ -0,0 +1,100 @@
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# Phases reported by the benchmark, in display order
+PHASES = ('move', 'settle', 'read', 'fit', 'draw')
+
+# PhaseTimer Class to add up the time spent in each phase of an alignment and keep the individual spans
+class PhaseTimer:
+    def __init__(self, virtual_clock=None, max_spans=200000):
+        # With a virtual clock, simulated delays count as well as the real compute time
+        self.virtual_clock = virtual_clock
+        self.max_spans = max_spans  # Spans kept for the trace; totals keep counting beyond it
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.totals = {}  # Exclusive seconds per phase (time in nested phases is not counted twice)
+            self.counts = {}
+            self.maxima = {}  # Longest single span per phase
+            self.spans = []  # (phase, start, duration, thread id, tags)
+            self.start_time = self.now()
+
+    def now(self):
+        """Real time plus simulated time."""
+        return time.perf_counter() + (self.virtual_clock.time() if self.virtual_clock is not None else 0.0)
+
+    def set_tags(self, **tags):
+        """Tags (detector, motor, iteration...) attached to the following spans of this thread."""
+        self.local.tags = tags
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as one occurrence of the phase."""
+        stack = self.local.__dict__.setdefault('stack', [])
+        start = self.now()
+        stack.append(0.0)  # Time spent in nested phases
+        try:
+            yield
+        finally:
+            nested = stack.pop()
+            elapsed = self.now() - start
+            if stack:
+                stack[-1] += elapsed
+            with self.lock:
+                self.totals[name] = self.totals.get(name, 0.0) + elapsed - nested
+                self.counts[name] = self.counts.get(name, 0) + 1
+                self.maxima[name] = max(self.maxima.get(name, 0.0), elapsed)
+                if len(self.spans) < self.max_spans:
+                    self.spans.append((name, start, elapsed, threading.get_ident(), getattr(self.local, 'tags', None)))
+
+    def elapsed(self):
+        return self.now() - self.start_time
+
+    def summary(self):
+        """Seconds, counts and longest span per phase, plus the time not covered by any phase."""
+        with self.lock:
+            totals = dict(self.totals)
+            counts = dict(self.counts)
+            maxima = dict(self.maxima)
+        total = self.elapsed()
+        return {
+            'total': total,
+            'phases': {name: {'seconds': totals[name], 'count': counts[name], 'max': maxima[name]} for name in totals},
+            'other': total - sum(totals.values())
+        }
+
+    def print_summary(self):
+        """Print the per-phase table of the run."""
+        summary = self.summary()
+        print(f"{'Phase':<8} {'count':>7} {'total [s]':>10} {'mean [ms]':>10} {'max [ms]':>10} {'share':>7}")
+        for name, phase in sorted(summary['phases'].items(), key=lambda item: -item[1]['seconds']):
+            print(f"{name:<8} {phase['count']:>7} {phase['seconds']:>10.2f} {1000 * phase['seconds'] / phase['count']:>10.1f} "
+                  f"{1000 * phase['max']:>10.1f} {phase['seconds'] / max(summary['total'], 1e-9):>7.1%}")
+        print(f"{'other':<8} {'':>7} {summary['other']:>10.2f}")
+        print(f"{'total':<8} {'':>7} {summary['total']:>10.2f}")
+
+    def write_trace(self, path):
+        """Write the spans as a Chrome trace (chrome://tracing, Perfetto)."""
+        with self.lock:
+            spans = list(self.spans)
+        events = []
+        for name, start, duration, thread_id, tags in spans:
+            event = {
+                'name': name,
+                'cat': 'alignment',
+                'ph': 'X',
+                'ts': (start - self.start_time) * 1e6,
+                'dur': duration * 1e6,
+                'pid': 1,
+                'tid': thread_id
+            }
+            if tags:
+                event['args'] = tags
+            events.append(event)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
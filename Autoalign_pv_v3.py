@@ -1,313 +1,896 @@
-import numpy as np
-import time
-import epics
-from scipy.optimize import curve_fit
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
-from tkinter import Tk, ttk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from threading import Thread
-
-# TwoThetaDrive Class to Move the Arm to a Specified Angle 
-class TwoThetaDrive:
-    def __init__(self, detector_id):
-        # PV for the TwoTheta motor
-        self.pv_name = "11bmb:m28"  # TwoTheta motor PV name
-        self.detector_id = detector_id
-        self.angle = self.calculate_angle(self.detector_id)  # Initial angle based on detector ID
-    
-    def calculate_angle(self, detector_id):
-        """Calculate the 2Theta angle based on detector ID (1 to 12)."""
-        if 1 <= detector_id <= 12:
-            return -2 * (detector_id - 1)  # Angle will be 0, -2, -4, ..., -22
-        else:
-            raise ValueError("Detector ID must be between 1 and 12")
-
-    def get_pos(self):
-        """Fetch the current motor position from EPICS."""
-        self.position = epics.caget(self.pv_name)  # Update position
-        return self.position
-        
-    def move_to(self):
-        """Move the TwoTheta motor to the calculated angle."""
-        print(f"Moving 2theta arm to {self.angle} degrees to align Detector {self.detector_id}.")
-        try:
-            epics.caput(self.pv_name, self.angle, wait=True, timeout=600)  # Move motor to the calculated angle
-        except Exception as e:
-            print(f"Error moving 2theta motor {self.pv_name} to position {self.angle}: {e}")    
-        time.sleep(0.3)  # Simulate movement delay
-        
-# MotorDrive Class using epics.caput to set position
-class MotorDrive:
-    def __init__(self, pv_name):
-        self.pv_name = pv_name
-        self.position = epics.caget(self.pv_name)  # Get initial position
-
-    def get_pos(self):
-        """Fetch the current motor position from EPICS."""
-        self.position = epics.caget(self.pv_name)  # Update position
-        return self.position
-        
-    def move_to(self, position):
-        try:
-            epics.caput(self.pv_name, position, wait=True, timeout=600)
-        except Exception as e:
-            print(f"Error moving analyzer/piezo motor {self.pv_name} to position {position}: {e}")
-        self.position = position
-        time.sleep(0.3)  # Simulate movement delay
-
-# LambdaFlexCount Class to Read Intensity using epics.caget       
-class LambdaFlexCount:
-    def __init__(self, detector_id, motor_config):
-        self.pv_name = motor_config.lambda_flex_detectors[detector_id - 1]  # Access PV name based on detector_id
-        self.peak_intensity = epics.caget(self.pv_name)  # Get initial intensity
-        if self.peak_intensity is None:
-            raise ValueError(f"Invalid intensity value from Detector {detector_id}")  
-    
-    def get_roi_intensity(self, position):
-        intensity = self.peak_intensity  # Get the intensity from PV
-        return intensity 
-    
-class MotorConfig:
-    def __init__(self):
-        self.analyzer_motors = [
-            "11bmb:m22", "11bmb:m21", "11bmb:m20", "11bmb:m19", "11bmb:m18", "11bmb:m17",
-            "11bmb:m14", "11bmb:m13", "11bmb:m12", "11bmb:m11", "11bmb:m10", "11bmb:m9"
-        ]
-        self.piezo_motors = [
-            "11bmb:m44", "11bmb:m43", "11bmb:m42", "11bmb:m41", "11bmb:m40", "11bmb:m39",
-            "11bmb:m38", "11bmb:m37", "11bmb:m36", "11bmb:m35", "11bmb:m34", "11bmb:m33"
-        ]
-        self.lambda_flex_detectors = [
-            "11bmLambda:ROIStat1:12:Total_RBV", "11bmLambda:ROIStat1:11:Total_RBV", "11bmLambda:ROIStat1:10:Total_RBV",
-            "11bmLambda:ROIStat1:9:Total_RBV", "11bmLambda:ROIStat1:8:Total_RBV", "11bmLambda:ROIStat1:7:Total_RBV",
-            "11bmLambda:ROIStat1:6:Total_RBV", "11bmLambda:ROIStat1:5:Total_RBV", "11bmLambda:ROIStat1:4:Total_RBV",
-            "11bmLambda:ROIStat1:3:Total_RBV", "11bmLambda:ROIStat1:2:Total_RBV", "11bmLambda:ROIStat1:1:Total_RBV"
-        ]        
-
-def initialization():
-    global fig, axes
-    fig = None
-    axes = None
-    
-# Function to Create Figures if Needed
-def create_figure(motor_name):
-    """Create and return a figure with 12 subplots based on the motor type."""
-    global fig, axes
-
-    fig, axes = plt.subplots(2, 6, figsize=(18, 8))
-    fig.suptitle(f"{motor_name} Auto-alignment Results", fontsize=14)
-    fig.subplots_adjust(left=0.05, right=0.95, top=0.9, bottom=0.05, wspace=0.3, hspace=0.3)
-    axes = axes.flatten()
-    
-    for i in range(12):
-        axes[i].set_title(f"Detector {i+1}", fontsize=10)
-        axes[i].set_xlabel("Position", fontsize=10)
-        axes[i].set_ylabel("Intensity", fontsize=10)
-        axes[i].yaxis.set_major_formatter(ticker.ScalarFormatter())
-        axes[i].yaxis.get_major_formatter().set_scientific(True)   
-        axes[i].ticklabel_format(style='sci', axis='y', scilimits=(0, 0))        
-        axes[i].grid(True)
-        
-    return fig, axes
-
-def gaussian(x, amplitude, mean, sigma):
-    """Gaussian function for curve fitting."""
-    return amplitude * np.exp(-(x - mean)**2 / (2 * sigma**2))
-    
-def run_alignment(start_pos, end_pos, step_size, motor_name, detector_id, axes, fig, canvas, update_callback):
-    """Runs alignment for the given motor and updates live plot."""    
-    global alignment_counter 
-    # Check if the number of iterations has exceeded the limit
-    alignment_counter += 1
-    if alignment_counter > 6:
-        print("Maximum alignment iterations reached. Stopping further alignment.")
-        return 
-    
-    # Assign the analyzer and piezo motor PV name
-    motor_config = MotorConfig()
-    
-    # Move the 2thera arm to put detector in position for alignment
-    two_theta_motor = TwoThetaDrive(detector_id)
-    two_theta_motor.move_to() 
-    
-    # Create figures only if motor is selected
-    if motor_name == "Analyzer":
-        motor_pv = motor_config.analyzer_motors[detector_id - 1]
-    elif motor_name == "Piezo":
-        motor_pv = motor_config.piezo_motors[detector_id - 1]
-    else:
-        print(f"Skipping {motor_name} alignment. Not selected.")
-        return  # Exit if the motor isn't selected
-        
-    motor = MotorDrive(motor_pv)
-    positions = np.arange(start_pos, end_pos + step_size, step_size)
-    roi_counts = []
-    
-    ax = axes[detector_id - 1]
-    color = 'k' if motor_name == "Analyzer" else 'b'
-    line, = ax.plot([], [], color + '-')
-    peak_point, = ax.plot([], [], 'ro', markersize=8)
-    legend = ax.legend([peak_point], ["Max ROI"], loc="lower left")
-
-    # Perform the scan (in a separate thread to avoid blocking UI)
-    for pos in positions:
-        motor.move_to(pos)
-        detector = LambdaFlexCount(detector_id, motor_config)
-        roi_value = detector.get_roi_intensity(pos)
-        roi_counts.append(roi_value)
-        update_plot(ax, line, peak_point, positions, roi_counts, legend)
-
-        # Schedule the callback to refresh the figure
-        update_callback()
-        time.sleep(0.1)  # Simulated delay for the motor move and detector update
-    
-    # After the loop, perform Gaussian fit to the collected data
-    if motor_name == "Analyzer": 
-        finalrun_flag = True
-        max_index = np.argmax(roi_counts)
-        best_position = positions[max_index]  
-    elif motor_name == "Piezo":       
-        finalrun_flag = False
-        max_index = np.argmax(roi_counts)
-        max_position = positions[max_index]
-        mid_pos = (start_pos + end_pos) / 2.0
-        if abs(max_position - mid_pos) > 2.5:
-            if max_position == start_pos: 
-                scale = 0.005
-            elif max_position < mid_pos:
-                scale = 0.003
-            elif max_position > mid_pos:
-                scale = -0.003
-            elif max_position == end_pos: 
-                scale = -0.005
-            analyzer_pv = motor_config.analyzer_motors[detector_id - 1]
-            analyzer = MotorDrive(analyzer_pv)
-            pos_adj = analyzer.get_pos() + scale * (-1)**(detector_id + 1)
-            analyzer.move_to(pos_adj-0.1)
-            analyzer.move_to(pos_adj)
-            print(f"Fitted mean outside range. Adjusting analyzer with scale {scale}.") 
-            run_alignment(start_pos, end_pos, step_size, motor_name, detector_id, axes, fig, canvas, update_callback)           
-        else:
-            try:
-                popt, _ = curve_fit(gaussian, positions, roi_counts, p0=[np.max(roi_counts), positions[np.argmax(roi_counts)], 1])
-                amplitude, mean, sigma = popt
-                
-                finalrun_flag = True
-                best_position = mean
-                print(f"Best position (from Gaussian fit): {mean:.5f}")
-
-                # Update the plot with the fitted curve
-                fit_curve = gaussian(positions, *popt)
-                gaussian_line, = ax.plot(positions, fit_curve, 'g--')
-                legend = ax.legend([peak_point, gaussian_line], ["Max ROI", f"Gaussian Peak @ ({mean:.5f})"], loc="lower left")
-                update_plot(ax, line, peak_point, positions, roi_counts, legend)                 
-                    
-            except Exception as e:
-                print(f"Error fitting Gaussian: {e}")
-                # Fallback to using the max intensity position as the best position
-                max_index = np.argmax(roi_counts)
-                best_position = positions[max_index] 
-                print(f"Falling back to max intensity position: {best_position:.5f}")
-       
-    if finalrun_flag == True:
-        motor.move_to(start_pos)  
-        motor.move_to(best_position)
-        max_intensity = roi_counts[max_index]
-        print(f"Max ROI for detector {detector_id} - {motor_name}: ({best_position:.5f}, {max_intensity:.0f})")
-    update_callback()  # Final update after best position is found
-    
-    return
-    
-def update_plot(ax, line, peak_point, positions, roi_counts, legend):
-    if not roi_counts:
-        return
-    
-    line.set_xdata(positions[:len(roi_counts)])
-    line.set_ydata(roi_counts)
-    ax.relim()
-    ax.autoscale_view()
-
-    # Find the maximum ROI value (peak data point)
-    max_index = np.argmax(roi_counts)
-    max_pos = positions[max_index]
-    max_val = roi_counts[max_index]
-
-    # Set the peak point data
-    peak_point.set_xdata([max_pos])
-    peak_point.set_ydata([max_val])
-
-    # Update the legend with the Max ROI info for the peak point
-    legend.get_texts()[0].set_text(f"Max ROI: ({max_pos:.5f}, {max_val:.0f})") 
- 
-def show_figures_in_tabs(alignment_info):
-    """Create a Tkinter window with tabs for Analyzer and Piezo plots."""
-    global root  # Make root a global variable so we can use it inside update_canvas
-    root = Tk()
-    root.title("Motor Alignment Results")
-
-    # Create a tab control
-    tab_control = ttk.Notebook(root)
-
-    # Create tabs
-    analyzer_tab = ttk.Frame(tab_control)
-    piezo_tab = ttk.Frame(tab_control)
-
-    tab_control.add(analyzer_tab, text="Analyzer")
-    tab_control.add(piezo_tab, text="Piezo")
-    tab_control.pack(expand=1, fill="both")
-
-    # Create and embed figures for both Analyzer and Piezo
-    fig_analyzer, axes_analyzer = create_figure("Analyzer")
-    canvas_analyzer = FigureCanvasTkAgg(fig_analyzer, analyzer_tab)
-    canvas_analyzer.get_tk_widget().pack(fill="both", expand=True)
-
-    toolbar_analyzer = NavigationToolbar2Tk(canvas_analyzer, analyzer_tab)
-    toolbar_analyzer.update()
-    toolbar_analyzer.pack(fill="x")  
-    
-    fig_piezo, axes_piezo = create_figure("Piezo")
-    canvas_piezo = FigureCanvasTkAgg(fig_piezo, piezo_tab)
-    canvas_piezo.get_tk_widget().pack(fill="both", expand=True)
-    
-    toolbar_piezo = NavigationToolbar2Tk(canvas_piezo, piezo_tab)
-    toolbar_piezo.update()
-    toolbar_piezo.pack(fill="x")  
-    
-    # Function to update the plot in Tkinter window
-    def update_canvas():
-        # Schedule canvas drawing in the main thread using after
-        root.after(0, canvas_analyzer.draw)
-        root.after(0, canvas_piezo.draw)
-        
-    def alignment_thread():
-        """Loop over the alignment_info dictionary and update the plots."""
-        global alignment_counter
-        start_time = time.time()
-        for detector_id, motors in alignment_info.items():
-            alignment_counter = 0
-            if 'analyzer' in motors:
-                analyzer_info = motors['analyzer']
-                run_alignment(analyzer_info['start'], analyzer_info['end'], analyzer_info['step'], 
-                    "Analyzer", detector_id, axes_analyzer, fig_analyzer, canvas_analyzer, update_canvas)
-
-            if 'piezo' in motors:
-                piezo_info = motors['piezo']
-                run_alignment(piezo_info['start'], piezo_info['end'], piezo_info['step'], 
-                    "Piezo", detector_id, axes_piezo, fig_piezo, canvas_piezo, update_canvas)        
-        end_time = time.time()
-        print(f"Execution time: {end_time - start_time} seconds")
-    # Start alignment in a separate thread to keep UI responsive
-    thread = Thread(target=alignment_thread)  # Pass alignment_info as an argument
-    thread.start()
-
-
-    # Add a protocol to handle window close event
-    def on_close():
-        root.quit()  # Exit the Tkinter main loop
-        root.destroy()  # Destroy the Tkinter window itself
-
-    root.protocol("WM_DELETE_WINDOW", on_close)  # Capture window close event
-
-    # Run Tkinter event loop
-    root.mainloop()
+import os
+import queue
+import numpy as np
+import time
+import epics
+from threading import Thread, Event
+from Autoalign_history import AlignmentHistory
+from Autoalign_record import ScanRecorder, new_session_dir, DEFAULT_RECORD_DIR
+from Autoalign_config import load_params
+from Autoalign_profile import PhaseTimer
+from Autoalign_plot import PlotConsumer
+from Autoalign_events import ScanStarted, PointAcquired, FitDone, AlignmentDone, AlignmentFailed, drain
+from Autoalign_engine import AlignmentEngine
+from Autoalign_status import AlignmentStatus
+from Autoalign_metrics import AlignmentMetrics, MetricsExporter, DEFAULT_METRICS_PATH
+from Autoalign_watchdog import DeviceError, MoveFailed, move_timeout, readback_tolerance, retry
+from Autoalign_journal import SessionJournal, load_journal, DEFAULT_JOURNAL_PATH
+
+# AlignmentAborted Exception raised inside the alignment once an abort was requested
+class AlignmentAborted(Exception):
+    pass
+
+# Set by request_abort(); the running alignment stops at the next scan point or motor poll
+abort = Event()
+
+def request_abort():
+    """Cancel the running alignment; safe to call from any thread."""
+    abort.set()
+
+def check_abort():
+    if abort.is_set():
+        raise AlignmentAborted("Alignment aborted on request")
+
+def stop_motor(pv_name):
+    """Stop a motor record where it is."""
+    try:
+        epics.caput(pv_name + ".STOP", 1)
+        print(f"Stopped motor {pv_name}.")
+    except Exception as e:
+        print(f"Error stopping motor {pv_name}: {e}")
+
+def move_and_wait(pv_name, position, timeout=600, poll_interval=0.05):
+    """Move a motor and wait for its put completion, polling so an abort stops the motor at once.
+
+    Raises AlignmentAborted after sending STOP when an abort is requested, TimeoutError when the
+    move does not complete within timeout seconds.
+    """
+    check_abort()
+    # caput takes no callback; the PV object reports the put completion of the motor record
+    pv = epics.get_pv(pv_name, connect=True)
+    if pv.put(position, wait=False, use_complete=True) is None:
+        raise ConnectionError(f"{pv_name} is not connected")
+    deadline = time.monotonic() + timeout
+    try:
+        while not pv.put_complete:
+            if abort.is_set():
+                stop_motor(pv_name)
+                raise AlignmentAborted(f"Alignment aborted while moving {pv_name}")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{pv_name} did not reach {position} within {timeout:.1f} s")
+            # pyepics runs the put callback in its own thread; epics.poll would return at once and spin
+            drives['wait'](poll_interval)
+    except KeyboardInterrupt:
+        stop_motor(pv_name)
+        raise
+
+def abortable_sleep(seconds):
+    """Wait between retries; an abort ends the wait at once."""
+    if abort.wait(seconds):
+        raise AlignmentAborted("Alignment aborted on request")
+
+def supervised_retry(func, description, error=None):
+    """Watchdog retry of a channel access call, abortable and counted in the metrics."""
+    kwargs = {} if error is None else {'error': error}
+    return retry(func, description, sleep=abortable_sleep, on_retry=lambda: metrics.count('retries'), **kwargs)
+
+# Motion fields of the motor records, read once per session for the move timeouts
+MOTION_FIELDS = ('VELO', 'ACCL', 'BDST', 'RDBD')
+motion_models = {}
+
+def motion_model(pv_name):
+    """VELO, ACCL, BDST and RDBD of a motor record; None for fields that cannot be read."""
+    model = motion_models.get(pv_name)
+    if model is None:
+        try:
+            values = epics.caget_many([f"{pv_name}.{field}" for field in MOTION_FIELDS])
+        except Exception as e:
+            print(f"Error reading the motion fields of {pv_name}: {e}")
+            values = [None] * len(MOTION_FIELDS)
+        model = dict(zip(MOTION_FIELDS, values))
+        if model['VELO'] is not None:
+            motion_models[pv_name] = model  # Read again at the next move otherwise
+    return model
+
+def supervised_move(pv_name, position, start=None):
+    """Move with a timeout from the motion model, then check the readback against the retry deadband.
+
+    Channel access errors are retried with backoff; a timeout (after STOP) or a readback off
+    the target raises MoveFailed. Returns the readback.
+    """
+    model = motion_model(pv_name)
+    if start is None:
+        start = supervised_retry(lambda: epics.caget(pv_name + ".RBV"), f"readback of {pv_name}")
+    timeout = move_timeout(position - start, model['VELO'], model['ACCL'], model['BDST'])
+
+    def put():
+        try:
+            move_and_wait(pv_name, position, timeout=timeout)
+        except TimeoutError as e:
+            stop_motor(pv_name)
+            raise MoveFailed(str(e))
+        return True
+
+    supervised_retry(put, f"move of {pv_name} to {position}", error=MoveFailed)
+    readback = supervised_retry(lambda: epics.caget(pv_name + ".RBV"), f"readback of {pv_name}")
+    tolerance = readback_tolerance(model['RDBD'])
+    if abs(readback - position) > tolerance:
+        raise MoveFailed(f"{pv_name} stopped at {readback:.5f} instead of {position:.5f} (tolerance {tolerance:g})")
+    return readback
+
+# TwoThetaDrive Class to Move the Arm to a Specified Angle 
+class TwoThetaDrive:
+    def __init__(self, detector_id):
+        # PV for the TwoTheta motor
+        self.pv_name = "11bmb:m28"  # TwoTheta motor PV name
+        self.detector_id = detector_id
+        self.angle = self.calculate_angle(self.detector_id)  # Initial angle based on detector ID
+    
+    def calculate_angle(self, detector_id):
+        """Calculate the 2Theta angle based on detector ID (1 to 12)."""
+        if 1 <= detector_id <= 12:
+            return -2 * (detector_id - 1)  # Angle will be 0, -2, -4, ..., -22
+        else:
+            raise ValueError("Detector ID must be between 1 and 12")
+
+    def get_pos(self):
+        """Fetch the current motor position from EPICS."""
+        self.position = epics.caget(self.pv_name)  # Update position
+        return self.position
+        
+    def move_to(self):
+        """Move the TwoTheta motor to the calculated angle."""
+        print(f"Moving 2theta arm to {self.angle} degrees to align Detector {self.detector_id}.")
+        metrics.count('moves')
+        with timer.phase('move'):
+            supervised_move(self.pv_name, self.angle)  # Move motor to the calculated angle
+        with timer.phase('settle'):
+            drives['sleep'](0.3)  # Simulate movement delay
+        
+# MotorDrive Class using epics.caput to set position
+class MotorDrive:
+    def __init__(self, pv_name):
+        self.pv_name = pv_name
+        self.position = epics.caget(self.pv_name)  # Get initial position
+
+    def get_pos(self):
+        """Fetch the current motor position from EPICS."""
+        self.position = epics.caget(self.pv_name)  # Update position
+        return self.position
+
+    def get_readback(self):
+        """Fetch the motor readback (RBV) from EPICS."""
+        with timer.phase('read'):
+            return epics.caget(self.pv_name + ".RBV")
+        
+    def move_to(self, position):
+        # Counted for the motor that moves: the analyzer nudges of a piezo alignment are analyzer moves
+        metrics.count('moves', *motor_label(self.pv_name))
+        with timer.phase('move'):
+            # Raises MoveFailed, so the position is only updated after a verified move
+            supervised_move(self.pv_name, position, start=self.position)
+        self.position = position
+        with timer.phase('settle'):
+            drives['sleep'](0.3)  # Simulate movement delay
+
+# LambdaFlexCount Class to Read Intensity using epics.caget       
+class LambdaFlexCount:
+    def __init__(self, detector_id, motor_config):
+        self.pv_name = motor_config.lambda_flex_detectors[detector_id - 1]  # Access PV name based on detector_id
+        with timer.phase('read'):
+            # Disconnected or erroring ROI PVs are retried, then raise ReadFailed
+            self.peak_intensity = supervised_retry(lambda: epics.caget(self.pv_name), f"intensity read of Detector {detector_id}")
+    
+    def get_roi_intensity(self, position):
+        intensity = self.peak_intensity  # Get the intensity from PV
+        return intensity 
+    
+class MotorConfig:
+    def __init__(self):
+        self.analyzer_motors = [
+            "11bmb:m22", "11bmb:m21", "11bmb:m20", "11bmb:m19", "11bmb:m18", "11bmb:m17",
+            "11bmb:m14", "11bmb:m13", "11bmb:m12", "11bmb:m11", "11bmb:m10", "11bmb:m9"
+        ]
+        self.piezo_motors = [
+            "11bmb:m44", "11bmb:m43", "11bmb:m42", "11bmb:m41", "11bmb:m40", "11bmb:m39",
+            "11bmb:m38", "11bmb:m37", "11bmb:m36", "11bmb:m35", "11bmb:m34", "11bmb:m33"
+        ]
+        self.lambda_flex_detectors = [
+            "11bmLambda:ROIStat1:12:Total_RBV", "11bmLambda:ROIStat1:11:Total_RBV", "11bmLambda:ROIStat1:10:Total_RBV",
+            "11bmLambda:ROIStat1:9:Total_RBV", "11bmLambda:ROIStat1:8:Total_RBV", "11bmLambda:ROIStat1:7:Total_RBV",
+            "11bmLambda:ROIStat1:6:Total_RBV", "11bmLambda:ROIStat1:5:Total_RBV", "11bmLambda:ROIStat1:4:Total_RBV",
+            "11bmLambda:ROIStat1:3:Total_RBV", "11bmLambda:ROIStat1:2:Total_RBV", "11bmLambda:ROIStat1:1:Total_RBV"
+        ]        
+
+def motor_label(pv_name):
+    """(detector_id, motor_name) of an analyzer or piezo PV, or (None, None) for other motors."""
+    motor_config = MotorConfig()
+    for motors, motor_name in ((motor_config.analyzer_motors, "Analyzer"), (motor_config.piezo_motors, "Piezo")):
+        if pv_name in motors:
+            return motors.index(pv_name) + 1, motor_name
+    return None, None
+
+# Time spent per phase (move, settle, read, fit, draw) of the alignments
+timer = PhaseTimer()
+
+# Progress and throughput counters of the alignments, published by run_session
+metrics = AlignmentMetrics()
+
+# Where run_session publishes the metrics: Prometheus text file, local HTTP port and period in seconds
+metrics_export = {'path': DEFAULT_METRICS_PATH, 'port': None, 'interval': 5.0}
+
+# Thresholds, analyzer nudge scales and iteration limit of run_alignment (autoalign_config.json)
+params = load_params()
+
+def reload_params(path=None):
+    """Reload the alignment parameters, e.g. after a new tuning run wrote the config file."""
+    global params
+    params = load_params() if path is None else load_params(path)
+    return params
+
+# Drive classes and scan delay used by run_alignment; replaced by the replay and simulation backends
+drives = {
+    'two_theta': TwoThetaDrive,
+    'motor': MotorDrive,
+    'detector': LambdaFlexCount,
+    'sleep': time.sleep,
+    'wait': abort.wait  # Between put completion checks; returns early on an abort
+}
+
+def use_drives(two_theta=None, motor=None, detector=None, sleep=None, wait=None):
+    """Select the drive classes (or factories with the same signature) used by run_alignment."""
+    for key, value in (('two_theta', two_theta), ('motor', motor), ('detector', detector), ('sleep', sleep), ('wait', wait)):
+        if value is not None:
+            drives[key] = value
+
+def use_epics_drives():
+    """Go back to the EPICS drive classes."""
+    use_drives(TwoThetaDrive, MotorDrive, LambdaFlexCount, time.sleep, abort.wait)
+
+def use_channel_access(backend=None):
+    """Send all caget/caput calls to backend (an object with the pyepics caget/caput signatures).
+
+    Without a backend the real pyepics module is used again.
+    """
+    global epics
+    if backend is None:
+        import epics as backend
+    epics = backend
+
+# Last alignment result per (detector_id, motor_name), used as the reference for quick drift checks
+alignment_results = {}
+
+# On-disk store of every alignment result, used to predict the scan range of the next run
+history = AlignmentHistory()
+
+# Raw scan recorder of the running session (None when not recording)
+recorder = None
+
+# Folder of the raw scan records, one timestamped session folder each
+record_dir = DEFAULT_RECORD_DIR
+
+# Progress journal of the running session, for resuming it after a crash (None outside a session)
+journal = None
+journal_path = DEFAULT_JOURNAL_PATH
+
+def journal_write(event, **fields):
+    """Append a step to the session journal, if there is one; a failing journal never stops the alignment."""
+    if journal is None:
+        return
+    try:
+        journal.write(event, **fields)
+    except Exception as e:
+        print(f"Error writing session journal {journal.path}: {e}")
+
+def record_point(detector_id, motor_name, motor, position, roi_value):
+    """Stream one scan point to the session record, if recording."""
+    if recorder is None:
+        return
+    try:
+        readback = motor.get_readback()
+    except Exception as e:
+        print(f"Error reading back motor {motor.pv_name}: {e}")
+        readback = None
+    recorder.append(detector_id, motor_name, alignment_counter, position, readback, roi_value)
+
+def initialization():
+    global fig, axes
+    fig = None
+    axes = None
+    
+# Function to Create Figures if Needed
+def create_figure(motor_name):
+    """Create and return a figure with 12 subplots based on the motor type."""
+    global fig, axes
+    import matplotlib.ticker as ticker
+    from matplotlib.figure import Figure
+
+    # Not a pyplot figure: nothing keeps it alive once its window is gone
+    fig = Figure(figsize=(18, 8))
+    axes = fig.subplots(2, 6)
+    fig.suptitle(f"{motor_name} Auto-alignment Results", fontsize=14)
+    fig.subplots_adjust(left=0.05, right=0.95, top=0.9, bottom=0.05, wspace=0.3, hspace=0.3)
+    axes = axes.flatten()
+    
+    for i in range(12):
+        axes[i].set_title(f"Detector {i+1}", fontsize=10)
+        axes[i].set_xlabel("Position", fontsize=10)
+        axes[i].set_ylabel("Intensity", fontsize=10)
+        axes[i].yaxis.set_major_formatter(ticker.ScalarFormatter())
+        axes[i].yaxis.get_major_formatter().set_scientific(True)   
+        axes[i].ticklabel_format(style='sci', axis='y', scilimits=(0, 0))        
+        axes[i].grid(True)
+        
+    return fig, axes
+
+def gaussian(x, amplitude, mean, sigma):
+    """Gaussian function for curve fitting."""
+    return amplitude * np.exp(-(x - mean)**2 / (2 * sigma**2))
+
+def estimate_fwhm(positions, roi_counts):
+    """Estimate the peak FWHM from the points above half of the maximum ROI."""
+    positions = np.asarray(positions[:len(roi_counts)], dtype=float)
+    roi_counts = np.asarray(roi_counts, dtype=float)
+    above = positions[roi_counts >= np.max(roi_counts) / 2.0]
+    step = abs(positions[1] - positions[0]) if len(positions) > 1 else 0.0
+    return max(above.max() - above.min(), step)
+
+def record_result(detector_id, motor_name, best_position, max_intensity, fwhm, fit_params=None, settings=None):
+    """Keep the final alignment result for the next quick check and append it to the history store."""
+    metrics.count('alignments', detector_id, motor_name)
+    alignment_results[(detector_id, motor_name)] = {
+        'position': float(best_position),
+        'intensity': float(max_intensity),
+        'fwhm': float(fwhm)
+    }
+    journal_write('result', detector_id=detector_id, motor=motor_name, result=alignment_results[(detector_id, motor_name)])
+    try:
+        history.record(detector_id, motor_name, best_position, max_intensity, fwhm, fit_params, settings)
+    except Exception as e:
+        print(f"Error saving alignment result for detector {detector_id} - {motor_name}: {e}")
+
+def suggest_scan_range(detector_id, motor_name, k=1.5, n_points=41):
+    """Suggest start/end/step from the predicted best position ± k·FWHM with n_points points, or None.
+
+    Piezo ranges are widened to ± 2·off_center_limit so the off-center check can still trigger.
+    """
+    try:
+        predicted_range = history.predict_range(detector_id, motor_name, k=k)
+    except Exception as e:
+        print(f"Error reading alignment history for detector {detector_id} - {motor_name}: {e}")
+        return None
+    if predicted_range is None:
+        return None
+    start, end = predicted_range
+    if motor_name == "Piezo":
+        # At least ± 2·off_center_limit, like the default 2-12 range, so a peak off center can still
+        # trigger the analyzer nudge of run_alignment
+        center, half_range = (start + end) / 2.0, max((end - start) / 2.0, 2 * params['off_center_limit'])
+        # Keep the piezo range inside its 0-15 travel, shifted rather than cut where possible
+        center = min(max(center, half_range), 15.0 - half_range) if half_range < 7.5 else 7.5
+        start, end = max(center - half_range, 0.0), min(center + half_range, 15.0)
+        if start >= end:
+            return None
+    step = (end - start) / max(n_points - 1, 1)
+    return {'start': round(start, 5), 'end': round(end, 5), 'step': float(f"{step:.3g}")}
+
+def last_result(detector_id, motor_name):
+    """Return the last result of this session, or the last one in the history store."""
+    reference = alignment_results.get((detector_id, motor_name))
+    if reference is None:
+        try:
+            stored = history.last(detector_id, motor_name)
+        except Exception as e:
+            print(f"Error reading alignment history for detector {detector_id} - {motor_name}: {e}")
+            stored = None
+        if stored is not None and stored['fwhm'] and stored['max_intensity']:
+            reference = {
+                'position': stored['best_position'],
+                'intensity': stored['max_intensity'],
+                'fwhm': stored['fwhm']
+            }
+    return reference
+    
+def run_alignment(start_pos, end_pos, step_size, motor_name, detector_id, publish):
+    """Runs alignment for the given motor and publishes the scan events for the live plot."""    
+    global alignment_counter 
+    # Check if the number of iterations has exceeded the limit
+    alignment_counter += 1
+    if alignment_counter > params['max_iterations']:
+        print("Maximum alignment iterations reached. Stopping further alignment.")
+        return 
+    
+    timer.set_tags(detector=detector_id, motor=motor_name, iteration=alignment_counter)
+    metrics.set_current(detector_id, motor_name)
+
+    # Assign the analyzer and piezo motor PV name
+    motor_config = MotorConfig()
+    
+    # Move the 2thera arm to put detector in position for alignment
+    two_theta_motor = drives['two_theta'](detector_id)
+    two_theta_motor.move_to() 
+    
+    # Create figures only if motor is selected
+    if motor_name == "Analyzer":
+        motor_pv = motor_config.analyzer_motors[detector_id - 1]
+    elif motor_name == "Piezo":
+        motor_pv = motor_config.piezo_motors[detector_id - 1]
+    else:
+        print(f"Skipping {motor_name} alignment. Not selected.")
+        return  # Exit if the motor isn't selected
+        
+    motor = drives['motor'](motor_pv)
+    positions = np.arange(start_pos, end_pos + step_size, step_size)
+    roi_counts = []
+    
+    publish(ScanStarted(detector_id, motor_name, alignment_counter, "scan", tuple(positions.tolist())))
+
+    # Perform the scan (in a separate thread to avoid blocking UI)
+    for index, pos in enumerate(positions):
+        check_abort()
+        point_start = timer.now()
+        motor.move_to(pos)
+        detector = drives['detector'](detector_id, motor_config)
+        roi_value = detector.get_roi_intensity(pos)
+        roi_counts.append(roi_value)
+        record_point(detector_id, motor_name, motor, pos, roi_value)
+        with timer.phase('draw'):
+            publish(PointAcquired(detector_id, motor_name, alignment_counter, index, float(pos), roi_value, time.time()))
+        with timer.phase('settle'):
+            drives['sleep'](0.1)  # Simulated delay for the motor move and detector update
+        metrics.point(detector_id, motor_name, timer.now() - point_start)
+    
+    # After the loop, perform Gaussian fit to the collected data
+    fwhm = None
+    fit_params = None
+    if motor_name == "Analyzer": 
+        finalrun_flag = True
+        max_index = np.argmax(roi_counts)
+        best_position = positions[max_index]  
+    elif motor_name == "Piezo":       
+        finalrun_flag = False
+        max_index = np.argmax(roi_counts)
+        max_position = positions[max_index]
+        mid_pos = (start_pos + end_pos) / 2.0
+        if abs(max_position - mid_pos) > params['off_center_limit']:
+            if max_position == start_pos: 
+                scale = params['edge_scale']
+            elif max_position < mid_pos:
+                scale = params['nudge_scale']
+            elif max_position > mid_pos:
+                scale = -params['nudge_scale']
+            elif max_position == end_pos: 
+                scale = -params['edge_scale']
+            analyzer_pv = motor_config.analyzer_motors[detector_id - 1]
+            analyzer = drives['motor'](analyzer_pv)
+            pos_adj = analyzer.get_pos() + scale * (-1)**(detector_id + 1)
+            analyzer.move_to(pos_adj-0.1)
+            analyzer.move_to(pos_adj)
+            journal_write('correction', detector_id=detector_id, iteration=alignment_counter, analyzer_position=float(pos_adj))
+            print(f"Fitted mean outside range. Adjusting analyzer with scale {scale}.") 
+            metrics.count('reruns', detector_id, motor_name)
+            run_alignment(start_pos, end_pos, step_size, motor_name, detector_id, publish)           
+        else:
+            try:
+                from scipy.optimize import curve_fit  # Imported on first use, headless runs start faster
+                with timer.phase('fit'):
+                    popt, _ = curve_fit(gaussian, positions, roi_counts, p0=[np.max(roi_counts), positions[np.argmax(roi_counts)], params['p0_sigma']])
+                amplitude, mean, sigma = popt
+                
+                finalrun_flag = True
+                best_position = mean
+                fwhm = 2 * np.sqrt(2 * np.log(2)) * abs(sigma)
+                fit_params = {'amplitude': float(amplitude), 'mean': float(mean), 'sigma': float(sigma)}
+                print(f"Best position (from Gaussian fit): {mean:.5f}")
+
+                # Show the fitted curve
+                publish(FitDone(detector_id, motor_name, alignment_counter, float(amplitude), float(mean), float(sigma)))
+                    
+            except Exception as e:
+                print(f"Error fitting Gaussian: {e}")
+                metrics.count('fit_failures', detector_id, motor_name)
+                # Fallback to using the max intensity position as the best position
+                max_index = np.argmax(roi_counts)
+                best_position = positions[max_index] 
+                print(f"Falling back to max intensity position: {best_position:.5f}")
+       
+    if finalrun_flag == True:
+        motor.move_to(start_pos)  
+        motor.move_to(best_position)
+        max_intensity = roi_counts[max_index]
+        if fwhm is None:
+            fwhm = estimate_fwhm(positions, roi_counts)
+        settings = {'start': float(start_pos), 'end': float(end_pos), 'step': float(step_size), 'iteration': alignment_counter}
+        record_result(detector_id, motor_name, best_position, max_intensity, fwhm, fit_params, settings)
+        print(f"Max ROI for detector {detector_id} - {motor_name}: ({best_position:.5f}, {max_intensity:.0f})")
+        publish(AlignmentDone(detector_id, motor_name, float(best_position), float(max_intensity)))
+    
+    return
+
+def run_drift_check(start_pos, end_pos, step_size, motor_name, detector_id, publish,
+                    shift_tolerance=0.25, intensity_tolerance=0.2):
+    """Probe three points around the last best position and only run the full scan if the peak has drifted.
+
+    The shift is estimated from the intensity ratio of the two half-maximum points using the
+    stored peak width. A full run_alignment over start_pos/end_pos is done when the shift exceeds
+    shift_tolerance * FWHM or the estimated peak intensity dropped by more than intensity_tolerance.
+    """
+    reference = last_result(detector_id, motor_name)
+    if reference is None:
+        print(f"No previous {motor_name} result for detector {detector_id}. Running full alignment.")
+        run_alignment(start_pos, end_pos, step_size, motor_name, detector_id, publish)
+        return
+
+    timer.set_tags(detector=detector_id, motor=motor_name, iteration=alignment_counter, quick_check=True)
+    metrics.set_current(detector_id, motor_name)
+    motor_config = MotorConfig()
+    two_theta_motor = drives['two_theta'](detector_id)
+    two_theta_motor.move_to()
+
+    if motor_name == "Analyzer":
+        motor_pv = motor_config.analyzer_motors[detector_id - 1]
+    elif motor_name == "Piezo":
+        motor_pv = motor_config.piezo_motors[detector_id - 1]
+    else:
+        print(f"Skipping {motor_name} drift check. Not selected.")
+        return
+
+    motor = drives['motor'](motor_pv)
+    center = reference['position']
+    half_width = reference['fwhm'] / 2.0
+    sigma = reference['fwhm'] / (2 * np.sqrt(2 * np.log(2)))
+    positions = np.array([center - half_width, center, center + half_width])
+    roi_counts = []
+
+    publish(ScanStarted(detector_id, motor_name, alignment_counter, "probe", tuple(positions.tolist())))
+
+    # Probe the peak from below so the backlash is taken out the same way as in the full scan
+    for index, pos in enumerate(positions):
+        check_abort()
+        point_start = timer.now()
+        motor.move_to(pos)
+        detector = drives['detector'](detector_id, motor_config)
+        roi_counts.append(detector.get_roi_intensity(pos))
+        record_point(detector_id, motor_name, motor, pos, roi_counts[-1])
+        with timer.phase('draw'):
+            publish(PointAcquired(detector_id, motor_name, alignment_counter, index, float(pos), roi_counts[-1], time.time()))
+        with timer.phase('settle'):
+            drives['sleep'](0.1)
+        metrics.point(detector_id, motor_name, timer.now() - point_start)
+
+    low, mid, high = roi_counts
+    if min(roi_counts) <= 0:
+        print(f"Drift check for detector {detector_id} - {motor_name} lost the peak. Running full alignment.")
+        metrics.count('reruns', detector_id, motor_name)
+        run_alignment(start_pos, end_pos, step_size, motor_name, detector_id, publish)
+        return
+
+    # For a Gaussian of known sigma, ln(I+/I-) = 2 * half_width * shift / sigma**2
+    shift = sigma**2 * np.log(high / low) / (2 * half_width)
+    intensity = mid * np.exp(shift**2 / (2 * sigma**2))
+    intensity_loss = 1 - intensity / reference['intensity']
+    print(f"Drift check for detector {detector_id} - {motor_name}: shift {shift:.5f}, intensity loss {intensity_loss:.1%}")
+
+    if abs(shift) > shift_tolerance * reference['fwhm'] or intensity_loss > intensity_tolerance:
+        print(f"Drift over threshold for detector {detector_id} - {motor_name}. Running full alignment.")
+        metrics.count('reruns', detector_id, motor_name)
+        run_alignment(start_pos, end_pos, step_size, motor_name, detector_id, publish)
+        return
+
+    best_position = center + shift
+    motor.move_to(positions[0])
+    motor.move_to(best_position)
+    settings = {'start': float(positions[0]), 'end': float(positions[-1]), 'quick_check': True}
+    record_result(detector_id, motor_name, best_position, intensity, reference['fwhm'], settings=settings)
+    print(f"Max ROI for detector {detector_id} - {motor_name}: ({best_position:.5f}, {intensity:.0f}) (quick check)")
+    publish(AlignmentDone(detector_id, motor_name, float(best_position), float(intensity)))
+    
+def run_session(alignment_info, figures=None, update_callback=None, record=True, events=None, resume=False):
+    """Loop over the alignment_info dictionary and align every selected motor.
+
+    The scan events go to the events queue when one is given (the GUI applies them to its plots).
+    Otherwise they are applied here to figures, a map of "Analyzer"/"Piezo" to (fig, axes, canvas),
+    followed by update_callback; without figures they are dropped.
+
+    A detector whose motor or ROI channel fails (DeviceError) is skipped. Returns the failures
+    as {(detector_id, motor_name): reason}.
+
+    Every step is journaled to journal_path. With resume=True the journal of an interrupted
+    session is read first: finished motors are skipped and the interrupted detector restarts
+    from its last stable state. A new session raises UnfinishedSession rather than overwrite the
+    journal of an interrupted one; Autoalign_journal.discard_journal gives that session up.
+
+    The abort flag is not cleared here, so an abort requested before the session starts is kept;
+    whoever starts a session after an abort clears it first, as ResultsWindow.start does.
+    """
+    global alignment_counter, recorder, journal
+    state = None
+    if resume:
+        state = load_journal(journal_path) if journal_path is not None else None
+        if state is None:
+            raise ValueError(f"No session journal to resume at {journal_path}")
+        if state['finished']:
+            print("The last alignment session finished; nothing to resume.")
+            return {}
+        # Results of the finished motors are the references of quick checks, as in the first run
+        alignment_results.update(state['results'])
+        print(f"Resuming alignment session: {len(state['results'])} motors already aligned.")
+    if events is not None:
+        publish = events.put
+    elif figures is not None:
+        plots = PlotConsumer(figures)
+
+        def publish(event):
+            plots.apply(event)
+            if update_callback is not None:
+                update_callback()
+    else:
+        def publish(event):
+            pass
+    # Opened before anything moves: raises UnfinishedSession instead of overwriting an interrupted session
+    if journal_path is not None:
+        try:
+            journal = SessionJournal(journal_path, alignment_info, resume=state is not None)
+        except OSError as e:
+            print(f"Error opening session journal {journal_path}: {e}. The session cannot be resumed.")
+    start_time = time.time()
+    motion_models.clear()
+    failures = {}
+    timer.reset()
+    metrics.start_session()
+    exporter = MetricsExporter(metrics, **metrics_export)
+    exporter.start()
+    if record:
+        recorder = ScanRecorder(new_session_dir(record_dir))
+        print(f"Recording scan points to {recorder.session_dir}")
+    finished = False
+    try:
+        for detector_id, motors in alignment_info.items():
+            try:
+                for key, motor_name in (('analyzer', "Analyzer"), ('piezo', "Piezo")):
+                    if key not in motors:
+                        continue
+                    if state is not None and (detector_id, motor_name) in state['results']:
+                        print(f"Detector {detector_id} - {motor_name} already aligned, skipping.")
+                        continue
+                    alignment_counter = 0  # max_iterations limits the scans of each motor, as in the Monte Carlo tuner
+                    if state is not None and state['interrupted'] == (detector_id, motor_name):
+                        restore_stable_state(detector_id, motor_name, state)
+                    analyzer_position = None
+                    if motor_name == "Piezo":
+                        # The analyzer position the piezo scans start from; nudges are journaled as corrections
+                        analyzer_position = drives['motor'](MotorConfig().analyzer_motors[detector_id - 1]).get_pos()
+                    journal_write('start', detector_id=detector_id, motor=motor_name, iteration=alignment_counter,
+                                  analyzer_position=analyzer_position)
+                    motor_info = motors[key]
+                    align = run_drift_check if motor_info.get('quick_check') else run_alignment
+                    align(motor_info['start'], motor_info['end'], motor_info['step'], motor_name, detector_id, publish)
+            except DeviceError as e:
+                # One bad motor or detector channel only costs its own detector
+                print(f"❌ Detector {detector_id} - {motor_name} failed: {e}. Continuing with the next detector.")
+                metrics.count('failures', detector_id, motor_name)
+                failures[(detector_id, motor_name)] = str(e)
+                publish(AlignmentFailed(detector_id, motor_name, str(e)))
+                journal_write('failed', detector_id=detector_id, motor=motor_name, reason=str(e))
+        finished = True
+    except AlignmentAborted:
+        # The points measured so far are in the session record; no result is stored for the partial scan
+        print(f"Alignment aborted during detector {detector_id} - {motor_name}.")
+        raise
+    finally:
+        metrics.end_session()
+        exporter.stop()
+        # An interrupted session, or one with failed detectors, keeps its journal open-ended for a resume
+        if journal is not None:
+            journal.close(finished=finished and not failures)
+            journal = None
+        # Write the remaining scan points even if the alignment stopped on an error
+        if recorder is not None:
+            trace_path = os.path.join(recorder.session_dir, "trace.json")
+            recorder.close()
+            recorder = None
+            timer.write_trace(trace_path)
+            print(f"Timing trace written to {trace_path}")
+    end_time = time.time()
+    timer.print_summary()
+    print(f"Execution time: {end_time - start_time} seconds")
+    if failures:
+        print(f"Failed detectors: {sorted({detector_id for detector_id, _ in failures})}")
+    return failures
+
+def restore_stable_state(detector_id, motor_name, state):
+    """Put an interrupted detector back to its last journaled state before its motor is aligned again."""
+    global alignment_counter
+    alignment_counter = state['iteration']
+    if motor_name == "Piezo" and state['analyzer_position'] is not None:
+        analyzer = drives['motor'](MotorConfig().analyzer_motors[detector_id - 1])
+        print(f"Restoring analyzer of detector {detector_id} to {state['analyzer_position']:.5f}.")
+        analyzer.move_to(state['analyzer_position'])
+    print(f"Restarting detector {detector_id} - {motor_name} from iteration {alignment_counter + 1}.")
+
+# ResultsWindow Class: persistent window with the Analyzer and Piezo plots, reused by every alignment
+class ResultsWindow:
+    def __init__(self, master, on_close=None):
+        """Build the window once as a Toplevel of the application root (no second Tk interpreter).
+
+        Closing the window hides it, unless on_close is given.
+        """
+        # GUI modules are only loaded when a window is shown, not for headless runs
+        from tkinter import Toplevel, ttk
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from Autoalign_render import BlitRenderer
+
+        self.master = master
+        self.window = Toplevel(master)
+        self.window.title("Motor Alignment Results")
+        self.window.protocol("WM_DELETE_WINDOW", on_close or self.hide)
+
+        # Create a tab control with one tab and figure per motor type
+        self.tab_control = ttk.Notebook(self.window)
+        self.figures = {}
+        pages = []
+        for motor_name in ("Analyzer", "Piezo"):
+            tab = ttk.Frame(self.tab_control)
+            self.tab_control.add(tab, text=motor_name)
+            fig, axes = create_figure(motor_name)
+            canvas = FigureCanvasTkAgg(fig, tab)
+            canvas.get_tk_widget().pack(fill="both", expand=True)
+            toolbar = NavigationToolbar2Tk(canvas, tab)
+            toolbar.update()
+            toolbar.pack(fill="x")
+            self.figures[motor_name] = (fig, axes, canvas)
+            pages.append((tab, canvas))
+        self.tab_control.pack(expand=1, fill="both")
+
+        self.plots = PlotConsumer(self.figures)
+        self.source = None  # Returns the events since the last frame, from the thread queue or the engine
+        self.thread = None
+        self.engine = None
+        self.reader = None
+        self.on_done = None
+        self.status = None  # AlignmentStatus of the current run, for the status panel of the application
+        self.aborted = False
+
+        # The alignment only publishes scan events; each frame of the renderer in the main
+        # thread applies all events that arrived since the last one to the plots, then redraws
+        # only the changed artists of the visible tab, at most max_fps times per second
+        self.renderer = BlitRenderer(self.master, self.tab_control, pages, max_fps=10, timer=timer,
+                                     on_frame=self._on_frame)
+
+    def _on_frame(self):
+        # Checked before draining, so the last events of a finished run are shown before on_done
+        finished = self.on_done is not None and not self.is_running()
+        batch = self.source() if self.source is not None else []
+        changed = self.plots.apply_batch(batch)
+        if self.status is not None:
+            self.status.apply_batch(batch)
+        if finished:
+            if self.status is not None:
+                self.status.finish(aborted=self.aborted)
+            on_done, self.on_done = self.on_done, None
+            on_done()
+        return changed
+
+    def is_running(self):
+        if self.thread is not None and self.thread.is_alive():
+            return True
+        return self.engine is not None and self.engine.is_alive()
+
+    def show(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def hide(self):
+        """Hide the window; an alignment in a separate process keeps running."""
+        self.window.withdraw()
+
+    def clear(self):
+        """Remove the plots of the previous run and start with fresh plot models."""
+        for fig, axes, canvas in self.figures.values():
+            for ax in axes:
+                for line in list(ax.lines):
+                    line.remove()
+                if ax.legend_ is not None:
+                    ax.legend_.remove()
+                ax.relim()
+                ax.set_xlim(0, 1)
+                ax.set_ylim(0, 1)
+            canvas.draw_idle()
+        self.plots = PlotConsumer(self.figures)
+        self.renderer.request()
+
+    def abort(self):
+        """Cancel the running alignment: the active motor is stopped and the scan ends at once."""
+        if not self.is_running():
+            return
+        self.aborted = True
+        if self.engine is not None and self.engine.is_alive():
+            self.engine.stop()
+        else:
+            request_abort()
+
+    def wait(self, timeout=None):
+        """Wait for the alignment thread or engine to end."""
+        if self.thread is not None:
+            self.thread.join(timeout)
+        if self.engine is not None:
+            self.engine.join(timeout)
+
+    def _detach(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def start(self, alignment_info, isolated=False, on_done=None, resume=None):
+        """Clear the plots and start an alignment without blocking; on_done is called in the Tk thread at the end.
+
+        resume is the load_journal state of an interrupted session to continue.
+        """
+        if self.is_running():
+            raise RuntimeError("An alignment is already running")
+        self._detach()
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+        self.clear()
+        self.show()
+        self.on_done = on_done
+        self.aborted = False
+        # Cleared before the thread starts, so an Abort pressed right after Align is not lost
+        abort.clear()
+        self.status = AlignmentStatus(alignment_info, completed=resume['results'] if resume else None)
+        if isolated:
+            self.attach(AlignmentEngine(alignment_info, resume=bool(resume)).start(), on_done)
+            return
+        events = queue.SimpleQueue()
+        self.source = lambda: drain(events)
+
+        def alignment_thread():
+            """Loop over the alignment_info dictionary and queue the scan events."""
+            try:
+                run_session(alignment_info, events=events, resume=bool(resume))
+            except AlignmentAborted:
+                pass  # Reported by run_session
+            except Exception as e:
+                print(f"Error during alignment: {e}")
+
+        # Start alignment in a separate thread to keep UI responsive
+        self.thread = Thread(target=alignment_thread)
+        self.thread.start()
+
+    def attach(self, engine, on_done=None):
+        """Show the scans of an alignment engine; the engine keeps running when the window is hidden."""
+        self._detach()
+        self.engine = engine
+        if self.status is None or self.status.alignment_info is not engine.alignment_info:
+            self.status = AlignmentStatus(engine.alignment_info)
+        # The engine process writes its scans to shared memory; read what changed every frame
+        self.reader = engine.attach()
+        self.source = self.reader.poll
+        if on_done is not None:
+            self.on_done = on_done
+        self.show()
+
+def show_figures_in_tabs(alignment_info=None, isolated=False, engine=None):
+    """Open a results window in its own Tk root and run (or attach to) an alignment; blocks until closed.
+
+    Applications with a Tk root of their own should keep one ResultsWindow instead.
+    Returns the engine, if any.
+    """
+    global root
+    from tkinter import Tk
+    root = Tk()
+    root.withdraw()
+    window = ResultsWindow(root, on_close=root.quit)  # Closing the only window ends the event loop
+    if engine is not None:
+        window.attach(engine)
+    else:
+        window.start(alignment_info, isolated)
+    root.mainloop()
+    if window.thread is not None and window.thread.is_alive():
+        # Closing the window cancels an alignment of this process; an engine keeps running
+        window.abort()
+        window.wait()
+    window._detach()
+    root.destroy()
+    return window.engine
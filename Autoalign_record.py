@@ -0,0 +1,115 @@
+import os
+import glob
+import time
+import queue
+import numpy as np
+from threading import Thread
+
+# Default folder for the raw scan records, one sub-folder per alignment session
+DEFAULT_RECORD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scan_records")
+
+# Columns stored for every scan point
+FIELDS = ('timestamp', 'detector_id', 'motor', 'iteration', 'commanded', 'readback', 'roi')
+
+def new_session_dir(record_dir=DEFAULT_RECORD_DIR):
+    """Create a timestamped session folder; sessions started in the same second get _1, _2, ... appended."""
+    os.makedirs(record_dir, exist_ok=True)
+    base = os.path.join(record_dir, time.strftime("%Y%m%d_%H%M%S"))
+    session_dir, suffix = base, 0
+    while True:
+        try:
+            os.mkdir(session_dir)  # Fails if another session (GUI, CLI, a quick re-Align) took the name
+            return session_dir
+        except FileExistsError:
+            suffix += 1
+            session_dir = f"{base}_{suffix}"
+
+# ScanRecorder Class to stream scan points to append-only NPZ chunks
+class ScanRecorder:
+    def __init__(self, session_dir=None, chunk_size=256, flush_interval=1.0):
+        if session_dir is None:
+            session_dir = new_session_dir()
+        else:
+            os.makedirs(session_dir, exist_ok=True)
+        self.session_dir = session_dir
+        self.chunk_size = chunk_size  # Points per chunk file
+        self.flush_interval = flush_interval  # Seconds before a partial chunk is written
+        self.chunk_index = 0
+
+        # The scan thread only puts points on the queue, the writer thread does all file IO
+        self.queue = queue.SimpleQueue()
+        self.writer = Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def append(self, detector_id, motor_name, iteration, commanded, readback, roi, timestamp=None):
+        """Queue one scan point for writing (never blocks the scan thread)."""
+        timestamp = time.time() if timestamp is None else timestamp
+        self.queue.put((timestamp, detector_id, motor_name, iteration, commanded,
+                        np.nan if readback is None else readback, np.nan if roi is None else roi))
+
+    def close(self):
+        """Write the remaining points and stop the writer thread."""
+        self.queue.put(None)
+        self.writer.join()
+
+    def _write_loop(self):
+        rows = []
+        last_flush = time.monotonic()
+        while True:
+            try:
+                row = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                row = ()
+            if row is None:
+                break
+            if row:
+                rows.append(row)
+            if len(rows) >= self.chunk_size or (rows and time.monotonic() - last_flush >= self.flush_interval):
+                self._write_chunk(rows)
+                rows = []
+                last_flush = time.monotonic()
+        if rows:
+            self._write_chunk(rows)
+
+    def _write_chunk(self, rows):
+        """Write one chunk file; the temporary name keeps readers from seeing partial files."""
+        columns = list(zip(*rows))
+        data = {
+            'timestamp': np.array(columns[0], dtype=float),
+            'detector_id': np.array(columns[1], dtype=int),
+            'motor': np.array(columns[2], dtype=str),
+            'iteration': np.array(columns[3], dtype=int),
+            'commanded': np.array(columns[4], dtype=float),
+            'readback': np.array(columns[5], dtype=float),
+            'roi': np.array(columns[6], dtype=float)
+        }
+        path = os.path.join(self.session_dir, f"chunk_{self.chunk_index:05d}.npz")
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                np.savez(f, **data)
+            os.replace(temp_path, path)
+            self.chunk_index += 1
+        except Exception as e:
+            print(f"Error writing scan record {path}: {e}")
+
+def load_session(session_dir):
+    """Load all chunks of a recorded session into one array per field, in acquisition order."""
+    chunks = []
+    for path in sorted(glob.glob(os.path.join(session_dir, "chunk_*.npz"))):
+        with np.load(path) as chunk:
+            chunks.append({field: chunk[field] for field in FIELDS})
+    if not chunks:
+        return {field: np.array([]) for field in FIELDS}
+    return {field: np.concatenate([chunk[field] for chunk in chunks]) for field in FIELDS}
+
+def load_scans(session_dir):
+    """Group a recorded session into scans keyed by (detector_id, motor, iteration)."""
+    record = load_session(session_dir)
+    scans = {}
+    for i in range(len(record['timestamp'])):
+        key = (int(record['detector_id'][i]), str(record['motor'][i]), int(record['iteration'][i]))
+        scan = scans.setdefault(key, {'commanded': [], 'readback': [], 'roi': [], 'timestamp': []})
+        for field in ('commanded', 'readback', 'roi', 'timestamp'):
+            scan[field].append(record[field][i])
+    return {key: {field: np.array(values) for field, values in scan.items()} for key, scan in scans.items()}
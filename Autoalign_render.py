@@ -0,0 +1,135 @@
+import numpy as np
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox
+
+# BlitRenderer Class to redraw the live alignment plots of a notebook at a capped frame rate
+class BlitRenderer:
+    def __init__(self, root, notebook, pages, max_fps=10, timer=None, on_frame=None):
+        """pages is a list of (notebook tab, FigureCanvasTkAgg); only the selected tab is drawn.
+
+        on_frame is called at the start of every frame and returns True when it changed the plots.
+        """
+        self.root = root
+        self.notebook = notebook
+        self.pages = pages
+        self.interval = max(int(1000 / max_fps), 1)  # Milliseconds between frames
+        self.timer = timer  # PhaseTimer for the 'draw' phase, if any
+        self.on_frame = on_frame
+        self.pending = True
+        self.backgrounds = {}  # canvas -> (figure background without the animated artists, {ax: view limits and size})
+        self.regions = {}  # ax -> screen area covered by the axes and its legend at the last draw
+
+        for _, canvas in self.pages:
+            canvas.mpl_connect('draw_event', lambda event, canvas=canvas: self._capture(canvas))
+        self.notebook.bind("<<NotebookTabChanged>>", lambda event: self.request())
+        self.notebook.bind("<Map>", lambda event: self.request())  # Window shown again
+        self.root.after(self.interval, self._tick)
+
+    def request(self):
+        """Ask for a redraw at the next frame; cheap and safe to call from any thread."""
+        self.pending = True
+
+    def visible_canvas(self):
+        if not self.notebook.winfo_viewable():
+            return None  # Window hidden or minimized
+        selected = self.notebook.select()
+        for tab, canvas in self.pages:
+            if str(tab) == selected:
+                return canvas
+        return None
+
+    def _tick(self):
+        if self.on_frame is not None:
+            try:
+                if self.on_frame():
+                    self.pending = True
+            except Exception as e:
+                print(f"Error updating plots: {e}")
+        if self.pending:
+            self.pending = False
+            canvas = self.visible_canvas()
+            if canvas is not None:
+                try:
+                    if self.timer is not None:
+                        with self.timer.phase('draw'):
+                            self.render(canvas)
+                    else:
+                        self.render(canvas)
+                except Exception as e:
+                    print(f"Error updating plots: {e}")
+        self.root.after(self.interval, self._tick)
+
+    def _animated(self, ax):
+        """Data lines and legends are drawn by blitting, on top of the static background."""
+        artists = list(ax.lines)
+        if ax.legend_ is not None:
+            artists.append(ax.legend_)
+            # Animated texts keep a legend update from marking the whole figure stale
+            artists.extend(ax.legend_.get_texts())
+        return artists
+
+    def _limits(self, ax):
+        return ax.get_xlim(), ax.get_ylim(), tuple(ax.bbox.bounds)
+
+    def _region(self, ax, renderer):
+        """Axes area plus its legend, which may reach past the axes."""
+        boxes = [ax.bbox]
+        if ax.legend_ is not None:
+            boxes.append(ax.legend_.get_window_extent(renderer))
+        return Bbox.union(boxes)
+
+    def _draw_animated(self, ax):
+        for artist in self._animated(ax):
+            if not isinstance(artist, Text):  # Legend texts are drawn with their legend
+                ax.draw_artist(artist)
+
+    def render(self, canvas):
+        """Blit the axes whose lines or legend changed; full draw when the background is no longer valid."""
+        fig = canvas.figure
+        new_artists = False
+        for ax in fig.axes:
+            for artist in self._animated(ax):
+                if not artist.get_animated():
+                    artist.set_animated(True)
+                    new_artists = True
+
+        background = self.backgrounds.get(canvas)
+        if (fig.stale or new_artists or background is None
+                or any(ax not in background[1] or self._limits(ax) != background[1][ax] for ax in fig.axes)):
+            canvas.draw()  # draw_event captures the new background
+            return
+
+        renderer = canvas.get_renderer()
+        for ax in fig.axes:
+            if not any(artist.stale for artist in self._animated(ax)):
+                continue
+            # Clear the old and new extent of the legend, plus any axes reaching into that area, and redraw them all
+            region = Bbox.union([self.regions.get(ax, ax.bbox), self._region(ax, renderer)])
+            group = [ax]
+            for other in fig.axes:
+                if other is not ax and self.regions.get(other, other.bbox).overlaps(region):
+                    group.append(other)
+                    region = Bbox.union([region, self.regions.get(other, other.bbox)])
+            # Whole pixels, with a margin for the antialiased edges of the legend frame
+            region = Bbox.from_extents(np.floor(region.x0) - 2, np.floor(region.y0) - 2,
+                                       np.ceil(region.x1) + 2, np.ceil(region.y1) + 2)
+            # The saved background counts rows from the top of the figure
+            height = fig.bbox.height
+            canvas.restore_region(background[0], bbox=(region.x0, height - region.y1, region.x1, height - region.y0), xy=(0, 0))
+            for other in group:
+                self._draw_animated(other)
+            self.regions[ax] = self._region(ax, renderer)
+            canvas.blit(region)
+        fig.stale = False  # Drawing a legend marks its boxes stale, which is not a change of the background
+
+    def _capture(self, canvas):
+        """Keep the figure background after a full draw, then draw the animated artists on it."""
+        if canvas.is_saving():
+            return
+        fig = canvas.figure
+        renderer = canvas.get_renderer()
+        self.backgrounds[canvas] = (canvas.copy_from_bbox(fig.bbox), {ax: self._limits(ax) for ax in fig.axes})
+        for ax in fig.axes:
+            self._draw_animated(ax)
+            self.regions[ax] = self._region(ax, renderer)
+        fig.stale = False
@@ -0,0 +1,179 @@
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import Autoalign_pv_v3 as Autoalign
+from Autoalign_record import load_scans
+from Autoalign_history import AlignmentHistory
+from Autoalign_metrics import AlignmentMetrics
+
+# ReplaySession Class holding the recorded scans and the replayed motor positions
+class ReplaySession:
+    def __init__(self, session_dir, initial_positions=None):
+        self.scans = load_scans(session_dir)
+        self.motor_config = Autoalign.MotorConfig()
+        self.positions = {}  # Replayed position per motor PV
+        self.active_motor = {}  # Last motor moved for each detector
+
+        # Start every motor where it was at the beginning of the recording
+        for (detector_id, motor_name, _), scan in sorted(self.scans.items()):
+            pv_name = self.motor_pv(detector_id, motor_name)
+            if pv_name not in self.positions:
+                self.positions[pv_name] = float(np.nanmedian(scan['commanded']))
+        self.positions.update(initial_positions or {})
+
+    def motor_pv(self, detector_id, motor_name):
+        """Return the analyzer or piezo PV name of a detector."""
+        if motor_name == "Analyzer":
+            return self.motor_config.analyzer_motors[detector_id - 1]
+        return self.motor_config.piezo_motors[detector_id - 1]
+
+    def motor_of(self, pv_name):
+        """Return (detector_id, motor_name) for an analyzer or piezo PV name."""
+        if pv_name in self.motor_config.analyzer_motors:
+            return self.motor_config.analyzer_motors.index(pv_name) + 1, "Analyzer"
+        return self.motor_config.piezo_motors.index(pv_name) + 1, "Piezo"
+
+    def scan_for(self, detector_id, motor_name, iteration):
+        """Return the recorded scan of this iteration, or the closest earlier (else later) one."""
+        iterations = sorted(i for (d, m, i) in self.scans if d == detector_id and m == motor_name)
+        if not iterations:
+            return None
+        earlier = [i for i in iterations if i <= iteration]
+        chosen = earlier[-1] if earlier else iterations[0]
+        return self.scans[(detector_id, motor_name, chosen)]
+
+    def roi_at(self, detector_id, position):
+        """Interpolate the ROI of the detector's active motor scan at the given position."""
+        if detector_id not in self.active_motor:
+            return 0.0
+        scan = self.scan_for(detector_id, self.active_motor[detector_id], Autoalign.alignment_counter)
+        if scan is None:
+            return 0.0
+        order = np.argsort(scan['commanded'])
+        return float(np.interp(position, scan['commanded'][order], scan['roi'][order]))
+
+    def two_theta_drive(self, detector_id):
+        return ReplayTwoThetaDrive(self, detector_id)
+
+    def motor_drive(self, pv_name):
+        return ReplayMotorDrive(self, pv_name)
+
+    def detector(self, detector_id, motor_config):
+        return ReplayLambdaFlexCount(self, detector_id, motor_config)
+
+    def alignment_info(self):
+        """Rebuild the alignment_info of the recording from the full scan of every motor.
+
+        That is the scan with the most points (the first one on a tie), so the three points of a
+        quick drift check probe are never taken for the scan range.
+        """
+        full_scans = {}
+        for (detector_id, motor_name, iteration), scan in sorted(self.scans.items()):
+            best = full_scans.get((detector_id, motor_name))
+            if best is None or len(scan['commanded']) > len(best['commanded']):
+                full_scans[(detector_id, motor_name)] = scan
+        alignment_info = {}
+        for (detector_id, motor_name), scan in full_scans.items():
+            if len(scan['commanded']) < 2:
+                continue
+            commanded = np.sort(scan['commanded'])
+            alignment_info.setdefault(detector_id, {})[motor_name.lower()] = {
+                'start': float(commanded[0]),
+                'end': float(commanded[-1]),
+                'step': float(np.median(np.diff(commanded)))
+            }
+        return alignment_info
+
+# ReplayTwoThetaDrive Class with the TwoThetaDrive interface and no motion
+class ReplayTwoThetaDrive:
+    def __init__(self, session, detector_id):
+        self.session = session
+        self.detector_id = detector_id
+        self.angle = -2 * (detector_id - 1)
+
+    def get_pos(self):
+        return self.angle
+
+    def move_to(self):
+        pass
+
+# ReplayMotorDrive Class with the MotorDrive interface, moving instantly
+class ReplayMotorDrive:
+    def __init__(self, session, pv_name):
+        self.session = session
+        self.pv_name = pv_name
+        self.position = session.positions.get(pv_name, 0.0)
+
+    def get_pos(self):
+        self.position = self.session.positions.get(self.pv_name, 0.0)
+        return self.position
+
+    def get_readback(self):
+        return self.get_pos()
+
+    def move_to(self, position):
+        self.session.positions[self.pv_name] = position
+        self.position = position
+        detector_id, motor_name = self.session.motor_of(self.pv_name)
+        self.session.active_motor[detector_id] = motor_name
+
+# ReplayLambdaFlexCount Class with the LambdaFlexCount interface, serving recorded ROI values
+class ReplayLambdaFlexCount:
+    def __init__(self, session, detector_id, motor_config):
+        self.session = session
+        self.detector_id = detector_id
+        self.pv_name = motor_config.lambda_flex_detectors[detector_id - 1]
+        motor_name = session.active_motor.get(detector_id)
+        position = session.positions.get(session.motor_pv(detector_id, motor_name)) if motor_name else None
+        self.peak_intensity = session.roi_at(detector_id, position) if position is not None else 0.0
+
+    def get_roi_intensity(self, position):
+        return self.session.roi_at(self.detector_id, position)
+
+def replay(session_dir, alignment_info=None, initial_positions=None, figures=None):
+    """Re-run the run_alignment decisions on a recorded session without delays.
+
+    Returns the alignment results per (detector_id, motor_name). Repeated calls with the same
+    inputs give identical results; nothing is written to the real alignment history.
+    The scans are only plotted when figures ("Analyzer"/"Piezo" to (fig, axes, canvas)) are given.
+    """
+    session = ReplaySession(session_dir, initial_positions)
+    if alignment_info is None:
+        alignment_info = session.alignment_info()
+
+    saved_drives = dict(Autoalign.drives)
+    saved_history = Autoalign.history
+    saved_results = dict(Autoalign.alignment_results)
+    saved_metrics, saved_export = Autoalign.metrics, dict(Autoalign.metrics_export)
+    Autoalign.metrics = AlignmentMetrics()  # Keep replays out of the published beamline metrics
+    Autoalign.metrics_export.update(path=None, port=None)
+    saved_journal_path, Autoalign.journal_path = Autoalign.journal_path, None  # Keep the beamline session resumable
+    Autoalign.use_drives(session.two_theta_drive, session.motor_drive, session.detector, lambda seconds: None)
+    Autoalign.alignment_results.clear()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        Autoalign.history = AlignmentHistory(os.path.join(temp_dir, "replay_history.db"))
+        try:
+            Autoalign.run_session(alignment_info, figures, record=False)
+            results = dict(Autoalign.alignment_results)
+        finally:
+            Autoalign.drives.update(saved_drives)
+            Autoalign.history = saved_history
+            Autoalign.metrics = saved_metrics
+            Autoalign.metrics_export.update(saved_export)
+            Autoalign.journal_path = saved_journal_path
+            Autoalign.alignment_results.clear()
+            Autoalign.alignment_results.update(saved_results)
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python Autoalign_replay.py <scan_records session folder>")
+        sys.exit(1)
+    start_time = time.time()
+    results = replay(sys.argv[1])
+    for (detector_id, motor_name), result in sorted(results.items()):
+        print(f"Detector {detector_id} - {motor_name}: best position {result['position']:.5f}, "
+              f"max ROI {result['intensity']:.0f}, FWHM {result['fwhm']:.5f}")
+    print(f"Replay time: {time.time() - start_time:.3f} seconds")
@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import Autoalign_pv_v3 as Autoalign
+from Autoalign_history import AlignmentHistory
+from Autoalign_journal import UnfinishedSession, discard_journal
+
+MOTOR_KEYS = ('analyzer', 'piezo')
+
+def load_alignment_info(path):
+    """Read alignment_info from a JSON or YAML file; detector keys may be strings ("1") or ints."""
+    with open(path) as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("Reading YAML needs PyYAML (pip install pyyaml); use a JSON file instead")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("The alignment file must map detector numbers to analyzer/piezo ranges")
+    return validate_alignment_info(data)
+
+def validate_alignment_info(data):
+    """Check ranges like Autoalign_GUI_v3 does; returns alignment_info with int detector keys."""
+    alignment_info = {}
+    errors = []
+    for key, motors in data.items():
+        try:
+            detector_id = int(key)
+        except (TypeError, ValueError):
+            errors.append(f"Invalid detector number {key!r}")
+            continue
+        if not 1 <= detector_id <= 12:
+            errors.append(f"Detector number {detector_id} must be between 1 and 12")
+            continue
+        if not isinstance(motors, dict) or not motors:
+            errors.append(f"Detector {detector_id}: no analyzer or piezo range given")
+            continue
+        detector_info = {}
+        for motor_key, motor_info in motors.items():
+            if motor_key not in MOTOR_KEYS:
+                errors.append(f"Detector {detector_id}: unknown motor {motor_key!r} (use analyzer or piezo)")
+                continue
+            try:
+                start, end, step = (float(motor_info[field]) for field in ('start', 'end', 'step'))
+            except (KeyError, TypeError, ValueError):
+                errors.append(f"Detector {detector_id}: {motor_key} needs numeric start, end and step")
+                continue
+            if start >= end:
+                errors.append(f"Detector {detector_id}: {motor_key} start must be less than end")
+            if step <= 0:
+                errors.append(f"Detector {detector_id}: {motor_key} step must be positive")
+            if motor_key == 'piezo' and not (0 <= start <= 15 and 0 <= end <= 15):
+                errors.append(f"Detector {detector_id}: piezo range is out of bounds (0-15)")
+            detector_info[motor_key] = {'start': start, 'end': end, 'step': step}
+            if motor_info.get('quick_check'):
+                detector_info[motor_key]['quick_check'] = True
+        alignment_info[detector_id] = detector_info
+    if errors:
+        raise ValueError("\n".join(errors))
+    return dict(sorted(alignment_info.items()))
+
+# Temporary directory of a simulated run, kept until the process exits
+dry_run_dir = None
+
+def use_backend(backend, seed=0):
+    """Select the EPICS drives (default) or a simulated beamline on a virtual clock.
+
+    A simulated run leaves the beamline files alone, like the benchmark and the replay: its
+    results and scan records go to a temporary directory, and no metrics file or session
+    journal is written.
+    """
+    global dry_run_dir
+    if backend == "epics":
+        return
+    from Autoalign_sim_beamline import SimBeamline
+    if backend == "sim":
+        SimBeamline(seed=seed).use()
+    elif backend == "fake_pv":
+        import Autoalign_fake_epics
+        Autoalign_fake_epics.install(SimBeamline(seed=seed))
+    dry_run_dir = tempfile.TemporaryDirectory(prefix="autoalign_dry_run_")
+    Autoalign.history = AlignmentHistory(os.path.join(dry_run_dir.name, "dry_run_history.db"))
+    Autoalign.record_dir = os.path.join(dry_run_dir.name, "scan_records")
+    Autoalign.metrics_export['path'] = None
+    Autoalign.journal_path = None
+
+def results_summary():
+    """Alignment results of the session as a JSON-friendly list."""
+    return [dict(detector_id=detector_id, motor=motor_name, **result)
+            for (detector_id, motor_name), result in sorted(Autoalign.alignment_results.items())]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an alignment without the GUI.")
+    parser.add_argument("alignment_file", nargs="?", default=None, help="JSON or YAML file with the alignment_info of Autoalign_GUI_v3, "
+                        'e.g. {"1": {"analyzer": {"start": 4.2, "end": 4.3, "step": 0.00125}}}')
+    parser.add_argument("--quick-check", action="store_true", help="probe around the last best position first")
+    parser.add_argument("--no-record", action="store_true", help="do not record the raw scan points")
+    parser.add_argument("--backend", default="epics", choices=["epics", "sim", "fake_pv"],
+                        help="epics: real beamline; sim/fake_pv: simulated beamline for dry runs")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the simulated beamline")
+    parser.add_argument("--metrics-file", default=None, help="Prometheus text file (default: autoalign_metrics.prom)")
+    parser.add_argument("--metrics-port", type=int, default=None, help="also serve the metrics on this local port")
+    parser.add_argument("--output", default=None, help="write the alignment results to this JSON file")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the interrupted session of the journal; finished motors are skipped")
+    parser.add_argument("--journal", default=None,
+                        help="session journal (default: autoalign_journal.jsonl; none for simulated backends)")
+    parser.add_argument("--discard-journal", action="store_true",
+                        help="start over even if the journal holds an interrupted session (kept as <journal>.old)")
+    args = parser.parse_args(argv)
+    use_backend(args.backend, args.seed)
+    if args.journal:
+        Autoalign.journal_path = args.journal
+    if args.discard_journal and not args.resume and Autoalign.journal_path is not None:
+        discard_journal(Autoalign.journal_path)
+
+    if args.resume:
+        if Autoalign.journal_path is None:
+            print("Simulated runs keep no session journal; give one with --journal to resume it.")
+            return 2
+        state = Autoalign.load_journal(Autoalign.journal_path)
+        if state is None:
+            print(f"No session journal to resume at {Autoalign.journal_path}")
+            return 2
+        if state['finished']:
+            print("The last alignment session finished; nothing to resume.")
+            return 0
+        alignment_info = state['alignment_info']
+    elif args.alignment_file is None:
+        parser.error("an alignment file is needed unless --resume is given")
+    else:
+        try:
+            alignment_info = load_alignment_info(args.alignment_file)
+        except (OSError, ValueError) as e:
+            print(f"Error reading {args.alignment_file}:\n{e}")
+            return 2
+    if args.quick_check:
+        for motors in alignment_info.values():
+            for motor_info in motors.values():
+                motor_info['quick_check'] = True
+
+    if args.metrics_file:
+        Autoalign.metrics_export['path'] = args.metrics_file
+    Autoalign.metrics_export['port'] = args.metrics_port
+
+    print(f"🔲 Running alignment for detectors: {list(alignment_info)}")
+    try:
+        failures = Autoalign.run_session(alignment_info, record=not args.no_record, resume=args.resume)
+    except UnfinishedSession as e:
+        print(f"{e}.\nUse --resume to continue it, or --discard-journal to start a new session.")
+        return 2
+    except (Autoalign.AlignmentAborted, KeyboardInterrupt):
+        # Ctrl-C stops the moving motor; the points measured so far are in the session record
+        print("Alignment aborted.")
+        return 1
+    except Exception as e:
+        print(f"Error during alignment: {e}")
+        return 1
+    results = results_summary()
+    for result in results:
+        print(f"   → Detector {result['detector_id']} - {result['motor']}: {result['position']:.5f} "
+              f"(intensity {result['intensity']:.0f}, FWHM {result['fwhm']:.5f})")
+    failed = [{'detector_id': detector_id, 'motor': motor_name, 'reason': reason}
+              for (detector_id, motor_name), reason in sorted(failures.items())]
+    for failure in failed:
+        print(f"   ✗ Detector {failure['detector_id']} - {failure['motor']} failed: {failure['reason']}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'alignment_info': {str(k): v for k, v in alignment_info.items()}, 'results': results,
+                       'failures': failed}, f, indent=2)
+        print(f"Saved alignment results to {args.output}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import numpy as np
+import Autoalign_pv_v3 as Autoalign
+from Autoalign_sim_v3 import VirtualClock
+
+# PV name of the 2theta arm, as in TwoThetaDrive
+TWO_THETA_PV = "11bmb:m28"
+
+# SimMotor Class: trapezoidal motion profile with backlash and encoder noise
+class SimMotor:
+    def __init__(self, clock, position=0.0, velocity=1.0, acceleration=5.0, backlash=0.0, encoder_noise=0.0, rng=None):
+        self.clock = clock
+        self.velocity = velocity  # Units per second
+        self.acceleration = acceleration  # Units per second squared
+        self.backlash = backlash  # Full play between drive and load
+        self.encoder_noise = encoder_noise  # Standard deviation of the readback
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        # Current move: the drive goes from start_position to target in duration seconds
+        self.start_time = clock.time()
+        self.start_position = position
+        self.target = position
+        self.duration = 0.0
+        self.load_start = position  # Load position at the start of the move
+
+    def move_duration(self, distance):
+        """Time of a trapezoidal (or triangular, for short moves) profile over the distance."""
+        distance = abs(distance)
+        if distance * self.acceleration < self.velocity**2:
+            return 2 * np.sqrt(distance / self.acceleration)
+        return distance / self.velocity + self.velocity / self.acceleration
+
+    def drive_at(self, t):
+        """Drive position at time t along the trapezoidal profile."""
+        tau = min(max(t - self.start_time, 0.0), self.duration)
+        distance = abs(self.target - self.start_position)
+        direction = np.sign(self.target - self.start_position)
+        t_acc = min(self.velocity / self.acceleration, self.duration / 2)
+        if tau <= t_acc:
+            travelled = 0.5 * self.acceleration * tau**2
+        elif tau <= self.duration - t_acc:
+            travelled = 0.5 * self.acceleration * t_acc**2 + self.acceleration * t_acc * (tau - t_acc)
+        else:
+            travelled = distance - 0.5 * self.acceleration * (self.duration - tau)**2
+        return self.start_position + direction * min(travelled, distance)
+
+    def position_at(self, t):
+        """Load position at time t; the load only follows the drive once the backlash play is taken up."""
+        drive = self.drive_at(t)
+        return min(max(self.load_start, drive - self.backlash / 2), drive + self.backlash / 2)
+
+    def readback_at(self, t):
+        """Encoder readback at time t."""
+        noise = self.rng.normal(0, self.encoder_noise) if self.encoder_noise > 0 else 0.0
+        return self.position_at(t) + noise
+
+    def move(self, target):
+        """Start a move to target from wherever the motor is now (does not wait)."""
+        now = self.clock.time()
+        self.load_start = self.position_at(now)
+        self.start_position = self.drive_at(now)
+        self.start_time = now
+        self.target = target
+        self.duration = self.move_duration(target - self.start_position)
+
+    def stop(self):
+        """Stop the move at the current position."""
+        now = self.clock.time()
+        self.load_start = self.position_at(now)
+        self.start_position = self.target = self.drive_at(now)
+        self.start_time = now
+        self.duration = 0.0
+
+    def done_time(self):
+        return self.start_time + self.duration
+
+    def is_moving(self):
+        return self.clock.time() < self.done_time()
+
+# SimPeak Class: analyzer/piezo response of one detector
+class SimPeak:
+    def __init__(self, detector_id, analyzer_center, piezo_center, intensity=1000.0, analyzer_sigma=0.008,
+                 piezo_sigma=1.5, coupling=500.0, background=5.0, two_theta_sigma=0.2):
+        self.detector_id = detector_id
+        self.analyzer_center = analyzer_center
+        self.piezo_center = piezo_center
+        self.intensity = intensity  # Counts per frame on the peak
+        self.analyzer_sigma = analyzer_sigma
+        self.piezo_sigma = piezo_sigma
+        self.coupling = coupling  # Piezo peak shift per unit of analyzer rotation
+        self.background = background  # Counts per frame off the peak
+        self.two_theta_sigma = two_theta_sigma
+        self.two_theta_angle = -2 * (detector_id - 1)
+
+    def counts(self, analyzer, piezo, two_theta):
+        """Counts per frame for the given load positions (arrays allowed)."""
+        # The piezo peak follows the analyzer, with the sign convention of the analyzer nudge in run_alignment
+        sign = (-1)**(self.detector_id + 1)
+        piezo_center = self.piezo_center + sign * self.coupling * (analyzer - self.analyzer_center)
+        return self.background + self.intensity * (
+            np.exp(-(analyzer - self.analyzer_center)**2 / (2 * self.analyzer_sigma**2))
+            * np.exp(-(piezo - piezo_center)**2 / (2 * self.piezo_sigma**2))
+            * np.exp(-(two_theta - self.two_theta_angle)**2 / (2 * self.two_theta_sigma**2)))
+
+# SimBeamline Class: all analyzer, piezo and 2theta motors plus the free-running Lambda detector
+class SimBeamline:
+    def __init__(self, clock=None, seed=0, peaks=None, exposure=0.05, dead_time=0.01, settle_time=0.3,
+                 analyzer_motion=None, piezo_motion=None, two_theta_motion=None, frame_samples=16):
+        self.clock = clock if clock is not None else VirtualClock()
+        self.rng = np.random.default_rng(seed)
+        self.motor_config = Autoalign.MotorConfig()
+        self.exposure = exposure  # Seconds of integration per frame
+        self.dead_time = dead_time  # Readout gap between frames
+        self.settle_time = settle_time  # Delay after each move, as in MotorDrive.move_to
+        self.frame_samples = frame_samples  # Samples of the motion profile per exposure
+        self.frames = {}  # Counts of completed frames per (detector_id, frame index)
+
+        if peaks is None:
+            peaks = [SimPeak(i + 1, 4.25 + self.rng.normal(0, 0.01), 7.0 + self.rng.normal(0, 1.0)) for i in range(12)]
+        self.peaks = {peak.detector_id: peak for peak in peaks}
+
+        analyzer_motion = analyzer_motion or {'velocity': 0.05, 'acceleration': 0.5, 'backlash': 0.0005, 'encoder_noise': 0.00005}
+        piezo_motion = piezo_motion or {'velocity': 5.0, 'acceleration': 50.0, 'backlash': 0.0, 'encoder_noise': 0.005}
+        two_theta_motion = two_theta_motion or {'velocity': 2.0, 'acceleration': 4.0, 'backlash': 0.0, 'encoder_noise': 0.0001}
+        self.motors = {TWO_THETA_PV: SimMotor(self.clock, 0.0, rng=self.rng, **two_theta_motion)}
+        for i in range(12):
+            peak = self.peaks[i + 1]
+            self.motors[self.motor_config.analyzer_motors[i]] = SimMotor(
+                self.clock, round(peak.analyzer_center, 2), rng=self.rng, **analyzer_motion)
+            self.motors[self.motor_config.piezo_motors[i]] = SimMotor(self.clock, 7.0, rng=self.rng, **piezo_motion)
+
+    def move_and_wait(self, pv_name, position):
+        """Move a motor and advance the clock until it is done, like caput(wait=True).
+
+        On a real-time clock the wait is split into short sleeps, so an abort stops the motor at once.
+        """
+        Autoalign.check_abort()
+        motor = self.motors[pv_name]
+        motor.move(position)
+        if isinstance(self.clock, VirtualClock):
+            self.clock.sleep(max(motor.done_time() - self.clock.time(), 0.0))
+            return
+        while motor.is_moving():
+            if Autoalign.abort.is_set():
+                motor.stop()
+                raise Autoalign.AlignmentAborted(f"Alignment aborted while moving {pv_name}")
+            self.clock.sleep(min(motor.done_time() - self.clock.time(), 0.05))
+
+    def roi_counts(self, detector_id, t=None):
+        """ROI total of the last frame completed at time t, integrated over the motion during its exposure."""
+        t = self.clock.time() if t is None else t
+        period = self.exposure + self.dead_time
+        frame = int(np.floor((t - self.exposure) / period))
+        key = (detector_id, frame)
+        if key not in self.frames:
+            times = frame * period + (np.arange(self.frame_samples) + 0.5) * self.exposure / self.frame_samples
+            analyzer = self.motors[self.motor_config.analyzer_motors[detector_id - 1]]
+            piezo = self.motors[self.motor_config.piezo_motors[detector_id - 1]]
+            two_theta = self.motors[TWO_THETA_PV]
+            expected = np.mean(self.peaks[detector_id].counts(
+                np.array([analyzer.position_at(s) for s in times]),
+                np.array([piezo.position_at(s) for s in times]),
+                np.array([two_theta.position_at(s) for s in times])))
+            self.frames[key] = float(self.rng.poisson(expected))
+        return self.frames[key]
+
+    def two_theta_drive(self, detector_id):
+        return SimTwoThetaDrive(self, detector_id)
+
+    def motor_drive(self, pv_name):
+        return SimMotorDrive(self, pv_name)
+
+    def detector(self, detector_id, motor_config):
+        return SimLambdaFlexCount(self, detector_id, motor_config)
+
+    def use(self):
+        """Make Autoalign_pv_v3.run_alignment drive this simulated beamline."""
+        Autoalign.use_drives(self.two_theta_drive, self.motor_drive, self.detector, self.clock.sleep)
+
+# SimTwoThetaDrive Class with the TwoThetaDrive interface
+class SimTwoThetaDrive:
+    def __init__(self, beamline, detector_id):
+        self.beamline = beamline
+        self.pv_name = TWO_THETA_PV
+        self.detector_id = detector_id
+        self.angle = self.calculate_angle(detector_id)
+
+    def calculate_angle(self, detector_id):
+        """Calculate the 2Theta angle based on detector ID (1 to 12)."""
+        if 1 <= detector_id <= 12:
+            return -2 * (detector_id - 1)
+        else:
+            raise ValueError("Detector ID must be between 1 and 12")
+
+    def get_pos(self):
+        self.position = self.beamline.motors[self.pv_name].target
+        return self.position
+
+    def move_to(self):
+        print(f"Moving 2theta arm to {self.angle} degrees to align Detector {self.detector_id}.")
+        Autoalign.metrics.count('moves')
+        with Autoalign.timer.phase('move'):
+            self.beamline.move_and_wait(self.pv_name, self.angle)
+        with Autoalign.timer.phase('settle'):
+            self.beamline.clock.sleep(self.beamline.settle_time)
+
+# SimMotorDrive Class with the MotorDrive interface
+class SimMotorDrive:
+    def __init__(self, beamline, pv_name):
+        self.beamline = beamline
+        self.pv_name = pv_name
+        self.position = beamline.motors[pv_name].target  # Setpoint, as caget of the motor record
+
+    def get_pos(self):
+        self.position = self.beamline.motors[self.pv_name].target
+        return self.position
+
+    def get_readback(self):
+        with Autoalign.timer.phase('read'):
+            return self.beamline.motors[self.pv_name].readback_at(self.beamline.clock.time())
+
+    def move_to(self, position):
+        Autoalign.metrics.count('moves', *Autoalign.motor_label(self.pv_name))
+        with Autoalign.timer.phase('move'):
+            self.beamline.move_and_wait(self.pv_name, position)
+        self.position = position
+        with Autoalign.timer.phase('settle'):
+            self.beamline.clock.sleep(self.beamline.settle_time)
+
+# SimLambdaFlexCount Class with the LambdaFlexCount interface: reads the last completed frame
+class SimLambdaFlexCount:
+    def __init__(self, beamline, detector_id, motor_config):
+        self.pv_name = motor_config.lambda_flex_detectors[detector_id - 1]
+        with Autoalign.timer.phase('read'):
+            self.peak_intensity = beamline.roi_counts(detector_id)
+
+    def get_roi_intensity(self, position):
+        return self.peak_intensity
@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import time
+import argparse
+import Autoalign_pv_v3 as Autoalign
+from Autoalign_watchdog import move_timeout, readback_tolerance
+
+# Default folder for the position snapshots, one timestamped JSON file each
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
+
+# PV name of the 2theta arm, as in TwoThetaDrive
+TWO_THETA_PV = "11bmb:m28"
+
+def snapshot_motors():
+    """Motor record PVs of the snapshot with a readable name: 2theta arm, then analyzer and piezo per detector."""
+    motor_config = Autoalign.MotorConfig()
+    motors = {TWO_THETA_PV: "2theta"}
+    for i in range(12):
+        motors[motor_config.analyzer_motors[i]] = f"Detector {i + 1} Analyzer"
+        motors[motor_config.piezo_motors[i]] = f"Detector {i + 1} Piezo"
+    return motors
+
+def take_snapshot(directory=DEFAULT_SNAPSHOT_DIR, path=None, note=""):
+    """Read every motor position in one batch of channel access calls and write it to a timestamped file.
+
+    Returns the path of the file. Motors that do not answer are stored as null.
+    """
+    motors = snapshot_motors()
+    pvs = list(motors)
+    # One caget_many for setpoints and readbacks: all requests go out before the first answer is awaited
+    values = Autoalign.epics.caget_many(pvs + [pv + ".RBV" for pv in pvs])
+    setpoints, readbacks = values[:len(pvs)], values[len(pvs):]
+    positions = {}
+    for pv, setpoint, readback in zip(pvs, setpoints, readbacks):
+        if readback is None:
+            print(f"Error reading {motors[pv]} ({pv}); not in the snapshot.")
+        positions[pv] = {'name': motors[pv], 'readback': None if readback is None else float(readback),
+                         'setpoint': None if setpoint is None else float(setpoint)}
+    snapshot = {'time': time.time(), 'note': note, 'positions': positions}
+    if path is None:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime("positions_%Y%m%d_%H%M%S.json"))
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(snapshot, f, indent=2)
+    os.replace(temp_path, path)
+    print(f"Saved positions of {sum(p['readback'] is not None for p in positions.values())} motors to {path}")
+    return path
+
+def load_snapshot(path):
+    with open(path) as f:
+        return json.load(f)
+
+def restore_snapshot(snapshot, motors=None, poll_interval=0.05):
+    """Move the motors back to the snapshot readbacks, all at once, and wait for all their puts to complete.
+
+    motors limits the restore to these PVs. Motors already within their retry deadband are not moved.
+    On a timeout, an abort or Ctrl-C every motor still moving is stopped. Returns {pv: "ok", "unchanged" or error}.
+    """
+    epics = Autoalign.epics
+    Autoalign.abort.clear()  # Left set by an aborted alignment
+    targets = {pv: entry['readback'] for pv, entry in snapshot['positions'].items()
+               if entry['readback'] is not None and (motors is None or pv in motors)}
+    if not targets:
+        return {}
+    names = {pv: entry['name'] for pv, entry in snapshot['positions'].items()}
+    pvs = list(targets)
+    current = epics.caget_many([pv + ".RBV" for pv in pvs])
+    report = {}
+    pending = {}  # pv -> (PV object, deadline)
+    for pv, readback in zip(pvs, current):
+        if readback is None:
+            report[pv] = "no readback"
+            continue
+        model = Autoalign.motion_model(pv)
+        if abs(readback - targets[pv]) <= readback_tolerance(model['RDBD']):
+            report[pv] = "unchanged"
+            continue
+        # caput takes no callback; the PV object reports the put completion of the motor record
+        motor_pv = epics.get_pv(pv, connect=True)
+        if motor_pv.put(targets[pv], wait=False, use_complete=True) is None:
+            report[pv] = "error: not connected"
+            continue
+        print(f"Moving {names[pv]} ({pv}) from {readback:.5f} to {targets[pv]:.5f}")
+        deadline = time.monotonic() + move_timeout(targets[pv] - readback, model['VELO'], model['ACCL'], model['BDST'])
+        pending[pv] = (motor_pv, deadline)
+
+    try:
+        while pending:
+            for pv in [pv for pv, (motor_pv, _) in pending.items() if motor_pv.put_complete]:
+                del pending[pv]
+                report[pv] = "ok"
+            for pv in [pv for pv, (_, deadline) in pending.items() if time.monotonic() > deadline]:
+                Autoalign.stop_motor(pv)
+                del pending[pv]
+                report[pv] = "timeout"
+            if Autoalign.abort.is_set():
+                raise Autoalign.AlignmentAborted("Restore aborted on request")
+            if pending:
+                # Put callbacks arrive on their own thread; an abort ends the wait at once
+                Autoalign.drives['wait'](poll_interval)
+    except (Autoalign.AlignmentAborted, KeyboardInterrupt):
+        for pv in pending:
+            Autoalign.stop_motor(pv)
+        raise
+
+    # Check where the moved motors ended up
+    moved = [pv for pv in pvs if report.get(pv) == "ok"]
+    for pv, readback in zip(moved, epics.caget_many([pv + ".RBV" for pv in moved])):
+        tolerance = readback_tolerance(Autoalign.motion_model(pv)['RDBD'])
+        if readback is None or abs(readback - targets[pv]) > tolerance:
+            report[pv] = f"readback {readback} instead of {targets[pv]:.5f}"
+    return report
+
+def diff_snapshots(old, new, tolerance=0.0):
+    """Motors whose readback differs by more than tolerance: list of (pv, name, old, new, change)."""
+    changes = []
+    for pv, entry in new['positions'].items():
+        before = old['positions'].get(pv, {}).get('readback')
+        after = entry['readback']
+        if before is None or after is None:
+            if before != after:
+                changes.append((pv, entry['name'], before, after, None))
+            continue
+        if abs(after - before) > tolerance:
+            changes.append((pv, entry['name'], before, after, after - before))
+    return changes
+
+def format_position(value):
+    return "unknown" if value is None else f"{value:.5f}"
+
+def select_motors(which):
+    """PVs of the 2theta arm, analyzers or piezos ("all" for every motor of the snapshot)."""
+    motors = snapshot_motors()
+    if which == "all":
+        return set(motors)
+    if which == "2theta":
+        return {TWO_THETA_PV}
+    return {pv for pv, name in motors.items() if name.endswith(which.capitalize())}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Save, restore and compare the positions of the analyzer, piezo and 2theta motors.")
+    parser.add_argument("--backend", default="epics", choices=["epics", "fake_pv"],
+                        help="fake_pv: simulated beamline behind a fake channel access, for trying the commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    save = commands.add_parser("save", help="snapshot all motor positions to a timestamped file")
+    save.add_argument("--output", default=None, help="file name (default: snapshots/positions_<time>.json)")
+    save.add_argument("--note", default="", help="free text stored with the snapshot")
+    restore = commands.add_parser("restore", help="move the motors back to a snapshot, all at once")
+    restore.add_argument("snapshot")
+    restore.add_argument("--motors", default="all", choices=["all", "analyzer", "piezo", "2theta"])
+    restore.add_argument("--dry-run", action="store_true", help="only show what would move")
+    diff = commands.add_parser("diff", help="compare two snapshots")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--tolerance", type=float, default=1e-4, help="smallest readback change shown (default 1e-4)")
+    args = parser.parse_args(argv)
+
+    if args.backend == "fake_pv":
+        import Autoalign_fake_epics
+        Autoalign_fake_epics.install()
+
+    if args.command == "save":
+        take_snapshot(path=args.output, note=args.note)
+        return 0
+
+    if args.command == "diff":
+        changes = diff_snapshots(load_snapshot(args.old), load_snapshot(args.new), args.tolerance)
+        for pv, name, before, after, change in changes:
+            change_text = "" if change is None else f" ({change:+.5f})"
+            print(f"{name:22s} {pv:12s} {format_position(before)} -> {format_position(after)}{change_text}")
+        print(f"{len(changes)} motors differ.")
+        return 0
+
+    snapshot = load_snapshot(args.snapshot)
+    motors = select_motors(args.motors)
+    if args.dry_run:
+        # Compare with a fresh reading instead of moving
+        pvs = [pv for pv, entry in snapshot['positions'].items() if pv in motors and entry['readback'] is not None]
+        for pv, readback in zip(pvs, Autoalign.epics.caget_many([pv + ".RBV" for pv in pvs])):
+            target = snapshot['positions'][pv]['readback']
+            if readback is None or abs(readback - target) > readback_tolerance(Autoalign.motion_model(pv)['RDBD']):
+                print(f"Would move {snapshot['positions'][pv]['name']} ({pv}) from {format_position(readback)} to {target:.5f}")
+        return 0
+    try:
+        report = restore_snapshot(snapshot, motors)
+    except (Autoalign.AlignmentAborted, KeyboardInterrupt):
+        print("Restore aborted; the moving motors were stopped.")
+        return 1
+    failed = {pv: result for pv, result in report.items() if result not in ("ok", "unchanged")}
+    moved = sum(result == "ok" for result in report.values())
+    print(f"Restored {moved} motors, {len(report) - moved - len(failed)} already in place.")
+    for pv, result in failed.items():
+        print(f"   ✗ {snapshot['positions'][pv]['name']} ({pv}): {result}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import time
+import numpy as np
+from Autoalign_events import ScanStarted, PointAcquired, FitDone, AlignmentDone, AlignmentFailed
+
+MOTORS = (('analyzer', "Analyzer"), ('piezo', "Piezo"))
+
+def planned_points(motor_info):
+    """Points of the first scan of a motor: the three drift-check probes, or the full range."""
+    if motor_info.get('quick_check'):
+        return 3
+    return len(np.arange(motor_info['start'], motor_info['end'] + motor_info['step'], motor_info['step']))
+
+def format_seconds(seconds):
+    if seconds is None:
+        return "--:--"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+# AlignmentStatus Class: progress of a session per detector and motor, fed with the engine events
+class AlignmentStatus:
+    def __init__(self, alignment_info, stall_factor=5.0, completed=None):
+        """stall_factor: a scan is shown as stalled after this many mean point times without a new point.
+
+        completed maps (detector_id, motor_name) to the results of a resumed session's finished motors.
+        """
+        self.alignment_info = alignment_info
+        self.stall_factor = stall_factor
+        self.rows = {}  # (detector_id, motor_name) -> status row, in alignment order
+        for detector_id, motors in alignment_info.items():
+            for motor_key, motor_name in MOTORS:
+                if motor_key in motors:
+                    self.rows[(detector_id, motor_name)] = {
+                        'state': "waiting", 'points_done': 0, 'points_total': planned_points(motors[motor_key]),
+                        'iteration': 0, 'best_position': None, 'started': None, 'finished': None, 'last_point': None}
+        for key, result in (completed or {}).items():
+            if key in self.rows:
+                self.rows[key].update(state="done", points_done=self.rows[key]['points_total'],
+                                      best_position=result['position'])
+        self.start_time = time.time()
+        self.end_time = None
+        self.points = 0  # Points measured in the session, reruns included
+        self.last_point_time = None
+
+    def apply(self, event):
+        row = self.rows.get((event.detector_id, event.motor_name))
+        if row is None:
+            return
+        if isinstance(event, ScanStarted):
+            # A rerun starts over; its points count as remaining work again
+            row['state'] = "probing" if event.kind == "probe" else "scanning"
+            row['iteration'] = event.iteration
+            row['points_done'] = 0
+            row['points_total'] = len(event.positions)
+            if row['started'] is None:
+                row['started'] = time.time()
+        elif isinstance(event, PointAcquired):
+            row['points_done'] = event.index + 1
+            row['last_point'] = event.timestamp
+            self.points += 1
+            self.last_point_time = max(self.last_point_time or 0, event.timestamp)
+        elif isinstance(event, FitDone):
+            row['state'] = "fitted"
+            row['best_position'] = event.mean
+        elif isinstance(event, AlignmentDone):
+            row['state'] = "done"
+            row['best_position'] = event.best_position
+            row['finished'] = time.time()
+        elif isinstance(event, AlignmentFailed):
+            row['state'] = "failed"
+            row['finished'] = time.time()
+            if row['started'] is None:
+                row['started'] = row['finished']
+
+    def apply_batch(self, batch):
+        for event in batch:
+            self.apply(event)
+        return bool(batch)
+
+    def finish(self, aborted=False):
+        """End of the session: motors that did not reach their best position are marked."""
+        self.end_time = time.time()
+        for row in self.rows.values():
+            if row['state'] not in ("done", "failed"):
+                if row['started'] is None:
+                    row['state'] = "skipped"
+                else:
+                    row['state'] = "aborted" if aborted else "not aligned"
+
+    def elapsed(self):
+        return (self.end_time or time.time()) - self.start_time
+
+    def seconds_per_point(self):
+        """Mean measured time per point, including the 2theta moves and fits between scans."""
+        if not self.points:
+            return None
+        return (self.last_point_time - self.start_time) / self.points
+
+    def remaining_points(self):
+        return sum(max(row['points_total'] - row['points_done'], 0)
+                   for row in self.rows.values() if row['state'] not in ("done", "failed"))
+
+    def eta(self):
+        """Estimated seconds until the session ends, from the measured point times."""
+        if self.end_time is not None:
+            return 0.0
+        seconds_per_point = self.seconds_per_point()
+        if seconds_per_point is None:
+            return None
+        return max(seconds_per_point * self.remaining_points() - (time.time() - self.last_point_time), 0.0)
+
+    def progress(self):
+        """Fraction of the planned points measured so far (reruns add to the plan)."""
+        if self.end_time is not None:
+            return 1.0
+        done = sum(row['points_total'] if row['state'] in ("done", "failed") else row['points_done']
+                   for row in self.rows.values())
+        total = done + self.remaining_points()
+        return done / total if total else 0.0
+
+    def state(self, detector_id, motor_name):
+        """State of one motor; a scan without a new point for stall_factor mean point times shows as stalled."""
+        row = self.rows[(detector_id, motor_name)]
+        seconds_per_point = self.seconds_per_point()
+        if (row['state'] in ("scanning", "probing") and self.end_time is None and seconds_per_point
+                and time.time() - (row['last_point'] or row['started']) > self.stall_factor * max(seconds_per_point, 1.0)):
+            return "stalled"
+        return row['state']
+
+    def table(self):
+        """Rows of the status table: detector, motor, state, points, iteration, best position, elapsed."""
+        now = self.end_time or time.time()
+        rows = []
+        for (detector_id, motor_name), row in self.rows.items():
+            if row['started'] is None:
+                elapsed = None
+            else:
+                elapsed = (row['finished'] or now) - row['started']
+            best = "" if row['best_position'] is None else f"{row['best_position']:.5f}"
+            rows.append((detector_id, motor_name, self.state(detector_id, motor_name),
+                         f"{row['points_done']}/{row['points_total']}", row['iteration'] or "", best,
+                         "" if elapsed is None else format_seconds(elapsed)))
+        return rows
+
+    def summary(self):
+        """One line with the overall progress, elapsed time and ETA."""
+        done = sum(row['state'] == "done" for row in self.rows.values())
+        return (f"{done}/{len(self.rows)} motors aligned, {self.progress():.0%} of points, "
+                f"elapsed {format_seconds(self.elapsed())}, remaining {format_seconds(self.eta())}")
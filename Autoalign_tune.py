@@ -0,0 +1,82 @@
+import argparse
+import time
+import numpy as np
+from Autoalign_config import DEFAULT_PARAMS, DEFAULT_CONFIG_PATH, save_params
+from Autoalign_montecarlo import evaluate, summarize
+
+# Search range of every tuned parameter of the v3 piezo alignment; ints are searched as ints
+SEARCH_SPACE = {
+    'off_center_limit': (0.5, 4.0),
+    'nudge_scale': (0.001, 0.008),
+    'edge_scale': (0.002, 0.012),
+    'max_iterations': (2, 10),
+    'p0_sigma': (0.3, 3.0),
+}
+
+def score(params, n_trials, seed, max_p95_error, max_not_aligned, strategy="v3", motor_name="Piezo"):
+    """Mean simulated time to aligned, or inf when the precision constraint is not met.
+
+    Every candidate sees the same randomized peaks (same seed), so differences come from the parameters.
+    """
+    summary = summarize(evaluate(strategy, motor_name, n_trials, params, seed))
+    feasible = summary['p95_error'] <= max_p95_error and summary['not_aligned'] <= max_not_aligned
+    return (summary['mean_time'] if feasible else np.inf), summary
+
+def random_params(rng, center=None, spread=1.0):
+    """Draw parameters uniformly in SEARCH_SPACE, or around center with a fraction spread of each range."""
+    params = {}
+    for key, (low, high) in SEARCH_SPACE.items():
+        if center is None:
+            value = rng.uniform(low, high)
+        else:
+            value = np.clip(center[key] + rng.normal(0, spread * (high - low) / 2), low, high)
+        params[key] = int(round(value)) if isinstance(DEFAULT_PARAMS[key], int) else float(value)
+    return params
+
+def tune(n_candidates=60, n_refine=40, n_trials=300, seed=0, max_p95_error=0.75, max_not_aligned=0.01):
+    """Random search followed by a shrinking local search; returns (best params, best summary, best score)."""
+    rng = np.random.default_rng(seed)
+    best_params = {key: DEFAULT_PARAMS[key] for key in SEARCH_SPACE}
+    best_score, best_summary = score(best_params, n_trials, seed, max_p95_error, max_not_aligned)
+    print(f"Defaults: score {best_score:.1f} s, {best_summary}")
+
+    for i in range(n_candidates + n_refine):
+        if i < n_candidates:
+            candidate = random_params(rng)
+        else:
+            # Local search around the best set, narrowing as it goes
+            spread = 0.3 * (1 - (i - n_candidates) / max(n_refine, 1)) + 0.02
+            candidate = random_params(rng, best_params, spread)
+        candidate_score, summary = score(candidate, n_trials, seed, max_p95_error, max_not_aligned)
+        if candidate_score < best_score:
+            best_params, best_score, best_summary = candidate, candidate_score, summary
+            print(f"Candidate {i + 1}: score {best_score:.1f} s, {candidate}")
+    return dict(DEFAULT_PARAMS, **best_params), best_summary, best_score
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune the run_alignment parameters on the Monte Carlo harness.")
+    parser.add_argument("--candidates", type=int, default=60, help="random candidates")
+    parser.add_argument("--refine", type=int, default=40, help="local search candidates")
+    parser.add_argument("--trials", type=int, default=300, help="Monte Carlo trials per candidate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-p95-error", type=float, default=0.75, help="precision constraint on the piezo center")
+    parser.add_argument("--max-not-aligned", type=float, default=0.01, help="allowed fraction of failed alignments")
+    parser.add_argument("--output", default=DEFAULT_CONFIG_PATH, help="config file read by Autoalign_pv_v3")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    params, summary, best_score = tune(args.candidates, args.refine, args.trials, args.seed,
+                                       args.max_p95_error, args.max_not_aligned)
+    if not np.isfinite(best_score):
+        print("No parameter set meets the precision constraint. Config file not written.")
+    else:
+        metadata = {
+            'tuned': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'trials': args.trials,
+            'seed': args.seed,
+            'max_p95_error': args.max_p95_error,
+            'max_not_aligned': args.max_not_aligned,
+            'summary': summary
+        }
+        save_params(params, args.output, metadata)
+        print(f"Best parameters {params} written to {args.output} ({time.time() - start_time:.0f} seconds)")
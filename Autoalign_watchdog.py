@@ -0,0 +1,86 @@
+import time
+import numpy as np
+from epics.ca import ChannelAccessException
+
+# Supervision of the EPICS drives: move timeouts from the motor record motion model and retries
+settings = {
+    'timeout_factor': 2.0,  # Allowed move time = factor * expected move time + margin
+    'timeout_margin': 5.0,  # Seconds, covers the put latency and the motor record retries
+    'default_timeout': 600.0,  # Seconds, when VELO/ACCL cannot be read
+    'attempts': 3,  # Tries of a channel access call before the device counts as failed
+    'backoff': 0.5,  # Seconds before the first retry, doubled after each one
+    'readback_factor': 2.0,  # Readback must be within factor * RDBD of the target
+    'readback_tolerance': 1e-3,  # Used instead when RDBD cannot be read
+}
+
+# Errors of a channel access call worth retrying; anything else is a bug and is raised at once
+TRANSIENT_ERRORS = (ChannelAccessException, TimeoutError, OSError)
+
+# DeviceError Exception: a motor or detector did not respond as expected; its detector is skipped
+class DeviceError(Exception):
+    pass
+
+class MoveFailed(DeviceError):
+    pass
+
+class ReadFailed(DeviceError):
+    pass
+
+def expected_move_time(distance, velocity, accel_time, backlash=0.0):
+    """Seconds of a motor record move: trapezoidal profile with VELO and ACCL (seconds to full speed).
+
+    A backlash correction (BDST) adds a second short move. Returns None without a usable VELO.
+    """
+    if not velocity or velocity <= 0:
+        return None
+    accel_time = max(accel_time or 0.0, 0.0)
+
+    def profile(distance):
+        distance = abs(distance)
+        # Short moves never reach full speed: triangular profile
+        if distance < velocity * accel_time:
+            return 2 * np.sqrt(distance * accel_time / velocity)
+        return distance / velocity + accel_time
+
+    seconds = profile(distance)
+    if backlash:
+        seconds += profile(backlash)
+    return float(seconds)
+
+def move_timeout(distance, velocity, accel_time, backlash=0.0):
+    """Timeout of a move: the expected move time with a safety factor and margin."""
+    expected = expected_move_time(distance, velocity, accel_time, backlash)
+    if expected is None:
+        return settings['default_timeout']
+    return settings['timeout_factor'] * expected + settings['timeout_margin']
+
+def readback_tolerance(rdbd):
+    """Allowed distance of the readback from the target, from the motor record retry deadband."""
+    if not rdbd or rdbd <= 0:
+        return settings['readback_tolerance']
+    return settings['readback_factor'] * rdbd
+
+def retry(func, description, sleep=time.sleep, on_retry=None, error=ReadFailed):
+    """Call func until it returns something other than None, retrying errors with exponential backoff.
+
+    TRANSIENT_ERRORS and None (pyepics' answer for a disconnected PV) count as transient;
+    every other exception is passed on at once. Raises error after settings['attempts'] tries;
+    on_retry is called before every retry.
+    """
+    delay = settings['backoff']
+    for attempt in range(1, settings['attempts'] + 1):
+        try:
+            value = func()
+            if value is not None:
+                return value
+            problem = "no value"
+        except TRANSIENT_ERRORS as e:
+            problem = str(e) or type(e).__name__
+        if attempt == settings['attempts']:
+            break
+        print(f"Error in {description} ({problem}), retrying in {delay:.1f} s")
+        if on_retry is not None:
+            on_retry()
+        sleep(delay)
+        delay *= 2
+    raise error(f"{description} failed after {settings['attempts']} attempts: {problem}")